@@ -2,54 +2,51 @@
 AQEE (Agent QA Engineering Ecosystem) - Root Agent Configuration
 
 This is the main agent module that ADK will discover and use.
-All sub-agents and tools are defined and initialized here.
+All sub-agents and tools are defined and initialized here, lazily: the
+root agent is built the first time `root_agent` is accessed.
 """
 
-from google.adk.agents import LlmAgent
-from google.adk.tools import FunctionTool
-
-# Import sub-agents from the agents module
-from agents.architect import architect
-from agents.planner import planner
-from agents.designer import designer
-from agents.test_automation_designer import test_automation_designer
-from agents.ui_framework_designer import ui_framework_designer
-from agents.api_framework_designer import api_framework_designer
-from agents.ci_cd_designer import ci_cd_designer
-from agents.execution_strategy_designer import execution_strategy_designer
-from agents.environment_manager import environment_manager
-from agents.test_executor import test_executor
-from agents.report_generator import report_generator
-from agents.issue_tracker import issue_tracker
-from agents.resource_planner import resource_planner
-from agents.requirement_analyst import requirement_analyst
-from agents.story_architect import story_architect
-from agents.acceptance_criteria_manager import acceptance_criteria_manager
-from agents.devops_linker import devops_linker
-from agents.testplan_designer import testplan_designer
-from agents.testcase_author import testcase_author
-from agents.coverage_analyst import coverage_analyst
-from agents.testdata_engineer import testdata_engineer
-from agents.suite_organizer import suite_organizer
-
-# Import custom tools
-from qa_orchestrator.custom_functions import validate_phase_output
-from qa_orchestrator.secrets import load_credentials
-
-
-# Initialize credentials from environment variables
-load_credentials()
-
-# Initialize tools
-validator_tool = FunctionTool(func=validate_phase_output)
-
-
-# Define the Root Orchestrator Agent
-root_agent = LlmAgent(
-    name="AQEE_Orchestrator",
-    model="gemini-3-flash",
-    description="Root orchestrator that coordinates the 7-phase QA lifecycle by delegating to specialist agents.",
-    instruction="""You are the AQEE (Agent QA Engineering Ecosystem) Root Orchestrator.
+import threading
+
+from agents.registry import get_registry
+
+# The root agent (and with it google.adk, every sub-agent module and the
+# credential load) is built on first access to `root_agent`, not at import.
+_root_agent = None
+_root_lock = threading.Lock()
+
+
+def build_root_agent():
+    """Build (once) and return the root orchestrator with all sub-agents."""
+    global _root_agent
+    if _root_agent is not None:
+        return _root_agent
+
+    with _root_lock:
+        if _root_agent is None:
+            _root_agent = _create_root_agent()
+    return _root_agent
+
+
+def _create_root_agent():
+    from google.adk.agents import LlmAgent
+    from google.adk.tools import FunctionTool
+
+    from qa_orchestrator.custom_functions import validate_phase_output
+    from qa_orchestrator.secrets import load_credentials
+
+    # Initialize credentials from environment variables
+    load_credentials()
+
+    # Initialize tools
+    validator_tool = FunctionTool(func=validate_phase_output)
+
+    # Define the Root Orchestrator Agent
+    return LlmAgent(
+        name="AQEE_Orchestrator",
+        model="gemini-3-flash",
+        description="Root orchestrator that coordinates the 7-phase QA lifecycle by delegating to specialist agents.",
+        instruction="""You are the AQEE (Agent QA Engineering Ecosystem) Root Orchestrator.
 
 Your role is to coordinate the complete QA lifecycle by intelligently delegating tasks to 7 specialist sub-agents:
 
@@ -142,32 +139,15 @@ Your role is to coordinate the complete QA lifecycle by intelligently delegating
 - Adapt based on feedback and metrics
 - Maintain transparency with stakeholders
 - Document decisions and rationale""",
-    sub_agents=[
-      requirement_analyst,
-      story_architect,
-      acceptance_criteria_manager,
-      devops_linker,
-      architect,
-         testplan_designer,
-         testcase_author,
-         coverage_analyst,
-         testdata_engineer,
-         suite_organizer,
-         ui_framework_designer,
-         api_framework_designer,
-         ci_cd_designer,
-         execution_strategy_designer,
-         environment_manager,
-        planner,
-        designer,
-        test_automation_designer,
-        test_executor,
-        report_generator,
-        issue_tracker,
-        resource_planner,
-    ],
-    tools=[validator_tool],
-)
+        sub_agents=get_registry().all(),
+        tools=[validator_tool],
+    )
+
+
+def __getattr__(name):
+    if name == "root_agent":
+        return build_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = ["root_agent"]
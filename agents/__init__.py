@@ -1,22 +1,21 @@
-from . import architect
-from . import planner
-from . import designer
-from . import test_automation_designer
-from . import test_executor
-from . import report_generator
-from . import issue_tracker
-from . import resource_planner
-from . import requirement_analyst
-from . import story_architect
-from . import acceptance_criteria_manager
-from . import devops_linker
-from . import testplan_designer
-from . import testcase_author
-from . import coverage_analyst
-from . import testdata_engineer
-from . import suite_organizer
-from . import ui_framework_designer
-from . import api_framework_designer
-from . import ci_cd_designer
-from . import execution_strategy_designer
-from . import environment_manager
\ No newline at end of file
+"""AQEE agent modules.
+
+Submodules are imported on first attribute access rather than at package
+import time; see `agents.registry` for building the agent instances.
+"""
+
+import importlib
+
+from .registry import SUB_AGENT_NAMES
+
+__all__ = list(SUB_AGENT_NAMES)
+
+
+def __getattr__(name):
+  if name in SUB_AGENT_NAMES:
+    return importlib.import_module(f".{name}", __name__)
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+  return sorted(set(globals()) | set(__all__))
@@ -1,5 +1,9 @@
+from typing import Any, Callable, Optional
+
 from google.adk.agents import LlmAgent
 
+from qa_orchestrator.invoker import invoke_agent as _call_agent
+
 architect = LlmAgent(
     name="Requirement_Architect",
     model="gemini-3-flash",
@@ -116,57 +120,76 @@ JSON with structure:
     output_key="phase1_data"
 )
 
-
-def _call_agent(agent, payload):
-  """Call agent using preferred ADK signature `call(prompt, context)` then fall back.
-
-  Use `payload` as context and a short prompt when possible.
-  """
-  # Preferred explicit ADK signature
-  call_fn = getattr(agent, "call", None)
-  if callable(call_fn):
-    try:
-      prompt = payload.get("prompt") if isinstance(payload, dict) else str(payload)
-      return call_fn(prompt, payload)
-    except Exception as e:
-      return {"error": f"agent.call failed: {e}"}
-
-  # Fallback to other common methods
-  for method in ("run", "invoke", "execute", "respond", "get_response"):
-    fn = getattr(agent, method, None)
-    if callable(fn):
-      try:
-        return fn(payload)
-      except Exception as e:
-        return {"error": f"agent {method} failed: {e}"}
-
-  return {
-    "agent": getattr(agent, "name", str(agent)),
-    "note": "no callable method available; returned placeholder",
-    "instruction": getattr(agent, "instruction", None),
-    "input_received": payload,
-  }
+# Registry names of the agents `delegate_architecture` calls.
+ARCHITECTURE_AGENTS = (
+  "requirement_analyst",
+  "story_architect",
+  "acceptance_criteria_manager",
+  "devops_linker",
+)
 
 
-def delegate_architecture(input_data: dict) -> dict:
+def delegate_architecture(
+  input_data: dict,
+  max_workers: Optional[int] = None,
+  stream: bool = False,
+  on_story: Optional[Callable[[dict], Any]] = None,
+) -> dict:
   """Delegate requirement analysis and story creation to split architect agents.
 
+  The agents are wired as a `PhaseGraph`: analysis feeds story creation, and
+  criteria validation and DevOps linking (which both only need the stories)
+  run in parallel. Large requirement documents are analyzed in chunks (see
+  `qa_orchestrator.ingestion`).
+
   Args:
     input_data: dict containing raw requirements and context
+    max_workers: concurrency limit for the graph run (engine default if None)
+    stream: hand each story downstream as soon as it is parsed out of the
+      Story_Architect output instead of waiting for the whole batch
+    on_story: streaming mode only; extra per-story step (e.g. test
+      authoring) run alongside criteria validation and linking
 
   Returns:
     Aggregated result containing requirement summary, stories and ADO actions.
+    In streaming mode `criteria_validation` and `azure_actions` hold one
+    entry per story, and `story_artifacts` holds the `on_story` results.
   """
-  from agents.requirement_analyst import requirement_analyst
-  from agents.story_architect import story_architect
-  from agents.acceptance_criteria_manager import acceptance_criteria_manager
-  from agents.devops_linker import devops_linker
+  if stream:
+    return _stream_architecture(input_data, max_workers, on_story)
+
+  from agents.registry import get_agent
+  from qa_orchestrator.ingestion import analyze_requirements
+  from qa_orchestrator.phase_graph import PhaseGraph
 
-  agg = {}
-  agg["requirements_summary"] = _call_agent(requirement_analyst, input_data)
-  agg["stories"] = _call_agent(story_architect, agg.get("requirements_summary") or input_data)
-  agg["criteria"] = _call_agent(acceptance_criteria_manager, agg.get("stories") or input_data)
-  agg["azure_actions"] = _call_agent(devops_linker, agg.get("stories") or input_data)
+  requirement_analyst, story_architect, acceptance_criteria_manager, devops_linker = (
+    get_agent(name) for name in ARCHITECTURE_AGENTS
+  )
+
+  graph = PhaseGraph()
+  graph.add(
+    "requirements_summary",
+    lambda s: analyze_requirements(s["input"], requirement_analyst),
+    inputs=["input"],
+  )
+  graph.add(
+    "stories",
+    lambda s: _call_agent(story_architect, _usable(s["requirements_summary"]) or s["input"]),
+    inputs=["requirements_summary", "input"],
+  )
+  graph.add(
+    "criteria",
+    lambda s: _call_agent(acceptance_criteria_manager, s["stories"] or s["input"]),
+    inputs=["stories", "input"],
+  )
+  graph.add(
+    "azure_actions",
+    lambda s: _call_agent(devops_linker, s["stories"] or s["input"]),
+    inputs=["stories", "input"],
+  )
+
+  run = graph.run({"input": input_data}, max_workers=max_workers)
+  agg = {k: v for k, v in run["state"].items() if k != "input"}
 
   result = {
     "requirements_summary": agg.get("requirements_summary"),
@@ -179,5 +202,88 @@ def delegate_architecture(input_data: dict) -> dict:
   for k, v in agg.items():
     if isinstance(v, dict) and v.get("error"):
       result["gaps_identified"].append(f"{k}: {v.get('error')}")
+  result["gaps_identified"].extend(_chunk_gaps(agg.get("requirements_summary")))
+  for name, error in run["errors"].items():
+    result["gaps_identified"].append(f"{name}: {error}")
+
+  return result
+
 
-  return result
\ No newline at end of file
+def _usable(value):
+  """`value` unless it is an `{"error": ...}` result (then None)."""
+  return None if isinstance(value, dict) and value.get("error") else value
+
+
+def _chunk_gaps(summary) -> list:
+  """Gaps for requirement chunks the analyst failed on."""
+  if not isinstance(summary, dict):
+    return []
+  return [f"requirements_summary: {error}" for error in summary.get("chunk_errors") or []]
+
+
+def _stream_architecture(input_data, max_workers, on_story):
+  """Streaming variant of `delegate_architecture` (one story at a time)."""
+  from concurrent.futures import ThreadPoolExecutor
+
+  from agents.registry import get_agent
+  from qa_orchestrator.ingestion import analyze_requirements
+  from qa_orchestrator.invoker import stream_agent
+  from qa_orchestrator.phase_graph import DEFAULT_MAX_WORKERS
+  from qa_orchestrator.story_stream import iter_stories
+
+  acceptance_criteria_manager = get_agent("acceptance_criteria_manager")
+  devops_linker = get_agent("devops_linker")
+
+  summary = analyze_requirements(input_data, get_agent("requirement_analyst"))
+  gaps = []
+  last_result = {}
+
+  def _chunks():
+    for chunk in stream_agent(get_agent("story_architect"), _usable(summary) or input_data):
+      if isinstance(chunk, dict):
+        if chunk.get("error"):
+          gaps.append(f"stories: {chunk.get('error')}")
+        last_result.update(chunk)
+      yield chunk
+
+  stories, criteria, actions, artifacts = [], [], [], []
+  with ThreadPoolExecutor(
+    max_workers=max_workers or DEFAULT_MAX_WORKERS, thread_name_prefix="story-stream"
+  ) as pool:
+    for story in iter_stories(_chunks()):
+      stories.append(story)
+      criteria.append(pool.submit(_call_agent, acceptance_criteria_manager, story))
+      actions.append(pool.submit(_call_agent, devops_linker, story))
+      if on_story is not None:
+        artifacts.append(pool.submit(on_story, story))
+
+    if not stories:
+      # Nothing parseable was streamed; fall back to batch semantics.
+      fallback = last_result or input_data
+      criteria.append(pool.submit(_call_agent, acceptance_criteria_manager, fallback))
+      actions.append(pool.submit(_call_agent, devops_linker, fallback))
+
+  def _collect(futures, key):
+    results = []
+    for index, future in enumerate(futures):
+      try:
+        value = future.result()
+      except Exception as e:
+        value = {"error": f"{type(e).__name__}: {e}"}
+      if isinstance(value, dict) and value.get("error"):
+        gaps.append(f"{key}[{index}]: {value.get('error')}")
+      results.append(value)
+    return results
+
+  gaps[:0] = _chunk_gaps(summary)
+  if isinstance(summary, dict) and summary.get("error"):
+    gaps.insert(0, f"requirements_summary: {summary.get('error')}")
+
+  return {
+    "requirements_summary": summary,
+    "stories": {"stories": stories} if stories else last_result or None,
+    "criteria_validation": _collect(criteria, "criteria"),
+    "azure_actions": _collect(actions, "azure_actions"),
+    "story_artifacts": _collect(artifacts, "story_artifacts"),
+    "gaps_identified": gaps,
+  }
@@ -1,5 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from typing import Optional
+
 from google.adk.agents import LlmAgent
 
+from qa_orchestrator.invoker import invoke_agent as _call_agent
+
 # Compatibility wrapper: the heavy `TestCase_Designer` responsibilities have
 # been split into focused agents: TestPlan_Designer, TestCase_Author,
 # Coverage_Analyst, TestData_Engineer, and Suite_Organizer. This agent
@@ -37,61 +43,137 @@ Output format: Preserve existing `phase3_data` schema for compatibility.
 )
 
 
-def _call_agent(agent, payload):
-  """Call agent using preferred ADK signature `call(prompt, context)` then fall back.
+# Phase-3 specialists as (result key, registry name). None of them reads
+# another's output, so they can be dispatched concurrently.
+DESIGN_SPECIALISTS = (
+  ("test_plan", "testplan_designer"),
+  ("test_cases", "testcase_author"),
+  ("coverage_analysis", "coverage_analyst"),
+  ("test_data", "testdata_engineer"),
+  ("suites", "suite_organizer"),
+)
 
-  We form a short prompt from the payload and pass payload as context.
+# Seconds each specialist may run before its result is dropped.
+DEFAULT_AGENT_TIMEOUT = 120.0
+
+# Prompt of the per-story TestCase_Author calls made when a `PhaseStore` is
+# passed to `delegate_design`.
+STORY_TEST_CASES_PROMPT = "Author test cases for this story"
+
+
+def _load_specialists():
+  from agents.registry import get_agent
+
+  return [(key, get_agent(name)) for key, name in DESIGN_SPECIALISTS]
+
+
+def _story_list(input_data):
+  """Stories of the architecture output (`phase1_data`) in `input_data`, if any."""
+  phase1 = input_data.get("phase1_data") if isinstance(input_data, dict) else None
+  stories = phase1.get("stories") if isinstance(phase1, dict) else None
+  if isinstance(stories, dict):
+    stories = stories.get("stories")
+  return stories if isinstance(stories, list) and stories else None
+
+
+def _author_per_story(agent, stories, store, namespace):
+  """Run TestCase_Author once per story, reusing results of unchanged stories."""
+  from qa_orchestrator.fingerprint import agent_fingerprint
+
+  results = store.map_items(
+    namespace,
+    "test_cases",
+    stories,
+    lambda story: _call_agent(agent, {"prompt": STORY_TEST_CASES_PROMPT, "story": story}),
+    version=[agent_fingerprint(agent), STORY_TEST_CASES_PROMPT],
+  )
+  cases, errors = [], []
+  for index, result in enumerate(results):
+    if isinstance(result, dict) and result.get("error"):
+      errors.append(f"story {index}: {result.get('error')}")
+    elif isinstance(result, dict) and isinstance(result.get("test_cases"), list):
+      cases.extend(result["test_cases"])
+    else:
+      cases.append(result)
+  merged = {"test_cases": cases}
+  if errors:
+    merged["error"] = "; ".join(errors)
+  return merged
+
+
+def _specialist_calls(specialists, input_data, store, namespace):
+  """One zero-argument callable per specialist, as (result key, callable)."""
+  stories = _story_list(input_data) if store is not None else None
+  calls = []
+  for key, agent in specialists:
+    if key == "test_cases" and stories:
+      calls.append((key, partial(_author_per_story, agent, stories, store, namespace)))
+    else:
+      calls.append((key, partial(_call_agent, agent, input_data)))
+  return calls
+
+
+def _call_specialists_concurrently(calls, timeout, max_workers):
+  """Run specialist calls on a bounded thread pool and collect what finishes in time.
+
+  Specialists still running when `timeout` expires are abandoned (their
+  worker threads are not joined) and reported as `{"error": "timed out ..."}`.
+  With `max_workers` below the number of specialists, queueing time counts
+  towards the timeout.
   """
-  # Preferred explicit ADK signature
-  call_fn = getattr(agent, "call", None)
-  if callable(call_fn):
-    try:
-      prompt = payload.get("prompt") if isinstance(payload, dict) else str(payload)
-      return call_fn(prompt, payload)
-    except Exception as e:
-      return {"error": f"agent.call failed: {e}"}
-
-  # Fallback to other common methods
-  for method in ("run", "invoke", "execute", "respond", "get_response"):
-    fn = getattr(agent, method, None)
-    if callable(fn):
-      try:
-        return fn(payload)
-      except Exception as e:
-        return {"error": f"agent {method} failed: {e}"}
-
-  # Final fallback: placeholder
-  return {
-    "agent": getattr(agent, "name", str(agent)),
-    "note": "no callable method available; returned placeholder",
-    "instruction": getattr(agent, "instruction", None),
-    "input_received": payload,
-  }
-
-
-def delegate_design(input_data: dict) -> dict:
+  executor = ThreadPoolExecutor(
+    max_workers=max_workers or len(calls),
+    thread_name_prefix="delegate-design",
+  )
+  try:
+    futures = {executor.submit(call): key for key, call in calls}
+    done, _ = wait(futures, timeout=timeout)
+
+    agg = {}
+    for future, key in futures.items():
+      if future in done:
+        agg[key] = future.result()
+      else:
+        future.cancel()
+        agg[key] = {"error": f"timed out after {timeout:g}s"}
+    return agg
+  finally:
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def delegate_design(
+  input_data: dict,
+  concurrent: bool = True,
+  timeout: Optional[float] = DEFAULT_AGENT_TIMEOUT,
+  max_workers: Optional[int] = None,
+  store=None,
+  namespace: str = "default",
+) -> dict:
   """Delegate design tasks to specialized designer agents and aggregate outputs.
 
   Args:
     input_data: dict containing stories/acceptance criteria and context
+    concurrent: run the specialists in parallel instead of one after another
+    timeout: seconds to wait for the specialists in concurrent mode; `None`
+      waits indefinitely
+    max_workers: thread pool size in concurrent mode (default: one per agent)
+    store: optional `PhaseStore`; when `input_data["phase1_data"]` carries
+      stories, test cases are then authored per story and only stories that
+      changed since the last run in `namespace` are sent to TestCase_Author
+    namespace: store namespace, typically the session id
 
   Returns:
-    Aggregated dict following legacy `phase3_data` shape as best-effort.
+    Aggregated dict following legacy `phase3_data` shape as best-effort. In
+    concurrent mode, specialists that time out are reported in
+    `validation_errors` and the remaining fields are still returned.
   """
-  from agents.testplan_designer import testplan_designer
-  from agents.testcase_author import testcase_author
-  from agents.coverage_analyst import coverage_analyst
-  from agents.testdata_engineer import testdata_engineer
-  from agents.suite_organizer import suite_organizer
-
-  agg = {}
+  calls = _specialist_calls(_load_specialists(), input_data, store, namespace)
 
-  # Call each specialized agent with the provided input and collect results
-  agg["test_plan"] = _call_agent(testplan_designer, input_data)
-  agg["test_cases"] = _call_agent(testcase_author, input_data)
-  agg["coverage_analysis"] = _call_agent(coverage_analyst, input_data)
-  agg["test_data"] = _call_agent(testdata_engineer, input_data)
-  agg["suites"] = _call_agent(suite_organizer, input_data)
+  if concurrent:
+    agg = _call_specialists_concurrently(calls, timeout, max_workers)
+  else:
+    # Call each specialized agent with the provided input and collect results
+    agg = {key: call() for key, call in calls}
 
   # Normalize into legacy fields where possible
   result = {
@@ -111,4 +193,4 @@ def delegate_design(input_data: dict) -> dict:
     if isinstance(v, dict) and v.get("error"):
       result["validation_errors"].append(f"{k}: {v.get('error')}")
 
-  return result
\ No newline at end of file
+  return result
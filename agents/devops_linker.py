@@ -16,5 +16,8 @@ Output JSON:
   "azure_actions": [ {"action":"create_work_item","type":"User Story","title":"...","payload":{}} ],
   "links": [ {"source_id":123,"target_id":456,"relation":"Related"} ]
 }
+
+Use one of these relation names: Related, Parent, Child, Predecessor, Successor,
+Blocks, Blocked By, Duplicate, Duplicate Of, Tests, Tested By.
 """,
 )
@@ -0,0 +1,121 @@
+"""Declarative wiring of the 7-phase QA lifecycle as a `PhaseGraph`.
+
+Each node reads the `output_key`s of the phases it depends on and produces
+its own, so phases without a data dependency (planning and resource
+planning, for example) run concurrently. Every node's `version` is the
+fingerprint of the agents it calls, so editing a prompt or switching a
+model recomputes the phases that use it instead of reusing stored outputs.
+"""
+
+from typing import Optional
+
+from qa_orchestrator.fingerprint import agent_fingerprint
+from qa_orchestrator.invoker import invoke_agent
+from qa_orchestrator.phase_graph import DEFAULT_MAX_WORKERS, PhaseGraph
+
+
+def _agent_node(agent, *inputs):
+  """Build a node function that calls `agent` with its declared inputs."""
+  def run(state):
+    payload = state[inputs[0]] if len(inputs) == 1 else dict(state)
+    return invoke_agent(agent, payload)
+
+  return run
+
+
+def build_lifecycle_graph(
+  max_workers: Optional[int] = None,
+  store=None,
+  session_id: str = "default",
+) -> PhaseGraph:
+  """Return the lifecycle DAG seeded by a `requirements` input.
+
+  With a `PhaseStore`, the design phase authors test cases per story through
+  `PhaseStore.map_items`, so editing one story only re-authors that story.
+  """
+  from agents.architect import ARCHITECTURE_AGENTS, delegate_architecture
+  from agents.designer import DESIGN_SPECIALISTS, delegate_design
+  from agents.registry import get_agent
+
+  planner = get_agent("planner")
+  resource_planner = get_agent("resource_planner")
+  test_automation_designer = get_agent("test_automation_designer")
+  test_executor = get_agent("test_executor")
+  issue_tracker = get_agent("issue_tracker")
+  report_generator = get_agent("report_generator")
+
+  graph = PhaseGraph(max_workers or DEFAULT_MAX_WORKERS)
+  graph.add(
+    "architecture",
+    lambda s: delegate_architecture(s["requirements"]),
+    inputs=["requirements"],
+    output_key="phase1_data",
+    version=agent_fingerprint(*(get_agent(name) for name in ARCHITECTURE_AGENTS)),
+  )
+  graph.add(
+    "planning",
+    _agent_node(planner, "phase1_data"),
+    inputs=["phase1_data"],
+    output_key="phase2_data",
+    version=agent_fingerprint(planner),
+  )
+  graph.add(
+    "resource_planning",
+    _agent_node(resource_planner, "phase1_data"),
+    inputs=["phase1_data"],
+    output_key="resource_plan",
+    version=agent_fingerprint(resource_planner),
+  )
+  graph.add(
+    "design",
+    lambda s: delegate_design(dict(s), store=store, namespace=session_id),
+    inputs=["phase1_data", "phase2_data"],
+    output_key="phase3_data",
+    version=agent_fingerprint(*(get_agent(name) for _, name in DESIGN_SPECIALISTS)),
+  )
+  graph.add(
+    "automation_design",
+    _agent_node(test_automation_designer, "phase3_data"),
+    inputs=["phase3_data"],
+    output_key="automation_framework_data",
+    version=agent_fingerprint(test_automation_designer),
+  )
+  graph.add(
+    "execution",
+    _agent_node(test_executor, "phase3_data", "automation_framework_data"),
+    inputs=["phase3_data", "automation_framework_data"],
+    output_key="execution_results",
+    version=agent_fingerprint(test_executor),
+  )
+  graph.add(
+    "issue_tracking",
+    _agent_node(issue_tracker, "execution_results"),
+    inputs=["execution_results"],
+    output_key="issue_tracking_data",
+    version=agent_fingerprint(issue_tracker),
+  )
+  graph.add(
+    "reporting",
+    _agent_node(report_generator, "phase3_data", "execution_results", "issue_tracking_data"),
+    inputs=["phase3_data", "execution_results", "issue_tracking_data"],
+    output_key="qa_reports",
+    version=agent_fingerprint(report_generator),
+  )
+  return graph
+
+
+def run_lifecycle(
+  requirements,
+  max_workers: Optional[int] = None,
+  store=None,
+  session_id: str = "default",
+) -> dict:
+  """Run the whole lifecycle graph for `requirements` and return the run result.
+
+  Pass a `PhaseStore` to re-run a session incrementally: phases whose
+  inputs are unchanged since the last run of `session_id` are reused, and
+  test cases are only re-authored for stories that changed.
+  """
+  return build_lifecycle_graph(max_workers, store, session_id).run(
+    {"requirements": requirements}, store=store, namespace=session_id
+  )
@@ -0,0 +1,86 @@
+"""Lazy registry of AQEE sub-agents.
+
+Agent modules are imported (and their `LlmAgent`s built) only when an agent
+is first requested, so importing the orchestrator no longer pays for all 22
+modules up front. `all()` still returns the complete, ordered list that the
+root orchestrator hands to ADK as `sub_agents`.
+"""
+
+import importlib
+import threading
+from typing import Dict, List
+
+# Sub-agents in the order they are presented to ADK. Each module under
+# `agents/` exports an agent instance with the same name as the module.
+SUB_AGENT_NAMES = (
+  "requirement_analyst",
+  "story_architect",
+  "acceptance_criteria_manager",
+  "devops_linker",
+  "architect",
+  "testplan_designer",
+  "testcase_author",
+  "coverage_analyst",
+  "testdata_engineer",
+  "suite_organizer",
+  "ui_framework_designer",
+  "api_framework_designer",
+  "ci_cd_designer",
+  "execution_strategy_designer",
+  "environment_manager",
+  "planner",
+  "designer",
+  "test_automation_designer",
+  "test_executor",
+  "report_generator",
+  "issue_tracker",
+  "resource_planner",
+)
+
+
+class AgentRegistry:
+  """Builds and caches agents on first use."""
+
+  def __init__(self, names=SUB_AGENT_NAMES, package: str = "agents"):
+    self._names = tuple(names)
+    self._package = package
+    self._agents: Dict[str, object] = {}
+    self._lock = threading.Lock()
+
+  def names(self) -> List[str]:
+    return list(self._names)
+
+  def loaded(self) -> List[str]:
+    """Names of the agents built so far."""
+    return [n for n in self._names if n in self._agents]
+
+  def get(self, name: str):
+    """Return the agent called `name`, importing its module if needed."""
+    try:
+      return self._agents[name]
+    except KeyError:
+      pass
+    if name not in self._names:
+      raise KeyError(f"Unknown agent: {name}")
+    with self._lock:
+      if name not in self._agents:
+        module = importlib.import_module(f"{self._package}.{name}")
+        self._agents[name] = getattr(module, name)
+    return self._agents[name]
+
+  def all(self) -> list:
+    """Return every registered agent in presentation order."""
+    return [self.get(name) for name in self._names]
+
+
+_registry = AgentRegistry()
+
+
+def get_registry() -> AgentRegistry:
+  """Get the global agent registry."""
+  return _registry
+
+
+def get_agent(name: str):
+  """Convenience function to get an agent from the global registry."""
+  return _registry.get(name)
@@ -9,10 +9,14 @@ suite_organizer = LlmAgent(
 Responsibilities:
 - Group test cases into suites (smoke, regression, e2e) and map to CI jobs
 - Suggest parallelization and test sharding strategy
+- List the TestCase_Author ids of each suite in `test_case_ids`; nest sub-suites under `suites`
 
 Output JSON:
 {
-  "suites": [{"name":"Smoke","test_count":10}],
+  "suites": [
+    {"name":"Smoke","test_count":10,"test_case_ids":["TC-1","TC-2"],
+     "suites":[{"name":"Login","test_case_ids":["TC-1"]}]}
+  ],
   "ci_mapping": {"smoke":"job-smoke"}
 }
 """,
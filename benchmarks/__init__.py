@@ -0,0 +1 @@
+"""Benchmark harnesses for AQEE (run as ``python -m benchmarks.<name>``)."""
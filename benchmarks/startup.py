@@ -0,0 +1,197 @@
+"""
+Startup and import-time benchmark for the AQEE entry points.
+
+Each target is imported in fresh interpreters, both cold (empty bytecode
+cache, so every module is compiled) and warm (bytecode cache populated),
+and broken down per module using ``python -X importtime``.
+
+Usage:
+    python -m benchmarks.startup                     # print a report
+    python -m benchmarks.startup --check             # fail on regressions
+    python -m benchmarks.startup --update-baseline   # record new baseline
+
+``--check`` compares the median warm time of every target with
+``benchmarks/startup_baseline.json`` and exits with status 1 when a target
+is slower than ``baseline * (1 + tolerance)`` (with a few milliseconds of
+absolute slack for near-zero targets).
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "startup_baseline.json"
+
+# Target name -> statement executed in a fresh interpreter.
+TARGETS = {
+    "agent": "from agent import root_agent",
+    "qa_orchestrator.agent": "import qa_orchestrator.agent",
+    "agents": "import agents",
+}
+
+# Module prefixes reported as one group in the per-module breakdown.
+MODULE_GROUPS = ("google.adk", "google.genai", "pydantic", "requests", "agents", "qa_orchestrator")
+
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25
+# Absolute slack so sub-millisecond targets do not fail on timer noise.
+MIN_SLACK_MS = 5.0
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, object]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+        One dict per imported module with `module`, `self_us`,
+        `cumulative_us` and `depth` (nesting level of the import)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def group_breakdown(rows: List[Dict[str, object]]) -> Dict[str, float]:
+    """Sum self time (ms) per module group; ungrouped modules go to `other`."""
+    totals = {group: 0.0 for group in MODULE_GROUPS}
+    totals["other"] = 0.0
+    for row in rows:
+        module = row["module"]
+        group = next(
+            (g for g in MODULE_GROUPS if module == g or module.startswith(g + ".")),
+            "other",
+        )
+        totals[group] += row["self_us"] / 1000.0
+    return {k: round(v, 2) for k, v in totals.items()}
+
+
+def _run_import(statement: str, pycache_prefix: str) -> Dict[str, object]:
+    """Import `statement` in a fresh interpreter and return timings."""
+    code = (
+        "import time; _t = time.perf_counter(); "
+        f"{statement}; "
+        "print(round((time.perf_counter() - _t) * 1000, 3))"
+    )
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache_prefix)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import of '{statement}' failed:\n{proc.stderr[-2000:]}")
+    return {"wall_ms": float(proc.stdout.strip().splitlines()[-1]), "rows": parse_importtime(proc.stderr)}
+
+
+def measure_target(statement: str, repeat: int = DEFAULT_REPEAT) -> Dict[str, object]:
+    """Measure one cold and `repeat` warm imports of `statement`."""
+    with tempfile.TemporaryDirectory(prefix="aqee-pycache-") as prefix:
+        cold = _run_import(statement, prefix)
+        warm = [_run_import(statement, prefix) for _ in range(repeat)]
+
+    warm_times = [w["wall_ms"] for w in warm]
+    slowest_modules = sorted(warm[-1]["rows"], key=lambda r: r["self_us"], reverse=True)[:10]
+    return {
+        "cold_ms": cold["wall_ms"],
+        "warm_ms": round(statistics.median(warm_times), 3),
+        "warm_runs_ms": warm_times,
+        "groups_ms": group_breakdown(warm[-1]["rows"]),
+        "slowest_modules": [
+            {"module": r["module"], "self_ms": round(r["self_us"] / 1000.0, 2)}
+            for r in slowest_modules
+        ],
+    }
+
+
+def check_regressions(
+    results: Dict[str, Dict[str, object]],
+    baseline: Dict[str, object],
+    tolerance: Optional[float] = None,
+) -> List[str]:
+    """Return a message for every target whose warm time exceeds its baseline."""
+    tolerance = baseline.get("tolerance", DEFAULT_TOLERANCE) if tolerance is None else tolerance
+    failures = []
+    for name, result in results.items():
+        limit = baseline.get("targets", {}).get(name)
+        if limit is None:
+            continue
+        allowed = max(limit * (1 + tolerance), limit + MIN_SLACK_MS)
+        if result["warm_ms"] > allowed:
+            failures.append(
+                f"{name}: warm import {result['warm_ms']:.1f}ms exceeds "
+                f"baseline {limit:.1f}ms (allowed {allowed:.1f}ms)"
+            )
+    return failures
+
+
+def _format_report(results: Dict[str, Dict[str, object]]) -> str:
+    lines = []
+    for name, result in results.items():
+        lines.append(f"{name}: cold {result['cold_ms']:.1f}ms, warm {result['warm_ms']:.1f}ms (median)")
+        for group, ms in sorted(result["groups_ms"].items(), key=lambda kv: -kv[1]):
+            lines.append(f"    {group:<16} {ms:>9.2f}ms")
+        for row in result["slowest_modules"][:5]:
+            lines.append(f"    * {row['module']:<40} {row['self_ms']:>7.2f}ms")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", action="append", choices=sorted(TARGETS), help="target(s) to measure")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="warm runs per target")
+    parser.add_argument("--check", action="store_true", help="fail when a target regresses past the baseline")
+    parser.add_argument("--tolerance", type=float, help="allowed slowdown over baseline (e.g. 0.25)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="write warm medians as the new baseline")
+    parser.add_argument("--json", type=Path, help="also write full results to this file")
+    args = parser.parse_args(argv)
+
+    results = {name: measure_target(TARGETS[name], args.repeat) for name in (args.target or TARGETS)}
+    print(_format_report(results))
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        baseline = {
+            "tolerance": args.tolerance if args.tolerance is not None else DEFAULT_TOLERANCE,
+            "targets": {name: r["warm_ms"] for name, r in results.items()},
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; run with --update-baseline first")
+            return 1
+        failures = check_regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,21 +26,19 @@ def init_runtime_components():
     from google.adk.tools import FunctionTool
     from .custom_functions import validate_phase_output
 
-    # Import agent instances lazily (these modules should only define agents)
+    # Build the full sub-agent list through the lazy registry; agent modules
+    # are only imported here, not when this module is imported.
     try:
-        from agents.architect import architect
-        from agents.planner import planner
-        from agents.designer import designer
+        from agents.registry import get_registry
+        sub_agents = get_registry().all()
     except Exception:
         # If sub-agents aren't importable, leave sub_agents empty; caller can
         # handle/report the error when attempting to run.
-        architect = planner = designer = None
+        sub_agents = []
 
     # Initialize tools lazily
     validator_tool = FunctionTool(func=validate_phase_output)
 
-    sub_agents = [a for a in (architect, planner, designer) if a is not None]
-
     # Attach to root_agent
     if sub_agents:
         setattr(root_agent, "sub_agents", sub_agents)
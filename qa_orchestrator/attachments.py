@@ -0,0 +1,146 @@
+"""
+Streaming upload of test execution attachments (logs, screenshots, videos).
+
+Files are never loaded whole: work item attachments use the Azure DevOps
+chunked upload protocol and read the file in fixed-size buffers, one chunk in
+memory per upload, and test result attachments stream their base64 JSON body
+from the same buffered reads. Several files upload in parallel. When a chunk
+still fails after the client's retries, the upload returns a `resume` token
+(attachment url and next offset); passing it back continues from that chunk
+instead of starting over.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+import base64
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Chunk size for chunked uploads; must be well under the service's per-request limit.
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+
+
+def _read_chunks(path: str, chunk_size: int, offset: int = 0) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def base64_json_body(path: str, fields: Dict[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Stream `{...fields, "stream": "<base64 of file>"}` as JSON bytes.
+
+    The file is read in buffers whose size is a multiple of 3, so each
+    buffer encodes to base64 without padding in the middle of the stream.
+    """
+    head = json.dumps(fields)[:-1]
+    yield f'{head}, "stream": "'.encode("utf-8") if fields else b'{"stream": "'
+    for chunk in _read_chunks(path, chunk_size - chunk_size % 3 or 3):
+        yield base64.b64encode(chunk)
+    yield b'"}'
+
+
+class AttachmentUploader:
+    """Uploads files to Azure DevOps with flat memory use."""
+
+    def __init__(self, client=None, chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            client: `AzureDevOpsClient` (defaults to the global client)
+            chunk_size: Bytes per chunk and read buffer
+            max_workers: Files uploaded in parallel
+        """
+        if client is None:
+            from qa_orchestrator.azure_devops import get_ado_client
+            client = get_ado_client()
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    def upload(self, project: str, path: str, resume: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Upload one file as a work item attachment.
+
+        Args:
+            project: Azure DevOps project name
+            path: File to upload
+            resume: `resume` token from a previous failed upload of this file
+
+        Returns:
+            `{"path", "id", "url", "size"}` on success, or `{"path", "error",
+            "resume"}` where `resume` can be passed back to continue
+        """
+        size = os.path.getsize(path)
+        mtime = os.path.getmtime(path)
+        if resume and (resume.get("size") != size or resume.get("mtime") != mtime):
+            logger.warning(f"{path} changed since the failed upload; starting over")
+            resume = None
+
+        if resume:
+            attachment = {"id": resume["id"], "url": resume["url"]}
+            offset = resume["offset"]
+        else:
+            attachment = self.client.start_chunked_attachment(project, os.path.basename(path))
+            if not attachment:
+                return {"path": path, "error": "could not start upload", "resume": None}
+            offset = 0
+
+        for chunk in _read_chunks(path, self.chunk_size, offset):
+            if not self.client.upload_attachment_chunk(attachment["url"], chunk, offset, size):
+                token = {"id": attachment["id"], "url": attachment["url"], "offset": offset, "size": size, "mtime": mtime}
+                return {"path": path, "error": f"chunk at byte {offset} failed", "resume": token}
+            offset += len(chunk)
+
+        logger.info(f"Uploaded attachment {os.path.basename(path)} ({size} bytes)")
+        return {"path": path, "id": attachment["id"], "url": attachment["url"], "size": size}
+
+    def upload_many(
+        self, project: str, paths: List[str], resume: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Upload files in parallel; results follow input order. `resume` maps path to token."""
+        resume = resume or {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="attach") as pool:
+            return list(pool.map(lambda p: self.upload(project, p, resume.get(p)), paths))
+
+    def attach_to_work_item(
+        self, project: str, work_item_id: int, paths: List[str], comment: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Upload files and link them to a work item (e.g. a Bug) as AttachedFile relations.
+
+        Returns:
+            Dict with `uploaded` and `failed` upload results and `linked`
+        """
+        results = self.upload_many(project, paths)
+        uploaded = [r for r in results if "error" not in r]
+        failed = [r for r in results if "error" in r]
+        linked = bool(uploaded) and self.client.attach_files_to_work_item(
+            project, work_item_id, [r["url"] for r in uploaded], comment
+        ) is not None
+        return {"uploaded": uploaded, "failed": failed, "linked": linked}
+
+    def attach_to_test_result(
+        self,
+        project: str,
+        run_id: int,
+        result_id: int,
+        path: str,
+        comment: str = "",
+        attachment_type: str = "GeneralAttachment",
+    ) -> Optional[Dict[str, Any]]:
+        """Attach a file to a test result, streaming its base64 body."""
+        fields = {
+            "fileName": os.path.basename(path),
+            "comment": comment,
+            "attachmentType": attachment_type,
+        }
+        body = base64_json_body(path, fields, self.chunk_size)
+        return self.client.create_test_result_attachment(project, run_id, result_id, fields["fileName"], body)
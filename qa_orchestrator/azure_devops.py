@@ -8,48 +8,339 @@ Provides secure integration with Azure DevOps for:
 - Retrieving project information
 """
 
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Iterator, List, Any, Tuple
+import json
 import logging
+import os
+import threading
+import time
+import weakref
 import requests
 from base64 import b64encode
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib.parse import quote
+from xml.sax.saxutils import escape as _xml_escape
+from qa_orchestrator.dedup_index import DEFAULT_CLAIM_TIMEOUT, DedupIndex, dedup_key
+from qa_orchestrator.metadata_cache import MetadataCache
+from qa_orchestrator.pagination import iter_items
 from qa_orchestrator.secrets import get_credential
+from qa_orchestrator.throttle import (
+    BACKOFF_BASE,
+    BACKOFF_CAP,
+    DEFAULT_MAX_RETRIES,
+    IDEMPOTENT_METHODS,
+    AdaptiveRateLimiter,
+    backoff_delay,
+    should_retry_status,
+)
 
 logger = logging.getLogger(__name__)
 
+# Connection/read timeouts (seconds) and HTTP connection pool size; override
+# per client or via AZURE_DEVOPS_CONNECT_TIMEOUT, AZURE_DEVOPS_READ_TIMEOUT and
+# AZURE_DEVOPS_POOL_SIZE (match the pool size to the number of worker threads
+# sharing a client).
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_POOL_SIZE = 10
+
+# Azure DevOps accepts at most 200 operations per $batch request, 200 ids per
+# workitemsbatch request and returns at most 20000 ids per WIQL query.
+MAX_BATCH_SIZE = 200
+MAX_WIQL_RESULTS = 20000
+
+# Items per page for endpoints paged with $top/$skip.
+DEFAULT_PAGE_SIZE = 200
+
+# Test case ids per "add test cases to suite" call; ids travel in the URL path.
+SUITE_ADD_CHUNK = 100
+# The comma-separated-ids suite endpoint is only served by the legacy test API.
+LEGACY_TEST_API_VERSION = "5.0"
+DEFAULT_BATCH_SIZE = 100
+
+# Friendly relation names (as emitted by DevOps_Linker) to link type reference
+# names. Reference names such as "System.LinkTypes.Related" pass through.
+RELATION_TYPES = {
+    "related": "System.LinkTypes.Related",
+    "parent": "System.LinkTypes.Hierarchy-Reverse",
+    "child": "System.LinkTypes.Hierarchy-Forward",
+    "successor": "System.LinkTypes.Dependency-Forward",
+    "predecessor": "System.LinkTypes.Dependency-Reverse",
+    "blocks": "System.LinkTypes.Dependency-Forward",
+    "blocked by": "System.LinkTypes.Dependency-Reverse",
+    "depends on": "System.LinkTypes.Dependency-Reverse",
+    "duplicate": "System.LinkTypes.Duplicate-Forward",
+    "duplicate of": "System.LinkTypes.Duplicate-Reverse",
+    "tests": "Microsoft.VSTS.Common.TestedBy-Reverse",
+    "tested by": "Microsoft.VSTS.Common.TestedBy-Forward",
+}
+
+
+def relation_type(name: str) -> Optional[str]:
+    """Resolve a relation name to its link type reference name."""
+    name = (name or "").strip()
+    if "." in name:
+        return name
+    return RELATION_TYPES.get(name.replace("-", " ").replace("_", " ").lower())
+
+
+def _auth_headers(token: str) -> Dict[str, str]:
+    """Headers for Basic auth with a Personal Access Token."""
+    auth_string = b64encode(f":{token}".encode()).decode()
+    return {
+        "Authorization": f"Basic {auth_string}",
+        "Content-Type": "application/json",
+    }
+
+
+def _not_sent(error: requests.RequestException) -> bool:
+    """Whether a request failed before reaching the server (no connection was made)."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _user_story_patch(title: str, description: str, acceptance_criteria: List[str]) -> List[Dict[str, Any]]:
+    """Build the JSON-patch document for a User Story."""
+    criteria_text = "\n".join(f"- {c}" for c in acceptance_criteria)
+    body = f"{description}\n\nAcceptance Criteria:\n{criteria_text}"
+    return [
+        {"op": "add", "path": "/fields/System.Title", "value": title},
+        {"op": "add", "path": "/fields/System.Description", "value": body},
+    ]
+
+
+def _unknown_field_paths(fields: Optional[List[Dict[str, Any]]], patch: List[Dict[str, Any]]) -> List[str]:
+    """`/fields/...` paths in `patch` missing from a field list (none if the list is empty)."""
+    if not fields:
+        return []
+    known = {f.get("referenceName", "").lower() for f in fields}
+    unknown = []
+    for op in patch:
+        path = op.get("path", "")
+        if path.startswith("/fields/"):
+            name = path[len("/fields/"):]
+            if name.lower() not in known and path not in unknown:
+                unknown.append(path)
+    return unknown
+
+
+def steps_xml(steps: List[str], expected_results: List[str]) -> str:
+    """
+    Encode test steps in the Azure DevOps `Microsoft.VSTS.TCM.Steps` XML format.
+
+    Step ids start at 2, as in items authored in the web UI. Steps with an
+    expected result are validate steps; the others are action steps.
+    """
+    parts = []
+    count = max(len(steps), len(expected_results))
+    for index in range(count):
+        action = steps[index] if index < len(steps) else ""
+        expected = expected_results[index] if index < len(expected_results) else ""
+        step_type = "ValidateStep" if expected else "ActionStep"
+        parts.append(
+            f'<step id="{index + 2}" type="{step_type}">'
+            f'<parameterizedString isformatted="true">{_xml_escape(str(action))}</parameterizedString>'
+            f'<parameterizedString isformatted="true">{_xml_escape(str(expected))}</parameterizedString>'
+            f"<description/></step>"
+        )
+    return f'<steps id="0" last="{count + 1}">{"".join(parts)}</steps>'
+
+
+def _test_case_patch(title: str, steps: List[str], expected_results: List[str]) -> List[Dict[str, Any]]:
+    """Build the JSON-patch document for a Test Case."""
+    return [
+        {"op": "add", "path": "/fields/System.Title", "value": title},
+        {"op": "add", "path": "/fields/Microsoft.VSTS.TCM.Steps", "value": steps_xml(steps, expected_results)},
+    ]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}; using {default}")
+        return default
+
+
+# Live clients, so the at-fork hook can reset their sessions in the child.
+_clients: "weakref.WeakSet[AzureDevOpsClient]" = weakref.WeakSet()
+
+
+def _reset_clients_after_fork() -> None:
+    for client in list(_clients):
+        client._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
+
 
 class AzureDevOpsClient:
     """Secure client for Azure DevOps API interactions."""
 
-    def __init__(self):
-        """Initialize Azure DevOps client with credentials from environment."""
+    def __init__(
+        self,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        pool_size: Optional[int] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        validate_fields: bool = True,
+        dedup_index: Optional[DedupIndex] = None,
+    ):
+        """
+        Initialize Azure DevOps client with credentials from environment.
+
+        Args:
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for response data
+            pool_size: Connections kept per host; size it to the number of
+                threads sharing this client
+            metadata_cache: Cache for project/type/field lookups (defaults to
+                one backed by AZURE_DEVOPS_METADATA_CACHE_PATH, if set)
+            validate_fields: Check work item field paths against the cached
+                field list before sending creates
+            dedup_index: Idempotency index for creates (defaults to one backed
+                by AZURE_DEVOPS_DEDUP_INDEX_PATH, or in memory)
+        """
         self.org_url = get_credential("azure_devops_org_url")
         self.token = get_credential("azure_devops_token")
         self.api_version = "7.1"
         self.session = None
+        self.rate_limiter = AdaptiveRateLimiter()
+        self.max_retries = DEFAULT_MAX_RETRIES
+        self.connect_timeout = connect_timeout or _env_float("AZURE_DEVOPS_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)
+        self.read_timeout = read_timeout or _env_float("AZURE_DEVOPS_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)
+        self.pool_size = pool_size or int(_env_float("AZURE_DEVOPS_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.metadata_cache = metadata_cache or MetadataCache(os.getenv("AZURE_DEVOPS_METADATA_CACHE_PATH"))
+        self.validate_fields = validate_fields
+        self.dedup_index = dedup_index or DedupIndex(
+            os.getenv("AZURE_DEVOPS_DEDUP_INDEX_PATH"),
+            claim_timeout=max(DEFAULT_CLAIM_TIMEOUT, 2 * self.max_send_seconds()),
+        )
+        self._session_lock = threading.Lock()
+        self._session_pid = None
+        _clients.add(self)
 
     def _setup_session(self) -> requests.Session:
-        """Create authenticated session."""
-        if self.session:
+        """
+        Create authenticated session.
+
+        One session is shared by all threads of a process. A session created
+        before `fork()` is never reused in the child: it is dropped by the
+        at-fork hook and, as a fallback, rebuilt when the pid changes.
+        """
+        if self.session and self._session_pid in (None, os.getpid()):
             return self.session
 
         if not self.org_url or not self.token:
             logger.error("Azure DevOps credentials not configured")
             return None
 
-        session = requests.Session()
-        # Azure DevOps uses Basic auth with PAT
-        auth_string = b64encode(f":{self.token}".encode()).decode()
-        session.headers.update({
-            "Authorization": f"Basic {auth_string}",
-            "Content-Type": "application/json",
-        })
-        self.session = session
-        return session
+        with self._session_lock:
+            if self.session and self._session_pid in (None, os.getpid()):
+                return self.session
+
+            session = requests.Session()
+            # Azure DevOps uses Basic auth with PAT
+            session.headers.update(_auth_headers(self.token))
+            # Retries are handled by _send, so the adapter never retries.
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_size,
+                pool_maxsize=self.pool_size,
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.session = session
+            self._session_pid = os.getpid()
+            return session
+
+    def _reset_after_fork(self) -> None:
+        """Drop state inherited from the parent process."""
+        self._session_lock = threading.Lock()
+        self.session = None
+        self._session_pid = None
+        self.rate_limiter.reset_after_fork()
+        self.metadata_cache.reset_after_fork()
+        self.dedup_index.reset_after_fork()
+
+    def max_send_seconds(self) -> float:
+        """Longest `_send` can take, ignoring Retry-After pauses: every attempt
+        timing out plus the largest backoff between attempts."""
+        attempts = self.max_retries + 1
+        backoff = sum(min(BACKOFF_CAP, BACKOFF_BASE * (2 ** a)) for a in range(self.max_retries))
+        return attempts * (self.connect_timeout + self.read_timeout) + backoff
 
     def is_configured(self) -> bool:
         """Check if Azure DevOps integration is properly configured."""
         return bool(self.org_url and self.token)
 
+    def _send(
+        self, session: requests.Session, method: str, url: str, idempotent: Optional[bool] = None, **kwargs
+    ) -> requests.Response:
+        """
+        Send a request through the rate limiter, retrying throttled and
+        transient failures.
+
+        Every request carries the client's (connect, read) timeout, so a hung
+        endpoint cannot block a worker forever. Failures are retried up to
+        `max_retries` times, waiting for `Retry-After` when the service sends
+        it and jittered exponential backoff otherwise:
+
+        - idempotent requests on 429/5xx responses, connection errors and
+          timeouts;
+        - other requests (POST/PATCH creates) only when they cannot have been
+          applied: connection failures before sending, 429, and 503 with
+          `Retry-After` (see `should_retry_status`).
+
+        The last response is returned (callers still call
+        `raise_for_status`); the last connection error is re-raised.
+
+        Args:
+            idempotent: Whether the request may be repeated safely; defaults
+                to True for `IDEMPOTENT_METHODS`. Pass True for read-only
+                POSTs such as WIQL queries.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", (self.connect_timeout, self.read_timeout))
+        metrics = self.rate_limiter.metrics
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not (idempotent or _not_sent(e)):
+                    raise
+                if attempt >= self.max_retries:
+                    metrics.incr("give_ups")
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Azure DevOps {method} failed ({e}); retrying in {delay:.1f}s")
+            else:
+                retry_after = self.rate_limiter.observe(response.status_code, response.headers)
+                if not should_retry_status(response.status_code, retry_after, idempotent):
+                    return response
+                if attempt >= self.max_retries:
+                    metrics.incr("give_ups")
+                    return response
+                # The limiter already pauses every caller for Retry-After.
+                delay = 0.0 if retry_after is not None else backoff_delay(attempt)
+                logger.warning(
+                    f"Azure DevOps {method} returned {response.status_code}; "
+                    f"retry {attempt + 1}/{self.max_retries}"
+                )
+            metrics.incr("retries")
+            if delay:
+                time.sleep(delay)
+
+    def throttle_metrics(self) -> Dict[str, float]:
+        """Throttling and retry counters plus the current request rate."""
+        return self.rate_limiter.snapshot()
+
     def create_user_story(
         self,
         project: str,
@@ -77,23 +368,26 @@ class AzureDevOpsClient:
         if not session:
             return None
 
-        criteria_text = "\n".join(f"- {c}" for c in acceptance_criteria)
-        body = f"{description}\n\nAcceptance Criteria:\n{criteria_text}"
-
         url = f"{self.org_url}/{project}/_apis/wit/workitems/$User%20Story?api-version={self.api_version}"
 
-        payload = [
-            {"op": "add", "path": "/fields/System.Title", "value": title},
-            {"op": "add", "path": "/fields/System.Description", "value": body},
-        ]
+        payload = _user_story_patch(title, description, acceptance_criteria)
+        if not self._fields_valid(project, "User Story", payload):
+            return None
+
+        key, _ = dedup_key(project, "User Story", payload)
+        existing = self.dedup_index.claim(key, project, "User Story", title)
+        if existing is not None:
+            return existing
 
         try:
-            response = session.patch(url, json=payload)
+            response = self._send(session, "PATCH", url, json=payload)
             response.raise_for_status()
             result = response.json()
+            self.dedup_index.complete(key, result)
             logger.info(f"Created User Story: {result.get('id')}")
             return result
         except Exception as e:
+            self.dedup_index.release(key)
             logger.error(f"Failed to create User Story: {e}")
             return None
 
@@ -128,7 +422,7 @@ class AzureDevOpsClient:
         }
 
         try:
-            response = session.post(url, json=payload)
+            response = self._send(session, "POST", url, json=payload)
             response.raise_for_status()
             result = response.json()
             logger.info(f"Created Test Plan: {result.get('id')}")
@@ -137,6 +431,92 @@ class AzureDevOpsClient:
             logger.error(f"Failed to create Test Plan: {e}")
             return None
 
+    def create_test_suite(
+        self,
+        project: str,
+        plan_id: int,
+        name: str,
+        parent_suite_id: int,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Create a static Test Suite under `parent_suite_id`.
+
+        Args:
+            project: Azure DevOps project name
+            plan_id: Test Plan id
+            name: Suite name
+            parent_suite_id: Parent suite id (the plan's root suite for top-level suites)
+
+        Returns:
+            Test Suite details or None if failed
+        """
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot create Test Suite")
+            return None
+
+        session = self._setup_session()
+        if not session:
+            return None
+
+        url = f"{self.org_url}/{project}/_apis/testplan/Plans/{plan_id}/suites?api-version={self.api_version}"
+
+        payload = {
+            "suiteType": "staticTestSuite",
+            "name": name,
+            "parentSuite": {"id": parent_suite_id},
+        }
+
+        try:
+            response = self._send(session, "POST", url, json=payload)
+            response.raise_for_status()
+            result = response.json()
+            logger.info(f"Created Test Suite: {result.get('id')}")
+            return result
+        except Exception as e:
+            logger.error(f"Failed to create Test Suite: {e}")
+            return None
+
+    def add_test_cases_to_suite(
+        self,
+        project: str,
+        plan_id: int,
+        suite_id: int,
+        test_case_ids: List[int],
+    ) -> bool:
+        """
+        Add existing Test Cases to a suite, up to 100 ids per request.
+
+        Uses the endpoint that takes the ids as one comma-separated path
+        segment, so membership costs one call per chunk instead of one per case.
+
+        Returns:
+            True if every chunk was added
+        """
+        if not test_case_ids:
+            return True
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot add Test Cases to suite")
+            return False
+
+        session = self._setup_session()
+        if not session:
+            return False
+
+        ok = True
+        for start in range(0, len(test_case_ids), SUITE_ADD_CHUNK):
+            ids = ",".join(str(i) for i in test_case_ids[start:start + SUITE_ADD_CHUNK])
+            url = (
+                f"{self.org_url}/{project}/_apis/test/Plans/{plan_id}/suites/{suite_id}"
+                f"/testcases/{ids}?api-version={LEGACY_TEST_API_VERSION}"
+            )
+            try:
+                response = self._send(session, "POST", url)
+                response.raise_for_status()
+            except Exception as e:
+                logger.error(f"Failed to add Test Cases to suite {suite_id}: {e}")
+                ok = False
+        return ok
+
     def create_test_case(
         self,
         project: str,
@@ -164,47 +544,754 @@ class AzureDevOpsClient:
         if not session:
             return None
 
-        steps_text = "\n".join(f"{i+1}. {s}" for i, s in enumerate(steps))
-        results_text = "\n".join(f"{i+1}. {r}" for i, r in enumerate(expected_results))
-
         url = f"{self.org_url}/{project}/_apis/wit/workitems/$Test%20Case?api-version={self.api_version}"
 
-        payload = [
-            {"op": "add", "path": "/fields/System.Title", "value": title},
-            {"op": "add", "path": "/fields/Microsoft.VSTS.TCM.Steps", "value": steps_text},
-            {"op": "add", "path": "/fields/Microsoft.VSTS.TCM.ExpectedResult", "value": results_text},
-        ]
+        payload = _test_case_patch(title, steps, expected_results)
+        if not self._fields_valid(project, "Test Case", payload):
+            return None
+
+        key, _ = dedup_key(project, "Test Case", payload)
+        existing = self.dedup_index.claim(key, project, "Test Case", title)
+        if existing is not None:
+            return existing
 
         try:
-            response = session.patch(url, json=payload)
+            response = self._send(session, "PATCH", url, json=payload)
             response.raise_for_status()
             result = response.json()
+            self.dedup_index.complete(key, result)
             logger.info(f"Created Test Case: {result.get('id')}")
             return result
         except Exception as e:
+            self.dedup_index.release(key)
             logger.error(f"Failed to create Test Case: {e}")
             return None
 
-    def get_project_info(self, project: str) -> Optional[Dict[str, Any]]:
-        """Get project information from Azure DevOps."""
+    def create_user_stories(
+        self,
+        project: str,
+        stories: List[Dict[str, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many User Stories using Azure DevOps $batch requests.
+
+        Args:
+            project: Azure DevOps project name
+            stories: Dicts with `title`, `description` and `acceptance_criteria`
+                (the Story_Architect output shape)
+            batch_size: Work items per $batch request (at most 200)
+
+        Returns:
+            One entry per input story, in input order: the created work item,
+            or `{"error": ..., "status": ...}` if that item failed
+        """
+        patches = [
+            _user_story_patch(
+                s.get("title", ""),
+                s.get("description", ""),
+                s.get("acceptance_criteria") or [],
+            )
+            for s in stories
+        ]
+        return self._create_work_items(project, "User Story", patches, batch_size)
+
+    def create_test_cases(
+        self,
+        project: str,
+        test_cases: List[Dict[str, Any]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many Test Cases using Azure DevOps $batch requests.
+
+        Args:
+            project: Azure DevOps project name
+            test_cases: Dicts with `title`, `steps` and `expected_results`
+            batch_size: Work items per $batch request (at most 200)
+
+        Returns:
+            One entry per input test case, in input order: the created work
+            item, or `{"error": ..., "status": ...}` if that item failed
+        """
+        patches = [
+            _test_case_patch(
+                tc.get("title", ""),
+                tc.get("steps") or [],
+                tc.get("expected_results") or [],
+            )
+            for tc in test_cases
+        ]
+        return self._create_work_items(project, "Test Case", patches, batch_size)
+
+    def _create_work_items(
+        self,
+        project: str,
+        work_item_type: str,
+        patches: List[List[Dict[str, Any]]],
+        batch_size: int,
+    ) -> List[Dict[str, Any]]:
+        """Create work items from JSON-patch documents, `batch_size` per $batch call."""
+        if not patches:
+            return []
         if not self.is_configured():
-            logger.warning("Azure DevOps not configured")
+            logger.warning(f"Azure DevOps not configured; cannot create {work_item_type} items")
+            return [{"error": "Azure DevOps not configured", "status": None} for _ in patches]
+
+        unknown = self.unknown_fields(project, work_item_type, [op for patch in patches for op in patch])
+        if unknown:
+            logger.error(f"Not creating {work_item_type} items; unknown fields: {', '.join(unknown)}")
+            return [{"error": f"Unknown fields: {', '.join(unknown)}", "status": 400} for _ in patches]
+
+        # Claim each distinct create without waiting; identical patches in one
+        # call share a claim. Keys another worker is creating are deferred
+        # until this call's own claims are settled, so two bulk creates with
+        # overlapping keys never wait on each other.
+        results: List[Optional[Dict[str, Any]]] = [None] * len(patches)
+        first_index: Dict[str, int] = {}
+        duplicates: List[Tuple[int, int]] = []
+        to_create: List[Tuple[int, str]] = []
+        deferred: List[Tuple[int, str, str]] = []
+        for index, patch in enumerate(patches):
+            key, title = dedup_key(project, work_item_type, patch)
+            if key in first_index:
+                duplicates.append((index, first_index[key]))
+                continue
+            first_index[key] = index
+            claimed, existing = self.dedup_index.try_claim(key, project, work_item_type, title)
+            if claimed:
+                to_create.append((index, key))
+            elif existing is not None:
+                results[index] = existing
+            else:
+                deferred.append((index, key, title))
+
+        self._create_claimed(project, work_item_type, patches, to_create, batch_size, results)
+        if deferred:
+            logger.info(f"Waiting for {len(deferred)} {work_item_type} creates claimed by another worker")
+            to_create = []
+            for index, key, title in deferred:
+                existing = self.dedup_index.claim(key, project, work_item_type, title)
+                if existing is not None:
+                    results[index] = existing
+                else:
+                    to_create.append((index, key))
+            self._create_claimed(project, work_item_type, patches, to_create, batch_size, results)
+        for index, original in duplicates:
+            results[index] = results[original]
+        return results
+
+    def _create_claimed(
+        self,
+        project: str,
+        work_item_type: str,
+        patches: List[List[Dict[str, Any]]],
+        claimed: List[Tuple[int, str]],
+        batch_size: int,
+        results: List[Optional[Dict[str, Any]]],
+    ) -> None:
+        """Create the claimed `patches` entries into `results`, renewing the
+        pending claims before each $batch request."""
+        uri = (
+            f"/{quote(project)}/_apis/wit/workitems/${quote(work_item_type)}"
+            f"?api-version={self.api_version}"
+        )
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        for start in range(0, len(claimed), batch_size):
+            chunk = claimed[start:start + batch_size]
+            self.dedup_index.renew([key for _, key in claimed[start:]])
+            operations = [
+                {
+                    "method": "PATCH",
+                    "uri": uri,
+                    "headers": {"Content-Type": "application/json-patch+json"},
+                    "body": patches[index],
+                }
+                for index, _ in chunk
+            ]
+            created = self._send_batches(operations, batch_size, work_item_type)
+            for (index, key), result in zip(chunk, created):
+                if "error" in result:
+                    self.dedup_index.release(key)
+                else:
+                    self.dedup_index.complete(key, result)
+                results[index] = result
+
+    def link_work_items(
+        self,
+        project: str,
+        links: List[Dict[str, Any]],
+        mirror=None,
+        fetch_existing: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Apply DevOps_Linker `links` with one JSON-patch document per source.
+
+        Relations are grouped by source work item, and the per-source
+        documents are sent through $batch, so linking N relations from S
+        sources takes about S / batch_size requests. Relations that already
+        exist are skipped; existing relations come from `mirror` (a
+        `WorkItemMirror`) when it has the source, and are otherwise fetched
+        with `get_work_items`.
+
+        Args:
+            project: Azure DevOps project name
+            links: Dicts with `source_id`, `target_id` and `relation` (a name
+                such as "Related" or "Tested By", or a reference name)
+            mirror: Optional `WorkItemMirror` consulted for existing relations
+            fetch_existing: Fetch relations of sources not in `mirror`
+            batch_size: Source documents per $batch request (at most 200)
+
+        Returns:
+            Dict with `linked` and `skipped` counts and `errors`, a list of
+            `{"source_id", "target_id", "relation", "error", "status"}`
+            entries (`status` is 400 for links rejected before sending)
+        """
+        summary: Dict[str, Any] = {"linked": 0, "skipped": 0, "errors": []}
+        wanted: Dict[int, List[Tuple[str, int, Dict[str, Any]]]] = {}
+        seen = set()
+        for link in links:
+            rel = relation_type(link.get("relation", ""))
+            try:
+                source, target = int(link["source_id"]), int(link["target_id"])
+            except (KeyError, TypeError, ValueError):
+                summary["errors"].append({**link, "error": "missing or invalid work item id", "status": 400})
+                continue
+            if rel is None:
+                summary["errors"].append(
+                    {**link, "error": f"unknown relation {link.get('relation')!r}", "status": 400}
+                )
+                continue
+            if (source, rel, target) in seen:
+                summary["skipped"] += 1
+                continue
+            seen.add((source, rel, target))
+            wanted.setdefault(source, []).append((rel, target, link))
+
+        if not wanted:
+            return summary
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot link work items")
+            summary["errors"].extend(
+                {**link, "error": "Azure DevOps not configured", "status": None}
+                for pending in wanted.values() for _, _, link in pending
+            )
+            return summary
+
+        existing = self._existing_relations(project, list(wanted), mirror, fetch_existing)
+        sources, operations = [], []
+        for source, pending in wanted.items():
+            new = [(rel, target, link) for rel, target, link in pending if (rel, target) not in existing.get(source, ())]
+            summary["skipped"] += len(pending) - len(new)
+            if not new:
+                continue
+            sources.append(new)
+            operations.append({
+                "method": "PATCH",
+                "uri": f"/_apis/wit/workitems/{source}?api-version={self.api_version}",
+                "headers": {"Content-Type": "application/json-patch+json"},
+                "body": [
+                    {
+                        "op": "add",
+                        "path": "/relations/-",
+                        "value": {"rel": rel, "url": f"{self.org_url}/_apis/wit/workItems/{target}"},
+                    }
+                    for rel, target, _ in new
+                ],
+            })
+
+        results = self._send_batches(operations, batch_size, "relation") if operations else []
+        for new, result in zip(sources, results):
+            if "error" in result:
+                summary["errors"].extend(
+                    {**link, "error": result["error"], "status": result.get("status")} for _, _, link in new
+                )
+            else:
+                summary["linked"] += len(new)
+        return summary
+
+    def _existing_relations(
+        self, project: str, sources: List[int], mirror, fetch_existing: bool
+    ) -> Dict[int, set]:
+        """Map each source id to the (rel, target id) pairs it already has."""
+        existing: Dict[int, set] = {}
+        missing = []
+        for source in sources:
+            if mirror is not None and mirror.get(source) is not None:
+                existing[source] = set(mirror.relations(source))
+            else:
+                missing.append(source)
+        if missing and fetch_existing:
+            for item in self.get_work_items(project, missing) or []:
+                pairs = set()
+                for relation in item.get("relations") or []:
+                    tail = relation.get("url", "").rstrip("/").rsplit("/", 1)[-1]
+                    if tail.isdigit():
+                        pairs.add((relation.get("rel"), int(tail)))
+                existing[item["id"]] = pairs
+        return existing
+
+    def _send_batches(
+        self,
+        operations: List[Dict[str, Any]],
+        batch_size: int,
+        label: str,
+    ) -> List[Dict[str, Any]]:
+        """POST operations to the $batch endpoint and align results with inputs."""
+        session = self._setup_session()
+        if not session:
+            return [{"error": "Azure DevOps session unavailable", "status": None} for _ in operations]
+
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        url = f"{self.org_url}/_apis/wit/$batch?api-version={self.api_version}"
+        results: List[Dict[str, Any]] = []
+
+        for start in range(0, len(operations), batch_size):
+            chunk = operations[start:start + batch_size]
+            try:
+                response = self._send(session, "POST", url, json=chunk)
+                response.raise_for_status()
+                values = response.json().get("value", [])
+            except Exception as e:
+                logger.error(f"Failed to send {label} batch of {len(chunk)}: {e}")
+                results.extend({"error": str(e), "status": None} for _ in chunk)
+                continue
+
+            for index in range(len(chunk)):
+                item = values[index] if index < len(values) else None
+                results.append(self._batch_item_result(item))
+
+        created = sum(1 for r in results if "error" not in r)
+        logger.info(f"Batch {label}: {created}/{len(operations)} succeeded")
+        return results
+
+    @staticmethod
+    def _batch_item_result(item: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Decode one entry of a $batch response."""
+        if item is None:
+            return {"error": "missing from batch response", "status": None}
+        status = item.get("code")
+        body = item.get("body")
+        if isinstance(body, str):
+            try:
+                body = json.loads(body)
+            except ValueError:
+                pass
+        if status is not None and 200 <= status < 300:
+            return body if isinstance(body, dict) else {"value": body}
+        message = body.get("message") if isinstance(body, dict) else body
+        return {"error": message or f"HTTP {status}", "status": status}
+
+    def query_work_item_ids(
+        self, project: str, query: str, top: int = MAX_WIQL_RESULTS
+    ) -> Optional[List[int]]:
+        """
+        Run a WIQL query and return the matching work item ids.
+
+        Args:
+            project: Azure DevOps project name
+            query: WIQL text; date literals are compared at full time precision
+            top: Maximum ids to return (the service caps this at 20000)
+
+        Returns:
+            Work item ids in query order, or None if the query failed
+        """
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot run WIQL query")
             return None
 
         session = self._setup_session()
         if not session:
             return None
 
-        url = f"{self.org_url}/_apis/projects/{project}?api-version={self.api_version}"
+        url = (
+            f"{self.org_url}/{project}/_apis/wit/wiql"
+            f"?timePrecision=true&$top={min(top, MAX_WIQL_RESULTS)}&api-version={self.api_version}"
+        )
+
+        try:
+            response = self._send(session, "POST", url, idempotent=True, json={"query": query})
+            response.raise_for_status()
+            return [item["id"] for item in response.json().get("workItems", [])]
+        except Exception as e:
+            logger.error(f"Failed to run WIQL query: {e}")
+            return None
+
+    def get_work_items(
+        self, project: str, ids: List[int], expand: str = "Relations"
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch work items by id, 200 per workitemsbatch request.
+
+        Args:
+            project: Azure DevOps project name
+            ids: Work item ids
+            expand: `$expand` value; "Relations" includes links
+
+        Returns:
+            Work items (all fields plus relations), or None if any request failed
+        """
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot fetch work items")
+            return None
+        if not ids:
+            return []
+
+        session = self._setup_session()
+        if not session:
+            return None
+
+        url = f"{self.org_url}/{project}/_apis/wit/workitemsbatch?api-version={self.api_version}"
+        items: List[Dict[str, Any]] = []
 
         try:
-            response = session.get(url)
+            for start in range(0, len(ids), MAX_BATCH_SIZE):
+                body = {"ids": ids[start:start + MAX_BATCH_SIZE], "$expand": expand, "errorPolicy": "Omit"}
+                response = self._send(session, "POST", url, idempotent=True, json=body)
+                response.raise_for_status()
+                # Omitted (deleted or inaccessible) ids come back as nulls.
+                items.extend(item for item in response.json().get("value", []) if item)
+            return items
+        except Exception as e:
+            logger.error(f"Failed to fetch work items: {e}")
+            return None
+
+    def start_chunked_attachment(self, project: str, file_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Start a chunked attachment upload.
+
+        Returns:
+            Dict with the attachment `id` and `url` (the chunk upload target),
+            or None if failed
+        """
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot upload attachment")
+            return None
+
+        session = self._setup_session()
+        if not session:
+            return None
+
+        url = (
+            f"{self.org_url}/{project}/_apis/wit/attachments"
+            f"?fileName={quote(file_name)}&uploadType=Chunked&api-version={self.api_version}"
+        )
+
+        try:
+            response = self._send(session, "POST", url, headers={"Content-Type": "application/octet-stream"})
             response.raise_for_status()
             return response.json()
+        except Exception as e:
+            logger.error(f"Failed to start attachment upload for {file_name}: {e}")
+            return None
+
+    def upload_attachment_chunk(self, url: str, data: bytes, start: int, total: int) -> bool:
+        """
+        Upload bytes `start`..`start + len(data) - 1` of a chunked attachment.
+
+        Returns:
+            True if the chunk was accepted
+        """
+        session = self._setup_session()
+        if not session:
+            return False
+
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Range": f"bytes {start}-{start + len(data) - 1}/{total}",
+        }
+
+        try:
+            response = self._send(session, "PUT", f"{url}?api-version={self.api_version}", data=data, headers=headers)
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upload attachment chunk at byte {start}: {e}")
+            return False
+
+    def attach_files_to_work_item(
+        self, project: str, work_item_id: int, attachment_urls: List[str], comment: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Link uploaded attachments to a work item (e.g. a Bug) in one PATCH.
+
+        Returns:
+            Updated work item or None if failed
+        """
+        if not attachment_urls:
+            return None
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot attach files")
+            return None
+
+        session = self._setup_session()
+        if not session:
+            return None
+
+        url = f"{self.org_url}/{project}/_apis/wit/workitems/{work_item_id}?api-version={self.api_version}"
+        payload = [
+            {
+                "op": "add",
+                "path": "/relations/-",
+                "value": {"rel": "AttachedFile", "url": attachment_url, "attributes": {"comment": comment}},
+            }
+            for attachment_url in attachment_urls
+        ]
+
+        try:
+            response = self._send(
+                session, "PATCH", url, json=payload, headers={"Content-Type": "application/json-patch+json"}
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Failed to attach files to work item {work_item_id}: {e}")
+            return None
+
+    def create_test_result_attachment(
+        self,
+        project: str,
+        run_id: int,
+        result_id: int,
+        file_name: str,
+        body: Any,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Attach a file to a test result.
+
+        Args:
+            project: Azure DevOps project name
+            run_id: Test Run id
+            result_id: Test Result id within the run
+            file_name: Attachment file name
+            body: JSON request body, as bytes or an iterable of byte chunks
+                (streamed with chunked transfer encoding)
+
+        Returns:
+            Attachment reference or None if failed
+        """
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot attach file to test result")
+            return None
+
+        session = self._setup_session()
+        if not session:
+            return None
+
+        url = (
+            f"{self.org_url}/{project}/_apis/test/Runs/{run_id}/Results/{result_id}/attachments"
+            f"?api-version={self.api_version}-preview.1"
+        )
+
+        try:
+            # A streamed body cannot be replayed, so it bypasses the retry loop
+            # of _send and is sent exactly once.
+            self.rate_limiter.acquire()
+            response = session.request(
+                "POST", url, data=body, headers={"Content-Type": "application/json"},
+                timeout=(self.connect_timeout, self.read_timeout),
+            )
+            self.rate_limiter.observe(response.status_code, response.headers)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Failed to attach {file_name} to test result {result_id}: {e}")
+            return None
+
+    def _fetch_page(self, url: str, params: Dict[str, Any]) -> Tuple[List[Any], requests.Response]:
+        """GET one page of a list endpoint; errors propagate to the caller."""
+        session = self._setup_session()
+        if not session:
+            raise RuntimeError("Azure DevOps session unavailable")
+        response = self._send(session, "GET", url, params=params)
+        response.raise_for_status()
+        return response.json().get("value", []), response
+
+    def _paginate(self, url: str, label: str, page_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate a list endpoint lazily, one item at a time.
+
+        With `page_size`, pages are requested with `$top`/`$skip`; otherwise
+        the endpoint's `x-ms-continuationtoken` header is followed. A failed
+        page is logged and its error raised from the iterator, so a
+        truncated walk is never mistaken for a complete one.
+        """
+        if not self.is_configured():
+            logger.warning(f"Azure DevOps not configured; cannot list {label}")
+            return iter(())
+
+        def fetch(cursor):
+            params: Dict[str, Any] = {"api-version": self.api_version}
+            try:
+                if page_size:
+                    params.update({"$top": page_size, "$skip": cursor or 0})
+                    items, _ = self._fetch_page(url, params)
+                    return items, ((cursor or 0) + len(items) if len(items) == page_size else None)
+                if cursor:
+                    params["continuationToken"] = cursor
+                items, response = self._fetch_page(url, params)
+                return items, response.headers.get("x-ms-continuationtoken") or None
+            except Exception as e:
+                logger.error(f"Failed to list {label}: {e}")
+                raise
+
+        return iter_items(fetch)
+
+    def iter_test_plans(self, project: str) -> Iterator[Dict[str, Any]]:
+        """Iterate the Test Plans of a project."""
+        return self._paginate(f"{self.org_url}/{project}/_apis/testplan/plans", "Test Plans")
+
+    def iter_test_suites(self, project: str, plan_id: int) -> Iterator[Dict[str, Any]]:
+        """Iterate the Test Suites of a plan."""
+        return self._paginate(f"{self.org_url}/{project}/_apis/testplan/Plans/{plan_id}/suites", "Test Suites")
+
+    def iter_test_points(self, project: str, plan_id: int, suite_id: int) -> Iterator[Dict[str, Any]]:
+        """Iterate the Test Points of a suite."""
+        return self._paginate(
+            f"{self.org_url}/{project}/_apis/testplan/Plans/{plan_id}/Suites/{suite_id}/TestPoint",
+            "Test Points",
+        )
+
+    def iter_test_runs(self, project: str, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Iterate the Test Runs of a project."""
+        return self._paginate(f"{self.org_url}/{project}/_apis/test/runs", "Test Runs", page_size)
+
+    def iter_work_items(
+        self, project: str, where: str = "", page_size: int = MAX_BATCH_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate work items of a project, in id order.
+
+        Ids are paged with WIQL (`[System.Id] > last id`), so the 20000-result
+        WIQL cap does not apply, and each page is fetched with workitemsbatch.
+
+        Args:
+            project: Azure DevOps project name
+            where: Extra WIQL condition, e.g. "[System.WorkItemType] = 'Bug'"
+            page_size: Work items per page (at most 200)
+
+        Raises:
+            RuntimeError: From the iterator, if a page cannot be fetched
+        """
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured; cannot list work items")
+            return iter(())
+        page_size = max(1, min(page_size, MAX_BATCH_SIZE))
+        condition = f" AND ({where})" if where else ""
+
+        def fetch(after):
+            query = (
+                "SELECT [System.Id] FROM WorkItems "
+                f"WHERE [System.TeamProject] = @project AND [System.Id] > {after or 0}{condition} "
+                "ORDER BY [System.Id]"
+            )
+            ids = self.query_work_item_ids(project, query, top=page_size)
+            if ids is None:
+                raise RuntimeError(f"Failed to list work items of {project} after id {after or 0}")
+            if not ids:
+                return [], None
+            items = self.get_work_items(project, ids)
+            if items is None:
+                raise RuntimeError(f"Failed to fetch work items {ids[0]}-{ids[-1]} of {project}")
+            return items, (ids[-1] if len(ids) == page_size else None)
+
+        return iter_items(fetch)
+
+    def _cached_get(self, url: str, key: str, resource: str) -> Any:
+        """
+        GET `url` through the metadata cache.
+
+        Fresh entries are returned without a request; stale entries are
+        revalidated with `If-None-Match`, and a 304 keeps the cached body.
+        Errors propagate to the caller.
+        """
+        cache = self.metadata_cache
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(entry):
+            cache.record("hits")
+            return entry.value
+
+        session = self._setup_session()
+        if not session:
+            raise RuntimeError("Azure DevOps session unavailable")
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        response = self._send(session, "GET", url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            cache.record("revalidated")
+            cache.touch(key)
+            return entry.value
+
+        response.raise_for_status()
+        cache.record("misses")
+        value = response.json()
+        cache.set(key, resource, value, response.headers.get("ETag"))
+        return value
+
+    def get_project_info(self, project: str) -> Optional[Dict[str, Any]]:
+        """Get project information from Azure DevOps (cached)."""
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured")
+            return None
+
+        url = f"{self.org_url}/_apis/projects/{project}?api-version={self.api_version}"
+
+        try:
+            return self._cached_get(url, f"project:{project}", "project")
         except Exception as e:
             logger.error(f"Failed to get project info: {e}")
             return None
 
+    def get_work_item_types(self, project: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the work item type definitions of a project (cached)."""
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured")
+            return None
+
+        url = f"{self.org_url}/{project}/_apis/wit/workitemtypes?api-version={self.api_version}"
+
+        try:
+            return self._cached_get(url, f"work_item_types:{project}", "work_item_types").get("value", [])
+        except Exception as e:
+            logger.error(f"Failed to get work item types: {e}")
+            return None
+
+    def get_work_item_fields(self, project: str, work_item_type: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the fields of a work item type (cached)."""
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured")
+            return None
+
+        url = (
+            f"{self.org_url}/{project}/_apis/wit/workitemtypes/{quote(work_item_type)}/fields"
+            f"?api-version={self.api_version}"
+        )
+
+        try:
+            return self._cached_get(url, f"fields:{project}:{work_item_type}", "fields").get("value", [])
+        except Exception as e:
+            logger.error(f"Failed to get fields for {work_item_type}: {e}")
+            return None
+
+    def unknown_fields(
+        self, project: str, work_item_type: str, patch: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Return the `/fields/...` paths in `patch` that `work_item_type` lacks.
+
+        Validation is skipped (an empty list is returned) when
+        `validate_fields` is off or the field list cannot be fetched.
+        """
+        if not self.validate_fields:
+            return []
+        return _unknown_field_paths(self.get_work_item_fields(project, work_item_type), patch)
+
+    def _fields_valid(self, project: str, work_item_type: str, patch: List[Dict[str, Any]]) -> bool:
+        unknown = self.unknown_fields(project, work_item_type, patch)
+        if unknown:
+            logger.error(f"Not creating {work_item_type}; unknown fields: {', '.join(unknown)}")
+        return not unknown
+
 
 # Global Azure DevOps client instance
 _ado_client = AzureDevOpsClient()
@@ -0,0 +1,383 @@
+"""
+Async Azure DevOps client for concurrent work item creation.
+
+`AsyncAzureDevOpsClient` mirrors the synchronous `AzureDevOpsClient` API
+(`create_user_story`, `create_test_plan`, `create_test_case`,
+`get_project_info`) on top of a pooled `httpx.AsyncClient`. A semaphore caps
+the number of in-flight requests, so callers can `asyncio.gather` hundreds
+of creates without overwhelming the service; requests also go through the
+same adaptive rate limiter and retry policy as the sync client. Work item
+creates follow the sync client's safeguards too: field paths are checked
+against the (cached) field list of the type, and each create is claimed in a
+`DedupIndex`, so a retried or repeated create returns the existing item.
+
+Synchronous callers can use `BlockingAzureDevOpsClient`, a thin wrapper that
+runs the async client on a private event loop thread.
+"""
+
+from typing import Any, Awaitable, Dict, List, Optional
+from urllib.parse import quote
+import asyncio
+import logging
+import os
+import threading
+
+import httpx
+
+from qa_orchestrator.azure_devops import (
+    _auth_headers,
+    _test_case_patch,
+    _unknown_field_paths,
+    _user_story_patch,
+)
+from qa_orchestrator.dedup_index import POLL_INTERVAL, DedupIndex, dedup_key
+from qa_orchestrator.metadata_cache import MetadataCache
+from qa_orchestrator.secrets import get_credential
+from qa_orchestrator.throttle import (
+    DEFAULT_MAX_RETRIES,
+    IDEMPOTENT_METHODS,
+    AdaptiveRateLimiter,
+    backoff_delay,
+    should_retry_status,
+)
+
+logger = logging.getLogger(__name__)
+
+# Transport errors raised before a request reached the server; only these are
+# retried for non-idempotent requests.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 30.0
+
+
+class AsyncAzureDevOpsClient:
+    """Async client for Azure DevOps API interactions."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_connections: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        validate_fields: bool = True,
+        dedup_index: Optional[DedupIndex] = None,
+    ):
+        """
+        Args:
+            max_concurrency: Maximum requests in flight at once
+            max_connections: Connection pool size (defaults to max_concurrency)
+            timeout: Per-request timeout in seconds
+            transport: Optional httpx transport (e.g. a mock in tests)
+            metadata_cache: Cache for field lookups (defaults to one backed by
+                AZURE_DEVOPS_METADATA_CACHE_PATH, if set)
+            validate_fields: Check work item field paths against the cached
+                field list before sending creates
+            dedup_index: Idempotency index for creates (defaults to one backed
+                by AZURE_DEVOPS_DEDUP_INDEX_PATH, or in memory); share it with
+                the sync client to deduplicate across both
+        """
+        self.org_url = get_credential("azure_devops_org_url")
+        self.token = get_credential("azure_devops_token")
+        self.api_version = "7.1"
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections or max_concurrency
+        self.timeout = timeout
+        self._transport = transport
+        self.rate_limiter = AdaptiveRateLimiter()
+        self.max_retries = DEFAULT_MAX_RETRIES
+        self.metadata_cache = metadata_cache or MetadataCache(os.getenv("AZURE_DEVOPS_METADATA_CACHE_PATH"))
+        self.validate_fields = validate_fields
+        self.dedup_index = dedup_index or DedupIndex(os.getenv("AZURE_DEVOPS_DEDUP_INDEX_PATH"))
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def is_configured(self) -> bool:
+        """Check if Azure DevOps integration is properly configured."""
+        return bool(self.org_url and self.token)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=_auth_headers(self.token),
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self._transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send one request under the concurrency cap and rate limiter.
+
+        Throttled and transient failures are retried like
+        `AzureDevOpsClient._send`; the last response is returned as is.
+        """
+        client = self._get_client()
+        metrics = self.rate_limiter.metrics
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire_async()
+            try:
+                async with self._semaphore:
+                    response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if not (idempotent or isinstance(e, _NOT_SENT_ERRORS)):
+                    raise
+                if attempt >= self.max_retries:
+                    metrics.incr("give_ups")
+                    raise
+                delay = backoff_delay(attempt)
+            else:
+                retry_after = self.rate_limiter.observe(response.status_code, response.headers)
+                retry = should_retry_status(response.status_code, retry_after, idempotent)
+                if not retry or attempt >= self.max_retries:
+                    if retry:
+                        metrics.incr("give_ups")
+                    return response
+                delay = 0.0 if retry_after is not None else backoff_delay(attempt)
+            metrics.incr("retries")
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def _request(self, method: str, url: str, label: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Send a request and return its JSON body; failures are logged and None returned."""
+        if not self.is_configured():
+            logger.warning(f"Azure DevOps not configured; cannot {label}")
+            return None
+
+        try:
+            response = await self._send(method, url, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Failed to {label}: {e}")
+            return None
+
+    async def _cached_get(self, url: str, key: str, resource: str) -> Any:
+        """GET `url` through the metadata cache; see `AzureDevOpsClient._cached_get`."""
+        cache = self.metadata_cache
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(entry):
+            cache.record("hits")
+            return entry.value
+
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        response = await self._send("GET", url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            cache.record("revalidated")
+            cache.touch(key)
+            return entry.value
+
+        response.raise_for_status()
+        cache.record("misses")
+        value = response.json()
+        cache.set(key, resource, value, response.headers.get("ETag"))
+        return value
+
+    async def get_work_item_fields(self, project: str, work_item_type: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the fields of a work item type (cached)."""
+        if not self.is_configured():
+            logger.warning("Azure DevOps not configured")
+            return None
+
+        url = (
+            f"{self.org_url}/{project}/_apis/wit/workitemtypes/{quote(work_item_type)}/fields"
+            f"?api-version={self.api_version}"
+        )
+        try:
+            value = await self._cached_get(url, f"fields:{project}:{work_item_type}", "fields")
+            return value.get("value", [])
+        except Exception as e:
+            logger.error(f"Failed to get fields for {work_item_type}: {e}")
+            return None
+
+    async def unknown_fields(
+        self, project: str, work_item_type: str, patch: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Field paths in `patch` that `work_item_type` lacks; see `AzureDevOpsClient.unknown_fields`."""
+        if not self.validate_fields:
+            return []
+        return _unknown_field_paths(await self.get_work_item_fields(project, work_item_type), patch)
+
+    async def _create_work_item(
+        self, project: str, work_item_type: str, payload: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Validate, claim and send one work item create; None if it failed."""
+        if not self.is_configured():
+            logger.warning(f"Azure DevOps not configured; cannot create {work_item_type}")
+            return None
+
+        unknown = await self.unknown_fields(project, work_item_type, payload)
+        if unknown:
+            logger.error(f"Not creating {work_item_type}; unknown fields: {', '.join(unknown)}")
+            return None
+
+        key, title = dedup_key(project, work_item_type, payload)
+        # Poll instead of `claim()`, which would block the event loop.
+        while True:
+            claimed, existing = self.dedup_index.try_claim(key, project, work_item_type, title)
+            if claimed or existing is not None:
+                break
+            await asyncio.sleep(POLL_INTERVAL)
+        if existing is not None:
+            return existing
+
+        url = f"{self.org_url}/{project}/_apis/wit/workitems/${quote(work_item_type)}?api-version={self.api_version}"
+        result = await self._request(
+            "PATCH",
+            url,
+            f"create {work_item_type}",
+            json=payload,
+            headers={"Content-Type": "application/json-patch+json"},
+        )
+        if result:
+            self.dedup_index.complete(key, result)
+            logger.info(f"Created {work_item_type}: {result.get('id')}")
+        else:
+            self.dedup_index.release(key)
+        return result
+
+    def throttle_metrics(self) -> Dict[str, float]:
+        """Throttling and retry counters plus the current request rate."""
+        return self.rate_limiter.snapshot()
+
+    async def create_user_story(
+        self,
+        project: str,
+        title: str,
+        description: str,
+        acceptance_criteria: List[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Create a User Story in Azure DevOps; see `AzureDevOpsClient.create_user_story`."""
+        return await self._create_work_item(
+            project, "User Story", _user_story_patch(title, description, acceptance_criteria)
+        )
+
+    async def create_test_plan(
+        self, project: str, name: str, description: str
+    ) -> Optional[Dict[str, Any]]:
+        """Create a Test Plan in Azure DevOps; see `AzureDevOpsClient.create_test_plan`."""
+        url = f"{self.org_url}/{project}/_apis/test/plans?api-version={self.api_version}"
+        result = await self._request(
+            "POST",
+            url,
+            "create Test Plan",
+            json={"name": name, "description": description, "state": "Active"},
+        )
+        if result:
+            logger.info(f"Created Test Plan: {result.get('id')}")
+        return result
+
+    async def create_test_case(
+        self,
+        project: str,
+        title: str,
+        steps: List[str],
+        expected_results: List[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Create a Test Case in Azure DevOps; see `AzureDevOpsClient.create_test_case`."""
+        return await self._create_work_item(
+            project, "Test Case", _test_case_patch(title, steps, expected_results)
+        )
+
+    async def get_project_info(self, project: str) -> Optional[Dict[str, Any]]:
+        """Get project information from Azure DevOps."""
+        url = f"{self.org_url}/_apis/projects/{project}?api-version={self.api_version}"
+        return await self._request("GET", url, "get project info")
+
+    async def create_user_stories(
+        self, project: str, stories: List[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Create many User Stories concurrently; results follow input order."""
+        return await asyncio.gather(*(
+            self.create_user_story(
+                project,
+                s.get("title", ""),
+                s.get("description", ""),
+                s.get("acceptance_criteria") or [],
+            )
+            for s in stories
+        ))
+
+    async def create_test_cases(
+        self, project: str, test_cases: List[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Create many Test Cases concurrently; results follow input order."""
+        return await asyncio.gather(*(
+            self.create_test_case(
+                project,
+                tc.get("title", ""),
+                tc.get("steps") or [],
+                tc.get("expected_results") or [],
+            )
+            for tc in test_cases
+        ))
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    async def __aenter__(self) -> "AsyncAzureDevOpsClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+class BlockingAzureDevOpsClient:
+    """
+    Synchronous facade over `AsyncAzureDevOpsClient`.
+
+    Runs the async client on a private event loop in a daemon thread, so
+    existing sync call sites share one connection pool and concurrency cap
+    while keeping the `AzureDevOpsClient` method signatures.
+    """
+
+    def __init__(self, client: Optional[AsyncAzureDevOpsClient] = None, **client_kwargs):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="ado-async-loop", daemon=True
+        )
+        self._thread.start()
+        self.client = client or AsyncAzureDevOpsClient(**client_kwargs)
+
+    def _run(self, coro: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def is_configured(self) -> bool:
+        return self.client.is_configured()
+
+    def create_user_story(self, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        return self._run(self.client.create_user_story(*args, **kwargs))
+
+    def create_test_plan(self, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        return self._run(self.client.create_test_plan(*args, **kwargs))
+
+    def create_test_case(self, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        return self._run(self.client.create_test_case(*args, **kwargs))
+
+    def get_project_info(self, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        return self._run(self.client.get_project_info(*args, **kwargs))
+
+    def create_user_stories(self, *args, **kwargs) -> List[Optional[Dict[str, Any]]]:
+        return self._run(self.client.create_user_stories(*args, **kwargs))
+
+    def create_test_cases(self, *args, **kwargs) -> List[Optional[Dict[str, Any]]]:
+        return self._run(self.client.create_test_cases(*args, **kwargs))
+
+    def close(self) -> None:
+        """Close the async client and stop the loop thread."""
+        self._run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
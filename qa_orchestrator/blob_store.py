@@ -0,0 +1,227 @@
+"""
+Content-addressed, compressed storage for large session state values.
+
+Phase outputs (`phase1_data`, `phase3_data`, `qa_reports`, ...) can be
+hundreds of kilobytes of JSON. `BlobStore.spill()` replaces every value whose
+JSON encoding reaches `threshold` bytes with a small reference
+
+    {"$blob": "<sha256 of the JSON>", "size": <JSON bytes>}
+
+and writes the value once, zlib-compressed, to `<root>/<aa>/<sha256>.json.z`.
+Identical values, in any session, share one file. `LazyBlobState` is a dict
+that keeps references as they are and loads a blob only when its key is read.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import zlib
+
+from pydantic_core import to_jsonable_python
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOB_ROOT = os.path.join("data", ".adk", "blobs")
+DEFAULT_THRESHOLD = 32 * 1024
+DEFAULT_CACHE_ENTRIES = 64
+REF_KEY = "$blob"
+
+
+def _json_default(value: Any) -> Any:
+    # Same coercion as ADK's JSON-safe state deltas: rich types (datetimes,
+    # Pydantic models) faithfully, anything else as its string.
+    try:
+        return to_jsonable_python(value)
+    except Exception:
+        return str(value)
+
+
+def encode_value(value: Any) -> bytes:
+    """Canonical UTF-8 JSON encoding of a state value, as stored in a blob."""
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    ).encode("utf-8")
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get(REF_KEY), str) and len(value) <= 2
+
+
+class BlobStore:
+    """Compressed, deduplicated JSON blobs on local disk."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        threshold: int = DEFAULT_THRESHOLD,
+        cache_entries: int = DEFAULT_CACHE_ENTRIES,
+    ):
+        """
+        Args:
+            root: Blob directory (default: AQEE_BLOB_ROOT or data/.adk/blobs)
+            threshold: JSON size in bytes from which values are spilled
+            cache_entries: Decoded blobs kept in memory
+        """
+        self.root = root or os.getenv("AQEE_BLOB_ROOT", DEFAULT_BLOB_ROOT)
+        self.threshold = threshold
+        self.cache_entries = cache_entries
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"spilled": 0, "deduplicated": 0, "loaded": 0, "cache_hits": 0}
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.json.z")
+
+    def put(self, value: Any) -> Dict[str, Any]:
+        """Store `value` (if not already stored) and return its reference."""
+        return self._put_encoded(encode_value(value))
+
+    def _put_encoded(self, encoded: bytes) -> Dict[str, Any]:
+        digest = hashlib.sha256(encoded).hexdigest()
+        path = self.path_for(digest)
+        # Reuse refreshes the mtime, so garbage collection's grace period
+        # covers values stored again as well as new ones.
+        if self._touch(path):
+            self._count("deduplicated")
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial blob.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(zlib.compress(encoded, 6))
+                os.replace(tmp, path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            self._count("spilled")
+        return {REF_KEY: digest, "size": len(encoded)}
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        """Refresh an existing blob's mtime; False if there is no such blob."""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def get(self, ref: Dict[str, Any]) -> Any:
+        """Load the value behind a reference."""
+        digest = ref[REF_KEY]
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                self._counters["cache_hits"] += 1
+                return self._cache[digest]
+        with open(self.path_for(digest), "rb") as f:
+            value = json.loads(zlib.decompress(f.read()))
+        with self._lock:
+            self._counters["loaded"] += 1
+            self._cache[digest] = value
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """Return `value` with a top-level reference replaced by its blob."""
+        return self.get(value) if is_blob_ref(value) else value
+
+    def spill(self, state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Replace large values of `state` by blob references.
+
+        Returns:
+            Tuple of (state with references, {key: original value} of the
+            spilled keys)
+        """
+        spilled: Dict[str, Any] = {}
+        result = dict(state)
+        for key, value in state.items():
+            if value is None or isinstance(value, (bool, int, float)) or is_blob_ref(value):
+                continue
+            encoded = encode_value(value)
+            if len(encoded) >= self.threshold:
+                result[key] = self._put_encoded(encoded)
+                spilled[key] = value
+        return result, spilled
+
+    def digests(self) -> Iterator[str]:
+        """All stored blob digests."""
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.listdir(self.root):
+            directory = os.path.join(self.root, prefix)
+            if os.path.isdir(directory):
+                for name in os.listdir(directory):
+                    if name.endswith(".json.z"):
+                        yield name[:-len(".json.z")]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["cached"] = len(self._cache)
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+
+class LazyBlobState(dict):
+    """
+    Session state dict that loads blob-referenced values on first read.
+
+    Reads through the mapping protocol (indexing, `get`, `items`, `values`,
+    `dict(state)`, `{**state}`, `copy`, `pop` and ADK's `State.to_dict()`)
+    return the stored values. Pydantic serialization of the owning session
+    bypasses them and emits the references.
+    """
+
+    def __init__(self, state: Dict[str, Any], store: BlobStore):
+        super().__init__(state)
+        self._store = store
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        if is_blob_ref(value):
+            value = self._store.get(value)
+            super().__setitem__(key, value)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def __iter__(self):
+        # Overriding __iter__ moves dict(state), {**state} and dict.update(state)
+        # off CPython's raw-storage fast path and onto keys() + __getitem__.
+        return super().__iter__()
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def pop(self, key: str, *default: Any) -> Any:
+        value = super().pop(key, *default)
+        return self._store.resolve(value)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        super().__setitem__(key, default)
+        return default
+
+    def __deepcopy__(self, memo):
+        import copy
+        return LazyBlobState(copy.deepcopy(dict(super().items()), memo), self._store)
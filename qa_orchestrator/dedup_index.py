@@ -0,0 +1,247 @@
+"""
+Idempotency index for Azure DevOps work item creation.
+
+Every create is keyed by a hash of (project, type, normalized title, key
+fields). Before sending a create, the caller *claims* the key in a SQLite
+table: the first claimant creates the item and records the result, while
+later callers (re-runs, retried phases, concurrent workers in other threads
+or processes sharing the file) get the recorded work item back without a
+network call. `claim()` waits for a claim another worker holds;
+`try_claim()` returns at once, so callers claiming many keys never hold some
+while waiting for others. Claims not renewed for `claim_timeout` seconds are
+treated as abandoned and taken over; owners call `renew()` during long
+creates. Only the owner of a claim can complete or release it, and failed
+creates release their claim so they can be retried.
+
+Set `AZURE_DEVOPS_DEDUP_INDEX_PATH` to keep the index across runs; without
+it the index lives in memory and only deduplicates within one process.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+from qa_orchestrator.fingerprint import content_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLAIM_TIMEOUT = 900.0
+POLL_INTERVAL = 0.05
+
+# Fields besides the title that distinguish two work items of a type.
+KEY_FIELDS = {
+    "User Story": ("System.Description", "Microsoft.VSTS.Common.AcceptanceCriteria"),
+    "Test Case": ("Microsoft.VSTS.TCM.Steps",),
+}
+
+# Connections inherited across fork, kept referenced so they are never closed.
+_inherited_connections: List[sqlite3.Connection] = []
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS created_items (
+    key TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    work_item_id INTEGER,
+    result TEXT,
+    owner TEXT NOT NULL,
+    claimed_at REAL NOT NULL
+);
+"""
+
+
+def _normalize_text(value: Any) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip().casefold()
+
+
+def dedup_key(project: str, work_item_type: str, patch: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    Compute the idempotency key of a create from its JSON-patch document.
+
+    Returns:
+        Tuple of (key, title)
+    """
+    fields = {
+        op["path"][len("/fields/"):]: op.get("value")
+        for op in patch
+        if op.get("path", "").startswith("/fields/")
+    }
+    title = fields.get("System.Title") or ""
+    key_values = [_normalize_text(fields.get(name)) for name in KEY_FIELDS.get(work_item_type, ())]
+    key = content_hash(_normalize_text(project), work_item_type.casefold(), _normalize_text(title), key_values)
+    return key, title
+
+
+class DedupIndex:
+    """SQLite index from create keys to the work items they produced."""
+
+    def __init__(self, path: Optional[str] = None, claim_timeout: float = DEFAULT_CLAIM_TIMEOUT):
+        """
+        Args:
+            path: SQLite file shared by all workers; None or ":memory:" keeps
+                the index in memory
+            claim_timeout: Seconds after which a pending claim is abandoned
+        """
+        if path and path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.path = path if path and path != ":memory:" else None
+        self.claim_timeout = claim_timeout
+        self._db = self._connect()
+        self._lock = threading.Lock()
+        self._owner = uuid.uuid4().hex
+        self._counters = {"claimed": 0, "deduplicated": 0, "waited": 0, "taken_over": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(
+            self.path or ":memory:", check_same_thread=False, isolation_level=None, timeout=30
+        )
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(_SCHEMA)
+        return db
+
+    def reset_after_fork(self) -> None:
+        """
+        Give a forked child its own connection, lock and owner id.
+
+        The inherited connection is neither used nor closed: closing it in the
+        child could release the parent's file locks. An in-memory index starts
+        empty in the child.
+        """
+        _inherited_connections.append(self._db)
+        self._lock = threading.Lock()
+        self._owner = uuid.uuid4().hex
+        self._db = self._connect()
+
+    @property
+    def persistent(self) -> bool:
+        """Whether entries outlive the process (the index is backed by a file)."""
+        return self.path is not None
+
+    def try_claim(
+        self, key: str, project: str, work_item_type: str, title: str
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Claim `key` for creation without waiting.
+
+        Returns:
+            Tuple of (claimed, existing): (True, None) if the caller now owns
+            the claim and must create the item (then call `complete` or
+            `release`), (False, item) if the item was already created, and
+            (False, None) if another worker holds a pending claim
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT result, claimed_at, owner FROM created_items WHERE key = ?", (key,)
+                ).fetchone()
+                now = time.time()
+                if row is None or (row[0] is None and now - row[1] > self.claim_timeout):
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO created_items "
+                        "(key, project, type, title, work_item_id, result, owner, claimed_at) "
+                        "VALUES (?, ?, ?, ?, NULL, NULL, ?, ?)",
+                        (key, project, work_item_type, title, self._owner, now),
+                    )
+                    self._db.execute("COMMIT")
+                    self._counters["claimed" if row is None else "taken_over"] += 1
+                    if row is not None:
+                        logger.warning(f"Taking over abandoned create claim for '{title}'")
+                    return True, None
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            if row[0] is not None:
+                self._counters["deduplicated"] += 1
+                logger.info(f"Skipping duplicate {work_item_type} '{title}'")
+                return False, json.loads(row[0])
+            return False, None
+
+    def claim(self, key: str, project: str, work_item_type: str, title: str) -> Optional[Dict[str, Any]]:
+        """
+        Claim `key` for creation, or return the work item already created for it.
+
+        Blocks while another worker holds a pending claim on the same key, so
+        never call it while holding other pending claims (see `try_claim`).
+
+        Returns:
+            The recorded work item, or None if the caller now owns the claim
+            and must create the item (then call `complete` or `release`)
+        """
+        waited = False
+        while True:
+            claimed, existing = self.try_claim(key, project, work_item_type, title)
+            if claimed or existing is not None:
+                return existing
+            if not waited:
+                with self._lock:
+                    self._counters["waited"] += 1
+                waited = True
+            time.sleep(POLL_INTERVAL)
+
+    def renew(self, keys: List[str]) -> None:
+        """Refresh this worker's pending claims on `keys` so they are not taken over."""
+        with self._lock:
+            self._db.executemany(
+                "UPDATE created_items SET claimed_at = ? WHERE key = ? AND owner = ? AND result IS NULL",
+                [(time.time(), key, self._owner) for key in keys],
+            )
+
+    def complete(self, key: str, result: Dict[str, Any]) -> bool:
+        """
+        Record the work item created for a key this worker claimed.
+
+        Returns:
+            False if the claim was taken over by another worker meanwhile; the
+            result is then not recorded
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE created_items SET work_item_id = ?, result = ? "
+                "WHERE key = ? AND owner = ? AND result IS NULL",
+                (result.get("id"), json.dumps(result), key, self._owner),
+            )
+        if cursor.rowcount == 0:
+            logger.warning(f"Create claim for work item {result.get('id')} was taken over; not recording it")
+            return False
+        return True
+
+    def release(self, key: str) -> None:
+        """Drop this worker's pending claim after a failed create so it can be retried."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM created_items WHERE key = ? AND owner = ? AND result IS NULL", (key, self._owner)
+            )
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the work item recorded for `key`, if any."""
+        with self._lock:
+            row = self._db.execute("SELECT result FROM created_items WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def forget(self, work_item_id: int) -> None:
+        """Remove the entry of a work item, e.g. after deleting it in Azure DevOps."""
+        with self._lock:
+            self._db.execute("DELETE FROM created_items WHERE work_item_id = ?", (work_item_id,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = self._db.execute(
+                "SELECT COUNT(*) FROM created_items WHERE result IS NOT NULL"
+            ).fetchone()[0]
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
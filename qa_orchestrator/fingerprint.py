@@ -0,0 +1,52 @@
+"""
+Content fingerprints for agent payloads and phase outputs.
+
+Values are serialized to canonical JSON (sorted keys, compact separators,
+surrounding whitespace stripped from strings) before hashing, so logically
+equal payloads produce the same fingerprint regardless of key order.
+"""
+
+from typing import Any
+import hashlib
+import json
+
+
+def normalize(value: Any) -> Any:
+    """Return a JSON-compatible, order-independent copy of `value`."""
+    if isinstance(value, dict):
+        return {str(k): normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((normalize(v) for v in value), key=canonical_json)
+    if isinstance(value, str):
+        return value.strip()
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return str(value)
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize `value` deterministically."""
+    return json.dumps(normalize(value), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def content_hash(*parts: Any) -> str:
+    """Return the hex SHA-256 of the canonical JSON of `parts`."""
+    return hashlib.sha256(canonical_json(list(parts)).encode("utf-8")).hexdigest()
+
+
+def instruction_text(agent) -> str:
+    """An agent's instruction, or the qualified name of its instruction provider."""
+    instruction = getattr(agent, "instruction", None)
+    if callable(instruction):
+        return f"{getattr(instruction, '__module__', '')}.{getattr(instruction, '__qualname__', repr(instruction))}"
+    return instruction or ""
+
+
+def agent_fingerprint(*agents: Any) -> str:
+    """Hash of the name, model and instruction of `agents`."""
+    return content_hash([
+        [getattr(agent, "name", type(agent).__name__), str(getattr(agent, "model", None)), instruction_text(agent)]
+        for agent in agents
+    ])
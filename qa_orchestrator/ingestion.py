@@ -0,0 +1,198 @@
+"""
+Chunked map-reduce ingestion of large requirement documents.
+
+Documents that do not fit comfortably in one prompt are split on section
+boundaries (markdown headings and numbered headings such as "3.2 Login"),
+packed into chunks of at most `max_chars`, analyzed by `Requirement_Analyst`
+with bounded concurrency, and merged back into the analyst's output schema:
+
+    {"summary": ..., "ambiguities": [...], "assumptions": [...], "dependencies": [...]}
+
+List entries are deduplicated across chunks, keeping first-seen order.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import re
+
+from qa_orchestrator.invoker import invoke_agent
+
+logger = logging.getLogger(__name__)
+
+# Documents longer than this (in characters) are analyzed in chunks.
+DEFAULT_CHUNK_CHARS = 24000
+DEFAULT_MAX_WORKERS = 4
+
+# Keys of the input payload that may carry the requirement text.
+TEXT_KEYS = ("requirements", "requirement_text", "text", "document", "prompt")
+
+LIST_FIELDS = ("ambiguities", "assumptions", "dependencies")
+
+_HEADING_RE = re.compile(
+    r"^(?:#{1,6}\s+\S|\d+(?:\.\d+)*[.)]?\s+[A-Z]|(?:section|chapter)\s+\d+)",
+    re.IGNORECASE,
+)
+
+
+def requirement_text(input_data: Any) -> Optional[str]:
+    """Return the requirement text carried by `input_data`, if any."""
+    if isinstance(input_data, str):
+        return input_data
+    if isinstance(input_data, dict):
+        for key in TEXT_KEYS:
+            if isinstance(input_data.get(key), str):
+                return input_data[key]
+    return None
+
+
+def _split_sections(text: str) -> List[str]:
+    sections: List[List[str]] = [[]]
+    for line in text.splitlines(keepends=True):
+        if _HEADING_RE.match(line.strip()) and any(l.strip() for l in sections[-1]):
+            sections.append([])
+        sections[-1].append(line)
+    return ["".join(s) for s in sections if "".join(s).strip()]
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """Split a section longer than `max_chars` on paragraphs, then hard-wrap."""
+    pieces, current = [], ""
+    for paragraph in re.split(r"(\n\s*\n)", section):
+        if len(current) + len(paragraph) <= max_chars:
+            current += paragraph
+            continue
+        if current.strip():
+            pieces.append(current)
+        while len(paragraph) > max_chars:
+            pieces.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        current = paragraph
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def split_sections(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    Split `text` into chunks of at most `max_chars`, on section boundaries.
+
+    Consecutive small sections are packed together; a section that is larger
+    than `max_chars` on its own is split on paragraph boundaries.
+    """
+    chunks, current = [], ""
+    for section in _split_sections(text):
+        parts = [section] if len(section) <= max_chars else _split_oversized(section, max_chars)
+        for part in parts:
+            if current and len(current) + len(part) > max_chars:
+                chunks.append(current)
+                current = ""
+            current += part
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def _normalize_entry(entry: Any) -> str:
+    text = entry if isinstance(entry, str) else json.dumps(entry, sort_keys=True)
+    return re.sub(r"\s+", " ", text).strip().rstrip(".?!;:").casefold()
+
+
+def _as_analysis(result: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except ValueError:
+            return {"summary": result.strip()}
+    return result if isinstance(result, dict) else None
+
+
+def merge_analyses(results: List[Any]) -> Dict[str, Any]:
+    """
+    Merge per-chunk analyst outputs into one, deduplicating list fields.
+
+    Failed chunks are listed in `chunk_errors`; if no chunk succeeded the
+    result is `{"error": ..., "chunk_errors": [...]}`.
+    """
+    merged: Dict[str, Any] = {"summary": "", **{field: [] for field in LIST_FIELDS}}
+    seen = {field: set() for field in LIST_FIELDS}
+    summaries, errors = [], []
+
+    for index, raw in enumerate(results):
+        analysis = _as_analysis(raw)
+        if analysis is None:
+            errors.append(f"chunk {index + 1}: unreadable analyst output")
+            continue
+        if analysis.get("error"):
+            errors.append(f"chunk {index + 1}: {analysis['error']}")
+            continue
+        summary = analysis.get("summary")
+        if isinstance(summary, str) and summary.strip():
+            summaries.append(summary.strip())
+        for field in LIST_FIELDS:
+            entries = analysis.get(field) or []
+            if not isinstance(entries, list):
+                entries = [entries]
+            for entry in entries:
+                key = _normalize_entry(entry)
+                if key and key not in seen[field]:
+                    seen[field].add(key)
+                    merged[field].append(entry)
+
+    if results and len(errors) == len(results):
+        return {"error": f"all {len(results)} requirement chunks failed", "chunk_errors": errors}
+    merged["summary"] = "\n".join(summaries)
+    merged["chunks"] = len(results)
+    if errors:
+        merged["chunk_errors"] = errors
+    return merged
+
+
+def analyze_requirements(
+    input_data: Any,
+    agent=None,
+    max_chars: int = DEFAULT_CHUNK_CHARS,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Any:
+    """
+    Run `Requirement_Analyst` over `input_data`, chunking large documents.
+
+    Inputs whose requirement text fits in `max_chars` are passed to the agent
+    unchanged, so small requests behave exactly as before.
+
+    Args:
+        input_data: Requirement text or payload dict carrying it
+        agent: Analyst agent (defaults to `requirement_analyst`)
+        max_chars: Chunk size and single-call threshold, in characters
+        max_workers: Concurrent chunk analyses
+
+    Returns:
+        The analyst output, merged across chunks for large documents
+    """
+    if agent is None:
+        from agents.registry import get_agent
+        agent = get_agent("requirement_analyst")
+
+    text = requirement_text(input_data)
+    if text is None or len(text) <= max_chars:
+        return invoke_agent(agent, input_data)
+
+    chunks = split_sections(text, max_chars)
+    context = {k: v for k, v in input_data.items() if k not in TEXT_KEYS} if isinstance(input_data, dict) else {}
+    logger.info(f"Analyzing {len(text)} characters of requirements in {len(chunks)} chunks")
+
+    def _analyze(indexed_chunk):
+        index, chunk = indexed_chunk
+        payload = dict(
+            context,
+            prompt=f"Analyze section {index + 1} of {len(chunks)} of a larger requirement document.",
+            requirements=chunk,
+            section_index=index + 1,
+            section_count=len(chunks),
+        )
+        return invoke_agent(agent, payload)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest") as pool:
+        results = list(pool.map(_analyze, enumerate(chunks)))
+    return merge_analyses(results)
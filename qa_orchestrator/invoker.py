@@ -0,0 +1,282 @@
+"""
+Shared agent invocation layer for AQEE delegation helpers.
+
+Agents expose different calling conventions depending on the ADK version
+and on whether they are test doubles: the preferred `call(prompt, context)`
+or one of `run`/`invoke`/`execute`/`respond`/`get_response` taking the
+payload. The convention is resolved once per agent class and cached, so the
+hot path is a dict lookup plus the call itself.
+
+Every invocation is recorded (latency, payload size, error class) in a
+process-wide `InvocationStats` instance available via
+`get_invocation_stats()`. When a response cache is configured (see
+`qa_orchestrator.response_cache`), successful responses are served from it.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import logging
+import threading
+import time
+
+from qa_orchestrator.response_cache import get_response_cache
+
+logger = logging.getLogger(__name__)
+
+# Methods probed in order of preference; `call` takes (prompt, payload), the
+# others take the payload only.
+CALL_METHODS = ("call", "run", "invoke", "execute", "respond", "get_response")
+
+# Workers used only for invocations with a timeout or cancellation event.
+# A timed-out call keeps its worker until the underlying agent returns.
+MAX_TIMEOUT_WORKERS = 32
+
+# How often a cancellable invocation checks its cancel event, in seconds.
+CANCEL_POLL_INTERVAL = 0.05
+
+_convention_cache: Dict[type, Optional[str]] = {}
+_convention_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class InvocationStats:
+    """Thread-safe recorder of per-invocation metrics."""
+
+    def __init__(self, max_records: int = 1000):
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=max_records)
+        self._totals: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        agent_name: str,
+        method: Optional[str],
+        latency: float,
+        payload_bytes: int,
+        error_class: Optional[str] = None,
+        cached: bool = False,
+    ) -> None:
+        """Record one invocation."""
+        entry = {
+            "agent": agent_name,
+            "method": method,
+            "latency": latency,
+            "payload_bytes": payload_bytes,
+            "error_class": error_class,
+            "cached": cached,
+            "timestamp": time.time(),
+        }
+        with self._lock:
+            self._records.append(entry)
+            totals = self._totals.setdefault(
+                agent_name,
+                {"calls": 0, "errors": 0, "cache_hits": 0, "total_latency": 0.0,
+                 "max_latency": 0.0, "payload_bytes": 0, "error_classes": {}},
+            )
+            totals["calls"] += 1
+            totals["cache_hits"] += int(cached)
+            totals["total_latency"] += latency
+            totals["max_latency"] = max(totals["max_latency"], latency)
+            totals["payload_bytes"] += payload_bytes
+            if error_class:
+                totals["errors"] += 1
+                classes = totals["error_classes"]
+                classes[error_class] = classes.get(error_class, 0) + 1
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the most recent invocation records, oldest first."""
+        with self._lock:
+            records = list(self._records)
+        return records[-limit:] if limit else records
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-agent aggregates including mean latency."""
+        with self._lock:
+            summary = {
+                name: dict(t, error_classes=dict(t["error_classes"]))
+                for name, t in self._totals.items()
+            }
+        for totals in summary.values():
+            totals["mean_latency"] = totals["total_latency"] / totals["calls"]
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._totals.clear()
+
+
+_invocation_stats = InvocationStats()
+
+
+def get_invocation_stats() -> InvocationStats:
+    """Get the global invocation stats recorder."""
+    return _invocation_stats
+
+
+def _resolve_method(agent) -> Optional[str]:
+    """Return the calling convention for `agent`, cached per class."""
+    cls = type(agent)
+    try:
+        return _convention_cache[cls]
+    except KeyError:
+        pass
+    method = next((m for m in CALL_METHODS if callable(getattr(agent, m, None))), None)
+    with _convention_lock:
+        _convention_cache[cls] = method
+    return method
+
+
+def clear_convention_cache() -> None:
+    """Forget resolved calling conventions (e.g. after monkeypatching a class)."""
+    with _convention_lock:
+        _convention_cache.clear()
+
+
+def _payload_size(payload: Any) -> int:
+    if isinstance(payload, (str, bytes)):
+        return len(payload)
+    try:
+        return len(json.dumps(payload, default=str))
+    except (TypeError, ValueError):
+        return len(str(payload))
+
+
+def _dispatch(agent, method: Optional[str], payload: Any) -> Tuple[Any, Optional[str]]:
+    """Call `agent` and convert exceptions into the legacy error dicts."""
+    if method is None:
+        return {
+            "agent": getattr(agent, "name", str(agent)),
+            "note": "no callable method available; returned placeholder",
+            "instruction": getattr(agent, "instruction", None),
+            "input_received": payload,
+        }, None
+
+    fn = getattr(agent, method)
+    try:
+        if method == "call":
+            prompt = payload.get("prompt") if isinstance(payload, dict) else str(payload)
+            return fn(prompt, payload), None
+        return fn(payload), None
+    except Exception as e:
+        label = "agent.call" if method == "call" else f"agent {method}"
+        return {"error": f"{label} failed: {e}"}, type(e).__name__
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_TIMEOUT_WORKERS, thread_name_prefix="agent-invoke"
+                )
+    return _executor
+
+
+def invoke_agent(
+    agent,
+    payload: Any,
+    timeout: Optional[float] = None,
+    cancel_event: Optional[threading.Event] = None,
+    cache=None,
+    use_cache: bool = True,
+) -> Any:
+    """
+    Invoke an agent using its cached calling convention.
+
+    Errors never propagate: failures, timeouts and cancellations are returned
+    as `{"error": ...}` dicts, matching what the delegation helpers expect.
+
+    Args:
+        agent: Agent instance (ADK agent or any object with a call method)
+        payload: Input passed as context; `payload["prompt"]` is the prompt
+        timeout: Seconds to wait for the agent before giving up
+        cancel_event: Event that, once set, abandons the invocation
+        cache: `ResponseCache` to use instead of the global one
+        use_cache: Set False to bypass the response cache for this call
+
+    Returns:
+        The agent's result, or an error/placeholder dict
+    """
+    name = getattr(agent, "name", type(agent).__name__)
+    method = _resolve_method(agent)
+    started = time.perf_counter()
+
+    if use_cache and cache is None:
+        cache = get_response_cache()
+    cache_key = None
+    if use_cache and cache is not None and method is not None:
+        cache_key, _, instruction_hash = cache.key_for(agent, payload)
+        hit, value = cache.get(cache_key)
+        if hit:
+            _invocation_stats.record(
+                name, method, time.perf_counter() - started, _payload_size(payload), cached=True
+            )
+            return value
+
+    if timeout is None and cancel_event is None:
+        result, error_class = _dispatch(agent, method, payload)
+    else:
+        future = _get_executor().submit(_dispatch, agent, method, payload)
+        deadline = None if timeout is None else started + timeout
+        result, error_class = None, None
+        while True:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            wait_for = CANCEL_POLL_INTERVAL if cancel_event is not None else remaining
+            if remaining is not None and wait_for is not None:
+                wait_for = min(wait_for, max(remaining, 0))
+            try:
+                result, error_class = future.result(timeout=wait_for)
+                break
+            except FutureTimeoutError:
+                pass
+            if cancel_event is not None and cancel_event.is_set():
+                future.cancel()
+                result, error_class = {"error": "cancelled"}, "CancelledError"
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                future.cancel()
+                result = {"error": f"timed out after {timeout:g}s"}
+                error_class = "TimeoutError"
+                break
+
+    latency = time.perf_counter() - started
+    _invocation_stats.record(name, method, latency, _payload_size(payload), error_class)
+    if cache_key is not None and not error_class and not (isinstance(result, dict) and result.get("error")):
+        cache.set(cache_key, result, name, instruction_hash)
+    if error_class:
+        logger.warning(f"Agent {name} invocation failed ({error_class}) after {latency:.3f}s")
+    return result
+
+
+def stream_agent(agent, payload: Any) -> Iterator[Any]:
+    """
+    Yield an agent's output incrementally.
+
+    Agents exposing `stream(payload)` (an iterable of text chunks) are
+    streamed chunk by chunk; any other agent is invoked normally and its
+    whole result is yielded once. A failure mid-stream yields an
+    `{"error": ...}` dict and ends the stream.
+    """
+    stream_fn = getattr(agent, "stream", None)
+    if not callable(stream_fn):
+        yield invoke_agent(agent, payload)
+        return
+
+    name = getattr(agent, "name", type(agent).__name__)
+    started = time.perf_counter()
+    error_class = None
+    try:
+        for chunk in stream_fn(payload):
+            yield chunk
+    except Exception as e:
+        error_class = type(e).__name__
+        yield {"error": f"agent stream failed: {e}"}
+    finally:
+        _invocation_stats.record(
+            name, "stream", time.perf_counter() - started, _payload_size(payload), error_class
+        )
@@ -0,0 +1,167 @@
+"""
+Read-through cache for Azure DevOps metadata lookups.
+
+Project info, work item type definitions and field lists change rarely, so
+`AzureDevOpsClient` serves them from this cache. Each entry keeps the
+response's ETag: once an entry's per-resource TTL has passed the client
+revalidates it with `If-None-Match`, and a 304 simply refreshes the entry
+without transferring the body again. An optional SQLite tier keeps entries
+across restarts.
+
+The disk tier is opt-in: pass `path` or set `AZURE_DEVOPS_METADATA_CACHE_PATH`.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds before an entry must be revalidated, per resource kind.
+DEFAULT_TTLS = {
+    "project": 3600,
+    "work_item_types": 24 * 3600,
+    "fields": 24 * 3600,
+}
+DEFAULT_TTL = 3600
+
+# Connections inherited across fork, kept referenced so they are never closed.
+_inherited_connections: List[sqlite3.Connection] = []
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    resource TEXT NOT NULL,
+    etag TEXT,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+
+class CacheEntry(NamedTuple):
+    resource: str
+    value: Any
+    etag: Optional[str]
+    stored_at: float
+
+
+class MetadataCache:
+    """Memory + optional SQLite cache of metadata responses with ETags."""
+
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            path: SQLite file for the disk tier; None or ":memory:" keeps the
+                cache in memory only
+            ttls: Per-resource TTL overrides, merged over `DEFAULT_TTLS`
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._memory: Dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0}
+        self.path = path if path and path != ":memory:" else None
+        self._db = None
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(_SCHEMA)
+        return db
+
+    def reset_after_fork(self) -> None:
+        """
+        Give a forked child its own lock and disk-tier connection.
+
+        The inherited connection is neither used nor closed: closing it in the
+        child could release the parent's file locks.
+        """
+        self._lock = threading.Lock()
+        if self._db is not None:
+            _inherited_connections.append(self._db)
+            self._db = self._connect()
+
+    def ttl_for(self, resource: str) -> float:
+        return self.ttls.get(resource, DEFAULT_TTL)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for `key`, fresh or stale, or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT resource, value, etag, stored_at FROM metadata WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = CacheEntry(row[0], json.loads(row[1]), row[2], row[3])
+                    self._memory[key] = entry
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at <= self.ttl_for(entry.resource)
+
+    def set(self, key: str, resource: str, value: Any, etag: Optional[str] = None) -> None:
+        """Store a response body and its ETag."""
+        entry = CacheEntry(resource, value, etag, time.time())
+        with self._lock:
+            self._memory[key] = entry
+            self._counters["stores"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO metadata (key, resource, etag, value, stored_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, resource, etag, json.dumps(value), entry.stored_at),
+                )
+                self._db.commit()
+
+    def touch(self, key: str) -> Optional[CacheEntry]:
+        """Restart the TTL of `key` after a 304 Not Modified."""
+        entry = self.get(key)
+        if entry is None:
+            return None
+        entry = entry._replace(stored_at=time.time())
+        with self._lock:
+            self._memory[key] = entry
+            if self._db is not None:
+                self._db.execute("UPDATE metadata SET stored_at = ? WHERE key = ?", (entry.stored_at, key))
+                self._db.commit()
+        return entry
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup outcome: "hits", "revalidated" or "misses"."""
+        with self._lock:
+            self._counters[outcome] += 1
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop entries whose key starts with `prefix` (all entries by default)."""
+        with self._lock:
+            for key in [k for k in self._memory if k.startswith(prefix)]:
+                del self._memory[key]
+            if self._db is not None:
+                self._db.execute("DELETE FROM metadata WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+                self._db.commit()
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/revalidation/miss counters and the number of entries."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._memory)
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
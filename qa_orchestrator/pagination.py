@@ -0,0 +1,35 @@
+"""
+Lazy, prefetching pagination.
+
+`iter_items(fetch_page, start)` walks a paged endpoint one item at a time.
+`fetch_page(cursor)` returns `(items, next_cursor)`, where the cursor is
+whatever the endpoint pages by: a continuation token, a `$skip` offset or
+the last id seen; a `None` next cursor ends the walk. While the caller
+consumes one page, the next one is already being fetched on a background
+thread, so at most two pages are held in memory at any time.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+Page = Tuple[List[Any], Optional[Any]]
+
+
+def iter_pages(fetch_page: Callable[[Any], Page], start: Any = None) -> Iterator[List[Any]]:
+    """Yield pages, fetching page n + 1 while page n is being processed."""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+    try:
+        future = executor.submit(fetch_page, start)
+        while future is not None:
+            items, cursor = future.result()
+            future = executor.submit(fetch_page, cursor) if cursor is not None else None
+            yield items
+    finally:
+        # Closing the generator early abandons any page still in flight.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_items(fetch_page: Callable[[Any], Page], start: Any = None) -> Iterator[Any]:
+    """Yield the items of every page, one at a time."""
+    for page in iter_pages(fetch_page, start):
+        yield from page
@@ -0,0 +1,220 @@
+"""
+Dependency-graph execution engine for the AQEE phase lifecycle.
+
+Each node declares the state keys it reads (`inputs`) and the state key it
+produces (`output_key`, matching the agents' ADK `output_key`s such as
+`phase1_data`, `phase3_data` or `execution_results`). The engine runs every
+node whose inputs are available in parallel on a bounded thread pool, so
+independent work (e.g. acceptance criteria validation and DevOps linking,
+which both only need `stories`) overlaps instead of running back to back.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrently running nodes; the single knob for tuning how
+# many agent round trips a graph run may have in flight at once.
+DEFAULT_MAX_WORKERS = 4
+
+
+class PhaseNode:
+    """A unit of work in a `PhaseGraph`."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Any],
+        inputs: Iterable[str] = (),
+        output_key: Optional[str] = None,
+        version: Any = None,
+    ):
+        """
+        Args:
+            name: Unique node name
+            func: Callable receiving a dict of the declared inputs
+            inputs: State keys that must be available before the node runs
+            output_key: State key the result is stored under (defaults to name)
+            version: Part of the node's fingerprint besides its inputs, e.g.
+                the `agent_fingerprint` of the agents it calls
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.output_key = output_key or name
+        self.version = version
+
+    def __repr__(self) -> str:
+        return f"<PhaseNode {self.name}: {list(self.inputs)} -> {self.output_key}>"
+
+
+class PhaseGraph:
+    """Declarative DAG of phase nodes keyed by their inputs and outputs."""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._nodes: Dict[str, PhaseNode] = {}
+
+    @property
+    def nodes(self) -> List[PhaseNode]:
+        return list(self._nodes.values())
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Any],
+        inputs: Iterable[str] = (),
+        output_key: Optional[str] = None,
+        version: Any = None,
+    ) -> PhaseNode:
+        """Register a node and return it."""
+        if name in self._nodes:
+            raise ValueError(f"Duplicate node name: {name}")
+        node = PhaseNode(name, func, inputs, output_key, version)
+        for other in self._nodes.values():
+            if other.output_key == node.output_key:
+                raise ValueError(
+                    f"Nodes {other.name} and {name} both produce '{node.output_key}'"
+                )
+        self._nodes[name] = node
+        return node
+
+    def validate(self, initial_keys: Iterable[str] = ()) -> List[str]:
+        """
+        Check that every node can eventually run.
+
+        Args:
+            initial_keys: State keys supplied by the caller at run time
+
+        Returns:
+            Node names in a valid execution order
+
+        Raises:
+            ValueError: If an input is never produced or the graph has a cycle
+        """
+        available = set(initial_keys)
+        produced = {n.output_key for n in self._nodes.values()}
+        for node in self._nodes.values():
+            missing = [k for k in node.inputs if k not in produced and k not in available]
+            if missing:
+                raise ValueError(f"Node {node.name} needs unknown inputs: {missing}")
+
+        order: List[str] = []
+        pending = dict(self._nodes)
+        while pending:
+            ready = [n for n in pending.values() if all(k in available for k in n.inputs)]
+            if not ready:
+                raise ValueError(f"Dependency cycle between nodes: {sorted(pending)}")
+            for node in ready:
+                order.append(node.name)
+                available.add(node.output_key)
+                del pending[node.name]
+        return order
+
+    def run(
+        self,
+        initial: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        store=None,
+        namespace: str = "default",
+    ) -> Dict[str, Any]:
+        """
+        Execute the graph, running ready nodes in parallel.
+
+        A node that raises is recorded in `errors`; nodes depending on its
+        output are not run and are listed in `skipped`. With a `PhaseStore`,
+        a node whose inputs hash the same as on a previous run in
+        `namespace` (and whose `version` is unchanged) reuses its stored
+        output instead of running again.
+
+        Args:
+            initial: Seed state (e.g. `{"requirements": ...}`)
+            max_workers: Override the graph's concurrency limit for this run
+            store: Optional `PhaseStore` for incremental re-execution
+            namespace: Store namespace, typically the session id
+
+        Returns:
+            Dict with `state` (seed plus all produced outputs), `errors`
+            (node name -> message), `skipped` (node names), `reused` (node
+            names served from the store) and `timings` (node name -> seconds)
+        """
+        state: Dict[str, Any] = dict(initial or {})
+        self.validate(state.keys())
+
+        errors: Dict[str, str] = {}
+        timings: Dict[str, float] = {}
+        reused: List[str] = []
+        input_hashes: Dict[str, str] = {}
+        pending = dict(self._nodes)
+        failed_keys = set()
+
+        def _run_node(node: PhaseNode, inputs: Dict[str, Any]):
+            started = time.perf_counter()
+            try:
+                return node.func(inputs)
+            finally:
+                timings[node.name] = time.perf_counter() - started
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.max_workers,
+            thread_name_prefix="phase-graph",
+        )
+        running = {}
+        try:
+            while pending or running:
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for node in list(pending.values()):
+                        if any(k in failed_keys for k in node.inputs):
+                            failed_keys.add(node.output_key)
+                            del pending[node.name]
+                            continue
+                        if not all(k in state for k in node.inputs):
+                            continue
+                        del pending[node.name]
+                        inputs = {k: state[k] for k in node.inputs}
+                        if store is not None:
+                            input_hash = store.fingerprint(node.name, inputs, node.version)
+                            found, output = store.lookup(namespace, node.name, input_hash)
+                            if found:
+                                state[node.output_key] = output
+                                reused.append(node.name)
+                                progressed = True
+                                continue
+                            input_hashes[node.name] = input_hash
+                        running[executor.submit(_run_node, node, inputs)] = node
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        state[node.output_key] = future.result()
+                    except Exception as e:
+                        logger.error(f"Phase node {node.name} failed: {e}")
+                        errors[node.name] = f"{type(e).__name__}: {e}"
+                        failed_keys.add(node.output_key)
+                        continue
+                    if store is not None:
+                        store.save(namespace, node.name, input_hashes[node.name], state[node.output_key])
+        finally:
+            executor.shutdown(wait=True)
+
+        skipped = [
+            n.name
+            for n in self._nodes.values()
+            if n.name not in errors and n.output_key not in state
+        ]
+        return {
+            "state": state,
+            "errors": errors,
+            "skipped": skipped,
+            "reused": reused,
+            "timings": timings,
+        }
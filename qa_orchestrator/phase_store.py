@@ -0,0 +1,197 @@
+"""
+Fingerprinted storage of phase outputs for incremental re-execution.
+
+Every stored output is keyed by the node that produced it and the content
+hash of the inputs it was computed from. When a session is re-run,
+`PhaseGraph.run(..., store=...)` reuses any output whose input fingerprint
+is unchanged and only executes nodes downstream of an actual change.
+`map_items` applies the same idea to per-item work such as per-story
+processing, so editing one story only recomputes that story.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from qa_orchestrator.fingerprint import content_hash
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS phase_outputs (
+    namespace TEXT NOT NULL,
+    node TEXT NOT NULL,
+    item_key TEXT NOT NULL DEFAULT '',
+    input_hash TEXT NOT NULL,
+    output TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, node, item_key)
+);
+"""
+
+
+# Keys through which the delegation helpers report failed sub-steps.
+ERROR_LIST_KEYS = ("validation_errors", "gaps_identified", "chunk_errors")
+
+
+def _has_error(value: Any) -> bool:
+    if isinstance(value, dict):
+        return bool(value.get("error")) or any(_has_error(v) for v in value.values())
+    if isinstance(value, list):
+        return any(_has_error(v) for v in value)
+    return False
+
+
+def is_reusable(output: Any) -> bool:
+    """
+    Outputs reporting a failure are never reused: a truthy `error` at any
+    depth, or a non-empty top-level `ERROR_LIST_KEYS` entry.
+    """
+    if isinstance(output, dict) and any(output.get(key) for key in ERROR_LIST_KEYS):
+        return False
+    return not _has_error(output)
+
+
+class PhaseStore:
+    """SQLite-backed (or in-memory) store of fingerprinted phase outputs."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file; None or ":memory:" keeps outputs in memory
+        """
+        if path and path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._counters = {"reused": 0, "computed": 0}
+
+    @staticmethod
+    def fingerprint(node: str, inputs: Any, version: Any = None) -> str:
+        """
+        Hash of a node's inputs; `version` (e.g. an `agent_fingerprint` of
+        the agents the node calls) invalidates outputs of an older prompt or
+        model.
+        """
+        if version is None:
+            return content_hash(node, inputs)
+        return content_hash(node, inputs, version)
+
+    def lookup(self, namespace: str, node: str, input_hash: str, item_key: str = "") -> Tuple[bool, Any]:
+        """
+        Return the stored output if it was computed from `input_hash`.
+
+        Returns:
+            Tuple of (found, output)
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT input_hash, output FROM phase_outputs "
+                "WHERE namespace = ? AND node = ? AND item_key = ?",
+                (namespace, node, item_key),
+            ).fetchone()
+            if row is None or row[0] != input_hash:
+                return False, None
+            output = json.loads(row[1])
+            # Entries saved before a failure was recognised as such.
+            if not is_reusable(output):
+                return False, None
+            self._counters["reused"] += 1
+            return True, output
+
+    def save(self, namespace: str, node: str, input_hash: str, output: Any, item_key: str = "") -> None:
+        """Store `output` for `node`; non-serializable or error outputs are skipped."""
+        if not is_reusable(output):
+            return
+        try:
+            encoded = json.dumps(output)
+        except (TypeError, ValueError):
+            logger.debug(f"Not storing non-serializable output of {node}")
+            return
+        with self._lock:
+            self._counters["computed"] += 1
+            self._db.execute(
+                "INSERT OR REPLACE INTO phase_outputs "
+                "(namespace, node, item_key, input_hash, output, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, node, item_key, input_hash, encoded, time.time()),
+            )
+            self._db.commit()
+
+    def map_items(
+        self,
+        namespace: str,
+        node: str,
+        items: Iterable[Any],
+        func: Callable[[Any], Any],
+        key: Optional[Callable[[Any], str]] = None,
+        max_workers: int = 4,
+        version: Any = None,
+    ) -> List[Any]:
+        """
+        Apply `func` to each item, recomputing only items whose content changed.
+
+        Args:
+            namespace: Session or run namespace
+            node: Name of the per-item step (e.g. "test_cases")
+            items: Items to process (e.g. stories)
+            func: Callable computing the output for one item
+            key: Stable identity of an item (defaults to `item["id"]`, then
+                `item["title"]`, then the position)
+            max_workers: Concurrency for recomputed items
+            version: Fingerprint of what `func` calls (see `fingerprint`)
+
+        Returns:
+            Outputs in the same order as `items`
+        """
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        todo = []
+        for index, item in enumerate(items):
+            item_key = str(key(item) if key else _default_item_key(item, index))
+            input_hash = self.fingerprint(node, item, version)
+            found, output = self.lookup(namespace, node, input_hash, item_key)
+            if found:
+                results[index] = output
+            else:
+                todo.append((index, item_key, input_hash, item))
+
+        if todo:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="phase-items") as pool:
+                outputs = pool.map(lambda t: func(t[3]), todo)
+                for (index, item_key, input_hash, _), output in zip(todo, outputs):
+                    results[index] = output
+                    self.save(namespace, node, input_hash, output, item_key)
+        return results
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._db.execute("DELETE FROM phase_outputs")
+            else:
+                self._db.execute("DELETE FROM phase_outputs WHERE namespace = ?", (namespace,))
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _default_item_key(item: Any, index: int) -> str:
+    if isinstance(item, dict):
+        for field in ("id", "story_id", "title"):
+            if item.get(field) not in (None, ""):
+                return str(item[field])
+    return str(index)
@@ -0,0 +1,252 @@
+"""
+Content-addressed cache for agent (LLM) responses.
+
+The cache key is a hash of the agent name, model, instruction text and the
+normalized payload, so editing an agent's `instruction` (or switching its
+model) automatically stops old entries from matching. A bounded in-memory
+LRU sits in front of an optional SQLite store that survives restarts.
+Entries expire after a TTL; the memory tier and the disk tier are each
+bounded by entry count, evicting least recently used entries first.
+
+The cache is opt-in: call `configure_response_cache()` or set
+`AQEE_RESPONSE_CACHE_PATH` (use ":memory:" for a memory-only cache).
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from qa_orchestrator.fingerprint import content_hash, instruction_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_MEMORY_ENTRIES = 512
+DEFAULT_MAX_DISK_ENTRIES = 20000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    instruction_hash TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_agent ON responses (agent, instruction_hash);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+"""
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of agent responses."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = DEFAULT_TTL,
+        max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES,
+    ):
+        """
+        Args:
+            path: SQLite file for the disk tier; None or ":memory:" keeps the
+                cache in memory only
+            ttl: Seconds an entry stays valid after it was stored
+            max_memory_entries: Size of the in-memory LRU
+            max_disk_entries: Maximum rows kept in the SQLite store
+        """
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        # Values are kept as JSON text so every hit decodes a fresh copy that
+        # callers may mutate without touching the cached entry.
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._instruction_hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0,
+                          "expired": 0, "evictions": 0, "invalidated": 0}
+        self._db = None
+        if path and path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    def key_for(self, agent, payload: Any) -> Tuple[str, str, str]:
+        """
+        Compute the cache key for calling `agent` with `payload`.
+
+        Returns:
+            Tuple of (key, agent name, instruction hash)
+        """
+        name = getattr(agent, "name", type(agent).__name__)
+        model = getattr(agent, "model", None)
+        instruction_hash = hashlib.sha256(instruction_text(agent).encode("utf-8")).hexdigest()
+        key = content_hash(name, str(model), instruction_hash, payload)
+        return key, name, instruction_hash
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up `key`.
+
+        Returns:
+            Tuple of (hit, value)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, encoded = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return True, json.loads(encoded)
+                del self._memory[key]
+                self._counters["expired"] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if now - row[1] <= self.ttl:
+                        self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        self._remember(key, row[1], row[0])
+                        self._counters["disk_hits"] += 1
+                        return True, json.loads(row[0])
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._counters["expired"] += 1
+
+            self._counters["misses"] += 1
+            return False, None
+
+    def set(self, key: str, value: Any, agent_name: str = "", instruction_hash: str = "") -> None:
+        """Store `value` under `key`; values that are not JSON-serializable are skipped."""
+        try:
+            encoded = json.dumps(value)
+        except (TypeError, ValueError):
+            logger.debug(f"Not caching non-serializable response from {agent_name}")
+            return
+
+        now = time.time()
+        with self._lock:
+            if agent_name and self._instruction_hashes.get(agent_name) != instruction_hash:
+                self._drop_stale_instructions(agent_name, instruction_hash)
+                self._instruction_hashes[agent_name] = instruction_hash
+
+            self._remember(key, now, encoded)
+            self._counters["stores"] += 1
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, agent, instruction_hash, value, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, agent_name, instruction_hash, encoded, now, now),
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    def _remember(self, key: str, created_at: float, encoded: str) -> None:
+        self._memory[key] = (created_at, encoded)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _evict_disk(self, now: float) -> None:
+        cursor = self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        self._counters["expired"] += max(cursor.rowcount, 0)
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            self._counters["evictions"] += overflow
+
+    def _drop_stale_instructions(self, agent_name: str, instruction_hash: str) -> None:
+        """Delete disk entries written by an older instruction of `agent_name`."""
+        if self._db is None:
+            return
+        cursor = self._db.execute(
+            "DELETE FROM responses WHERE agent = ? AND instruction_hash != ?",
+            (agent_name, instruction_hash),
+        )
+        if cursor.rowcount > 0:
+            self._counters["invalidated"] += cursor.rowcount
+            logger.info(f"Invalidated {cursor.rowcount} cached responses for {agent_name} (instruction changed)")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._instruction_hashes.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current sizes."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = (
+                self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                if self._db is not None else 0
+            )
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_loaded = False
+
+
+def configure_response_cache(path: Optional[str] = None, **kwargs) -> ResponseCache:
+    """Enable the global response cache and return it."""
+    global _response_cache, _response_cache_loaded
+    if _response_cache is not None:
+        _response_cache.close()
+    _response_cache = ResponseCache(path, **kwargs)
+    _response_cache_loaded = True
+    return _response_cache
+
+
+def disable_response_cache() -> None:
+    """Turn the global response cache off."""
+    global _response_cache, _response_cache_loaded
+    if _response_cache is not None:
+        _response_cache.close()
+    _response_cache = None
+    _response_cache_loaded = True
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the global response cache, or None when caching is disabled."""
+    global _response_cache, _response_cache_loaded
+    if not _response_cache_loaded:
+        path = os.getenv("AQEE_RESPONSE_CACHE_PATH")
+        if path:
+            configure_response_cache(path)
+        _response_cache_loaded = True
+    return _response_cache
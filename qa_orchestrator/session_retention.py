@@ -0,0 +1,338 @@
+"""
+Retention, archival and space reclamation for the ADK session database.
+
+`apply_retention()` expires sessions by age and by count per (app, user):
+
+- a session expires when it was last updated more than `max_age_days` ago,
+  or when it is not among the `max_sessions` most recently updated sessions
+  of its app and user;
+- the most specific `RetentionRule` applies (exact app and user, then app
+  with user "*", then "*"/"*");
+- expired sessions are optionally archived, with their events and blob
+  values inlined, to gzip-compressed JSONL, then deleted; with foreign keys
+  on, the delete cascades to their events;
+- work is done in batches of `batch_size` sessions, each in its own short
+  transaction followed by `PRAGMA incremental_vacuum(vacuum_pages)`, so live
+  writers only ever wait for one small batch; a session updated after it was
+  selected is kept.
+
+Incremental vacuum needs `auto_vacuum=INCREMENTAL`. New databases created by
+`TunedSqliteSessionService` have it; convert an existing file once (offline,
+it runs a full VACUUM) with `enable_incremental_vacuum()` or
+``python -m qa_orchestrator.session_retention --enable-incremental-vacuum``.
+Without it, freed pages are still reused but the file does not shrink.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+
+from qa_orchestrator.blob_store import REF_KEY, BlobStore, is_blob_ref
+from qa_orchestrator.session_store import TunedSqliteSessionService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_VACUUM_PAGES = 256
+DEFAULT_ARCHIVE_DIR = os.path.join("data", ".adk", "archive")
+# Blobs younger than this are never collected, so in-flight writes are safe.
+BLOB_GRACE_SECONDS = 3600
+
+_BLOB_DIGEST_RE = re.compile(r'"\$blob":\s*"([0-9a-f]{64})"')
+
+
+@dataclass
+class RetentionRule:
+    """Retention limits for sessions of one app and user ("*" matches any)."""
+
+    app_name: str = "*"
+    user_id: str = "*"
+    max_age_days: Optional[float] = None
+    max_sessions: Optional[int] = None
+    archive: bool = True
+
+    def specificity(self) -> int:
+        return (self.app_name != "*") * 2 + (self.user_id != "*")
+
+    def matches(self, app_name: str, user_id: str) -> bool:
+        return self.app_name in ("*", app_name) and self.user_id in ("*", user_id)
+
+
+@dataclass
+class RetentionReport:
+    expired: int = 0
+    archived: int = 0
+    deleted: int = 0
+    batches: int = 0
+    skipped: int = 0
+    vacuumed_pages: int = 0
+    archive_path: Optional[str] = None
+    blobs_removed: int = 0
+
+
+def rule_for(rules: Sequence[RetentionRule], app_name: str, user_id: str) -> Optional[RetentionRule]:
+    """Most specific rule matching (app_name, user_id), or None."""
+    matching = [r for r in rules if r.matches(app_name, user_id)]
+    return max(matching, key=RetentionRule.specificity) if matching else None
+
+
+def _expired_sessions(rows, rules: Sequence[RetentionRule], now: float) -> List[Tuple[str, str, str, float, bool]]:
+    """(app, user, id, update_time, archive) of expired sessions; rows are ranked newest first."""
+    expired = []
+    for row in rows:
+        rule = rule_for(rules, row["app_name"], row["user_id"])
+        if rule is None:
+            continue
+        too_old = rule.max_age_days is not None and row["update_time"] < now - rule.max_age_days * 86400
+        too_many = rule.max_sessions is not None and row["rank"] > rule.max_sessions
+        if too_old or too_many:
+            expired.append((row["app_name"], row["user_id"], row["id"], row["update_time"], rule.archive))
+    return expired
+
+
+def _inline_blobs(value: Dict[str, Any], blob_store: Optional[BlobStore]) -> Dict[str, Any]:
+    if blob_store is None:
+        return value
+    return {k: blob_store.resolve(v) if is_blob_ref(v) else v for k, v in value.items()}
+
+
+async def _archive_record(db, key: Tuple[str, str, str], blob_store: Optional[BlobStore]) -> Optional[Dict[str, Any]]:
+    rows = await db.execute_fetchall(
+        "SELECT state, create_time, update_time FROM sessions WHERE app_name=? AND user_id=? AND id=?", key
+    )
+    if not rows:
+        return None
+    events = []
+    for row in await db.execute_fetchall(
+        "SELECT event_data FROM events WHERE app_name=? AND user_id=? AND session_id=? ORDER BY timestamp, rowid",
+        key,
+    ):
+        event = json.loads(row["event_data"])
+        delta = (event.get("actions") or {}).get("state_delta") or (event.get("actions") or {}).get("stateDelta")
+        if isinstance(delta, dict):
+            actions = event["actions"]
+            actions["state_delta" if "state_delta" in actions else "stateDelta"] = _inline_blobs(delta, blob_store)
+        events.append(event)
+    return {
+        "app_name": key[0],
+        "user_id": key[1],
+        "id": key[2],
+        "state": _inline_blobs(json.loads(rows[0]["state"]), blob_store),
+        "create_time": rows[0]["create_time"],
+        "update_time": rows[0]["update_time"],
+        "events": events,
+    }
+
+
+async def apply_retention(
+    service: TunedSqliteSessionService,
+    rules: Sequence[RetentionRule],
+    archive_dir: str = DEFAULT_ARCHIVE_DIR,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    vacuum_pages: int = DEFAULT_VACUUM_PAGES,
+    pause: float = 0.0,
+    now: Optional[float] = None,
+) -> RetentionReport:
+    """
+    Archive and delete expired sessions in small batches.
+
+    Args:
+        service: Session service owning the database
+        rules: Retention rules; sessions matching no rule are kept
+        archive_dir: Directory for `sessions-<time>.jsonl.gz` archives
+        batch_size: Sessions deleted per transaction
+        vacuum_pages: Pages released by `incremental_vacuum` after each batch
+        pause: Seconds to sleep between batches, to leave room for writers
+        now: Reference time (defaults to the current time)
+
+    Returns:
+        A `RetentionReport`
+    """
+    now = time.time() if now is None else now
+    report = RetentionReport()
+
+    async with service._get_db_connection() as db:
+        rows = await db.execute_fetchall(
+            "SELECT app_name, user_id, id, update_time, ROW_NUMBER() OVER ("
+            "PARTITION BY app_name, user_id ORDER BY update_time DESC, id) AS rank FROM sessions"
+        )
+        incremental = (await db.execute_fetchall("PRAGMA auto_vacuum"))[0][0] == 2
+    expired = _expired_sessions(rows, rules, now)
+    report.expired = len(expired)
+    if not expired:
+        return report
+    if not incremental:
+        logger.info("auto_vacuum is not INCREMENTAL; freed pages will be reused but the file will not shrink")
+
+    archive = None
+    if any(a for *_, a in expired):
+        os.makedirs(archive_dir, exist_ok=True)
+        report.archive_path = os.path.join(archive_dir, f"sessions-{time.strftime('%Y%m%d-%H%M%S')}.jsonl.gz")
+        archive = gzip.open(report.archive_path, "at", encoding="utf-8")
+
+    try:
+        for start in range(0, len(expired), batch_size):
+            batch = expired[start:start + batch_size]
+            async with service._get_db_connection() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                try:
+                    for app_name, user_id, session_id, update_time, keep_archive in batch:
+                        key = (app_name, user_id, session_id)
+                        current = await db.execute_fetchall(
+                            "SELECT update_time FROM sessions WHERE app_name=? AND user_id=? AND id=?", key
+                        )
+                        if not current or current[0][0] != update_time:
+                            # Deleted or resumed since it was selected.
+                            report.skipped += 1
+                            continue
+                        if keep_archive:
+                            record = await _archive_record(db, key, service.blob_store)
+                            if record is not None:
+                                archive.write(json.dumps(record, ensure_ascii=False) + "\n")
+                                report.archived += 1
+                        # Cascades to the session's events (foreign_keys is ON).
+                        cursor = await db.execute(
+                            "DELETE FROM sessions WHERE app_name=? AND user_id=? AND id=?", key
+                        )
+                        report.deleted += cursor.rowcount
+                    if archive is not None:
+                        # Archive before committing the delete, so nothing is lost.
+                        archive.flush()
+                    await db.commit()
+                except BaseException:
+                    await db.rollback()
+                    raise
+                if incremental:
+                    before = (await db.execute_fetchall("PRAGMA freelist_count"))[0][0]
+                    # The pragma frees one page per step and execute() steps
+                    # once; executescript() runs it to completion.
+                    await db.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+                    after = (await db.execute_fetchall("PRAGMA freelist_count"))[0][0]
+                    report.vacuumed_pages += max(before - after, 0)
+            report.batches += 1
+            await asyncio.sleep(pause)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    logger.info(
+        f"Retention: deleted {report.deleted} sessions ({report.archived} archived) "
+        f"in {report.batches} batches, released {report.vacuumed_pages} pages"
+    )
+    return report
+
+
+async def collect_blobs(service: TunedSqliteSessionService, grace_seconds: float = BLOB_GRACE_SECONDS) -> int:
+    """
+    Delete blobs no session, event or app/user state references any more.
+
+    Returns:
+        Number of blob files removed
+    """
+    store = service.blob_store
+    if store is None:
+        return 0
+    referenced = set()
+    async with service._get_db_connection() as db:
+        for table, column in (("sessions", "state"), ("app_states", "state"),
+                              ("user_states", "state"), ("events", "event_data")):
+            async with db.execute(f"SELECT {column} FROM {table} WHERE instr({column}, ?) > 0", (REF_KEY,)) as cursor:
+                async for row in cursor:
+                    referenced.update(_BLOB_DIGEST_RE.findall(row[0]))
+
+    removed = 0
+    cutoff = time.time() - grace_seconds
+    for digest in list(store.digests()):
+        if digest in referenced:
+            continue
+        path = store.path_for(digest)
+        # Move the blob aside before the final age check: `BlobStore.put()`
+        # touches a blob it reuses and rewrites one that has gone, so a value
+        # re-stored after the scan above is either kept here or recreated.
+        doomed = path + ".gc"
+        try:
+            os.replace(path, doomed)
+        except FileNotFoundError:
+            continue
+        if os.path.getmtime(doomed) >= cutoff:
+            os.replace(doomed, path)
+            continue
+        os.remove(doomed)
+        removed += 1
+    return removed
+
+
+def enable_incremental_vacuum(db_path: str) -> None:
+    """
+    Switch an existing database to `auto_vacuum=INCREMENTAL`.
+
+    Runs a full VACUUM, which locks the database for its duration; do this
+    once, with the application stopped.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+def load_rules(path: str) -> List[RetentionRule]:
+    """Read rules from a JSON list of `RetentionRule` fields."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [RetentionRule(**entry) for entry in json.load(f)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m qa_orchestrator.session_retention")
+    parser.add_argument("--db", default=None, help="session database (default: data/.adk/session.db)")
+    parser.add_argument("--rules", help="JSON file with per app/user rules")
+    parser.add_argument("--max-age-days", type=float, help="default rule: maximum session age")
+    parser.add_argument("--max-sessions", type=int, help="default rule: sessions kept per app and user")
+    parser.add_argument("--no-archive", action="store_true", help="delete without archiving")
+    parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--vacuum-pages", type=int, default=DEFAULT_VACUUM_PAGES)
+    parser.add_argument("--collect-blobs", action="store_true", help="also delete unreferenced blobs")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="convert the database once (runs a full VACUUM) and exit")
+    args = parser.parse_args(argv)
+
+    service = TunedSqliteSessionService(args.db)
+    if args.enable_incremental_vacuum:
+        enable_incremental_vacuum(service._db_path)
+        print(f"Enabled incremental vacuum for {service._db_path}")
+        return 0
+
+    rules = load_rules(args.rules) if args.rules else []
+    if args.max_age_days is not None or args.max_sessions is not None:
+        rules.append(RetentionRule(max_age_days=args.max_age_days, max_sessions=args.max_sessions,
+                                   archive=not args.no_archive))
+    if not rules:
+        parser.error("give --rules, --max-age-days or --max-sessions")
+
+    async def run() -> RetentionReport:
+        try:
+            report = await apply_retention(
+                service, rules, args.archive_dir, args.batch_size, args.vacuum_pages
+            )
+            if args.collect_blobs:
+                report.blobs_removed = await collect_blobs(service)
+            return report
+        finally:
+            await service.close()
+
+    print(json.dumps(asyncio.run(run()).__dict__))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,505 @@
+"""
+Tuned ADK session service for `data/.adk/session.db`.
+
+`TunedSqliteSessionService` keeps the schema of ADK's `SqliteSessionService`
+(`sessions`, `events`, `app_states`, `user_states`), so the same database
+file keeps working with `adk web`, and adds:
+
+- WAL journaling with `synchronous=NORMAL`, so readers never block the
+  writer and commits do not fsync the whole database;
+- an index on `events (app_name, user_id, session_id, timestamp)`, so loading
+  a session's history in time order is an index range scan;
+- a pool of long-lived connections instead of one connection per call, each
+  keeping its prepared-statement cache;
+- `append_events()`, which writes a batch of events in one transaction;
+- `list_events()` / `iter_events()`, keyset-paginated history reads;
+- `compact_session()` / `compact_sessions()`, which fold old events into a
+  single snapshot event once a session exceeds `CompactionPolicy` limits;
+- spilling of large state values (phase outputs) to a `BlobStore` next to
+  the database: events and state rows hold `{"$blob": ...}` references, the
+  running session keeps the real values, and loaded sessions get a
+  `LazyBlobState` that reads each blob on first access. Event state deltas
+  keep their references; use `service.blob_store.resolve()` to read them.
+
+A snapshot is an ADK compaction event (`actions.compaction`) whose content
+summarizes the folded events, timestamped at the last folded event. ADK
+already substitutes a compaction's summary for the events it covers, and the
+session state itself lives in `sessions.state`, so dropping the folded rows
+loses nothing a resumed session needs while keeping its load time flat.
+Run the job with ``python -m qa_orchestrator.session_store compact``.
+
+SQLite still admits one writer at a time; WAL, short transactions and a
+busy timeout keep concurrent sessions from stalling or failing on it.
+
+Usage with a runner::
+
+    from google.adk.runners import Runner
+    runner = Runner(agent=root_agent, app_name="qa_orchestrator",
+                    session_service=TunedSqliteSessionService())
+"""
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+import aiosqlite
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions, EventCompaction
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+from google.adk.sessions.sqlite_session_service import (
+    CREATE_SCHEMA_SQL,
+    PRAGMA_FOREIGN_KEYS,
+    SqliteSessionService,
+)
+from google.genai import types
+
+from qa_orchestrator.blob_store import BlobStore, LazyBlobState
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_DB = os.path.join("data", ".adk", "session.db")
+DEFAULT_POOL_SIZE = 4
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+DEFAULT_PAGE_SIZE = 100
+
+# Characters kept in a snapshot summary.
+SUMMARY_MAX_CHARS = 8000
+COMPACTION_AUTHOR = "session_compactor"
+
+INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_events_session_time
+    ON events (app_name, user_id, session_id, timestamp);
+"""
+
+# (service, connection) while `append_events` runs, so the inherited
+# `append_event` reuses the batch's connection and transaction.
+_batch_connection: ContextVar[Optional[Tuple[Any, Any]]] = ContextVar("_batch_connection", default=None)
+
+
+class _DeferredCommit:
+    """Connection proxy whose `commit()` waits for the end of the batch."""
+
+    def __init__(self, conn: aiosqlite.Connection):
+        self._conn = conn
+
+    async def commit(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
+@dataclass
+class CompactionPolicy:
+    """When to compact a session and how much history to keep."""
+
+    max_events: int = 500              # compact once a session has more events ...
+    max_bytes: int = 2 * 1024 * 1024   # ... or more bytes of event_data
+    keep_last: int = 50                # events left after the snapshot
+
+
+def _event_text(event: Event) -> str:
+    if event.actions and event.actions.compaction:
+        content = event.actions.compaction.compacted_content
+    else:
+        content = event.content
+    parts = getattr(content, "parts", None) or []
+    return " ".join(p.text for p in parts if getattr(p, "text", None)).strip()
+
+
+def summarize_events(events: Iterable[Event]) -> types.Content:
+    """
+    Default snapshot summary: earlier snapshots, state changes and the last
+    message of each author, truncated to `SUMMARY_MAX_CHARS`.
+    """
+    earlier: List[str] = []
+    state: Dict[str, Any] = {}
+    last_message: Dict[str, str] = {}
+    count = 0
+    for event in events:
+        count += 1
+        text = _event_text(event)
+        if event.actions and event.actions.compaction:
+            earlier.append(text)
+            continue
+        if event.actions and event.actions.state_delta:
+            state.update(event.actions.state_delta)
+        if text:
+            last_message[event.author] = text
+    lines = list(earlier)
+    lines.append(f"[{count} earlier events compacted]")
+    if state:
+        lines.append("State changes: " + json.dumps(state, default=str, sort_keys=True))
+    lines.extend(f"{author}: {text}" for author, text in last_message.items())
+    summary = "\n".join(lines)
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = summary[:SUMMARY_MAX_CHARS - 3] + "..."
+    return types.Content(role="model", parts=[types.Part(text=summary)])
+
+
+def _encode_cursor(timestamp: float, rowid: int) -> str:
+    return f"{timestamp!r}:{rowid}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, int]:
+    timestamp, rowid = cursor.rsplit(":", 1)
+    return float(timestamp), int(rowid)
+
+
+class TunedSqliteSessionService(SqliteSessionService):
+    """`SqliteSessionService` with WAL, an event index, pooling and batching."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        blob_store: Optional[BlobStore] = None,
+        spill_large_values: bool = True,
+    ):
+        """
+        Args:
+            db_path: Database file (default: AQEE_SESSION_DB or data/.adk/session.db)
+            pool_size: Connections kept open for concurrent sessions
+            busy_timeout_ms: How long a writer waits for the write lock
+            blob_store: Store for large state values (default: a `blobs`
+                directory next to the database)
+            spill_large_values: Set False to keep all state inline
+        """
+        db_path = db_path or os.getenv("AQEE_SESSION_DB", DEFAULT_SESSION_DB)
+        directory = os.path.dirname(db_path)
+        if directory and not db_path.startswith("sqlite"):
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(db_path)
+        self.pool_size = pool_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self._tuned = False
+        self._idle: List[aiosqlite.Connection] = []
+        self._pool_loop = None
+        self._pool_semaphore: Optional[asyncio.Semaphore] = None
+        self.blob_store = None
+        if spill_large_values and self._db_path not in ("", ":memory:"):
+            self.blob_store = blob_store or BlobStore(os.path.join(os.path.dirname(self._db_path), "blobs"))
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        conn = aiosqlite.connect(
+            self._db_connect_path, uri=self._db_connect_uri, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        # Like ADK's in-memory connection: never keep the process alive.
+        setattr(getattr(conn, "_thread", conn), "daemon", True)
+        await conn
+        conn.row_factory = aiosqlite.Row
+        await conn.execute(PRAGMA_FOREIGN_KEYS)
+        await conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        await conn.execute("PRAGMA synchronous = NORMAL")
+        if not self._tuned:
+            async with self._schema_lock:
+                if not self._tuned:
+                    # Takes effect only for a new database; existing files keep
+                    # their mode (see session_retention.enable_incremental_vacuum).
+                    await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    await conn.execute("PRAGMA journal_mode = WAL")
+                    await conn.executescript(CREATE_SCHEMA_SQL + INDEX_SQL)
+                    await conn.commit()
+                    self._schema_ready = self._tuned = True
+        return conn
+
+    @asynccontextmanager
+    async def _get_db_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Lend a pooled connection (or the current batch's connection)."""
+        batch = _batch_connection.get()
+        if batch is not None and batch[0] is self:
+            yield batch[1]
+            return
+
+        if self._db_path in ("", ":memory:"):
+            async with super()._get_db_connection() as db:
+                yield db
+            return
+
+        loop = asyncio.get_running_loop()
+        if self._pool_loop is not loop:
+            # Connections and the semaphore belong to the loop that made them.
+            self._idle = []
+            self._pool_semaphore = asyncio.Semaphore(self.pool_size)
+            self._pool_loop = loop
+
+        async with self._pool_semaphore:
+            conn = self._idle.pop() if self._idle else await self._open_connection()
+            healthy = True
+            try:
+                yield conn
+            finally:
+                try:
+                    if conn.in_transaction:
+                        await conn.rollback()
+                except Exception:
+                    healthy = False
+                    await conn.close()
+                if healthy:
+                    self._idle.append(conn)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        """Append an event, persisting large state values as blob references."""
+        if self.blob_store is None or event.partial or not event.actions.state_delta:
+            return await super().append_event(session, event)
+
+        persistent = {k: v for k, v in event.actions.state_delta.items() if not k.startswith(State.TEMP_PREFIX)}
+        delta, spilled = self.blob_store.spill(persistent)
+        if not spilled:
+            return await super().append_event(session, event)
+
+        temp = {k: v for k, v in event.actions.state_delta.items() if k.startswith(State.TEMP_PREFIX)}
+        stored = event.model_copy(update={
+            "actions": event.actions.model_copy(update={"state_delta": {**delta, **temp}}),
+        })
+        await super().append_event(session, stored)
+        # The running session keeps the real values and the original event.
+        event = self._trim_temp_delta_state(event)
+        session.events[-1] = event
+        session.state.update(spilled)
+        return event
+
+    async def get_session(
+        self, *, app_name: str, user_id: str, session_id: str, config: Optional[GetSessionConfig] = None
+    ) -> Optional[Session]:
+        """Load a session; blob-referenced state values are read on first access."""
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None and self.blob_store is not None:
+            session.state = LazyBlobState(session.state, self.blob_store)
+        return session
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        response = await super().list_sessions(app_name=app_name, user_id=user_id)
+        if self.blob_store is not None:
+            for session in response.sessions:
+                session.state = LazyBlobState(session.state, self.blob_store)
+        return response
+
+    async def append_events(self, session: Session, events: List[Event]) -> List[Event]:
+        """
+        Append several events to `session` in a single transaction.
+
+        Equivalent to calling `append_event` for each event, but with one
+        commit. If any event fails, nothing is written; the in-memory
+        `session` may then hold some of the events and should be reloaded.
+        """
+        async with self._get_db_connection() as db:
+            token = _batch_connection.set((self, _DeferredCommit(db)))
+            try:
+                appended = [await self.append_event(session, event) for event in events]
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+            finally:
+                _batch_connection.reset(token)
+        return appended
+
+    async def list_events(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        after: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[List[Event], Optional[str]]:
+        """
+        Read one page of a session's history in chronological order.
+
+        Args:
+            app_name: ADK app name
+            user_id: User id
+            session_id: Session id
+            after: Cursor returned by the previous page (None for the first)
+            limit: Events per page
+
+        Returns:
+            Tuple of (events, cursor of the next page or None at the end)
+        """
+        sql = (
+            "SELECT rowid, timestamp, event_data FROM events "
+            "WHERE app_name=? AND user_id=? AND session_id=?"
+        )
+        params: List[Any] = [app_name, user_id, session_id]
+        if after:
+            timestamp, rowid = _decode_cursor(after)
+            sql += " AND (timestamp > ? OR (timestamp = ? AND rowid > ?))"
+            params.extend([timestamp, timestamp, rowid])
+        sql += " ORDER BY timestamp, rowid LIMIT ?"
+        params.append(limit)
+
+        async with self._get_db_connection() as db:
+            rows = await db.execute_fetchall(sql, params)
+        events = [Event.model_validate_json(row["event_data"]) for row in rows]
+        cursor = _encode_cursor(rows[-1]["timestamp"], rows[-1]["rowid"]) if len(rows) == limit else None
+        return events, cursor
+
+    async def iter_events(
+        self, *, app_name: str, user_id: str, session_id: str, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> AsyncIterator[Event]:
+        """Iterate a session's whole history, one page in memory at a time."""
+        cursor = None
+        while True:
+            events, cursor = await self.list_events(
+                app_name=app_name, user_id=user_id, session_id=session_id, after=cursor, limit=page_size
+            )
+            for event in events:
+                yield event
+            if cursor is None:
+                return
+
+    async def compact_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        policy: Optional[CompactionPolicy] = None,
+        summarize: Callable[[Iterable[Event]], types.Content] = summarize_events,
+        force: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fold all but the last `keep_last` events of a session into a snapshot.
+
+        Args:
+            app_name: ADK app name
+            user_id: User id
+            session_id: Session id
+            policy: Thresholds (default `CompactionPolicy()`)
+            summarize: Builds the snapshot content from the folded events
+            force: Compact even if the session is under the thresholds
+
+        Returns:
+            Dict with `folded` (events removed) and `bytes` (event_data bytes
+            removed), or None if nothing was compacted
+        """
+        policy = policy or CompactionPolicy()
+        key = (app_name, user_id, session_id)
+        where = "app_name=? AND user_id=? AND session_id=?"
+
+        async with self._get_db_connection() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                count, size = (await db.execute_fetchall(
+                    f"SELECT COUNT(*), COALESCE(SUM(length(event_data)), 0) FROM events WHERE {where}", key
+                ))[0]
+                if count <= policy.keep_last or not (
+                    force or count > policy.max_events or size > policy.max_bytes
+                ):
+                    await db.rollback()
+                    return None
+
+                # Fold everything up to the cutoff timestamp, so the snapshot
+                # (stamped at the cutoff) sorts before every remaining event.
+                cutoff_rows = await db.execute_fetchall(
+                    f"SELECT timestamp FROM events WHERE {where} "
+                    "ORDER BY timestamp DESC, rowid DESC LIMIT 1 OFFSET ?",
+                    (*key, policy.keep_last),
+                )
+                cutoff = cutoff_rows[0]["timestamp"]
+                rows = await db.execute_fetchall(
+                    f"SELECT timestamp, event_data FROM events WHERE {where} AND timestamp <= ? "
+                    "ORDER BY timestamp, rowid",
+                    (*key, cutoff),
+                )
+                folded_bytes = sum(len(row["event_data"]) for row in rows)
+                content = summarize(Event.model_validate_json(row["event_data"]) for row in rows)
+                snapshot = Event(
+                    author=COMPACTION_AUTHOR,
+                    invocation_id=f"compaction-{int(time.time())}",
+                    timestamp=cutoff,
+                    actions=EventActions(compaction=EventCompaction(
+                        start_timestamp=rows[0]["timestamp"],
+                        end_timestamp=cutoff,
+                        compacted_content=content,
+                    )),
+                )
+                await db.execute(f"DELETE FROM events WHERE {where} AND timestamp <= ?", (*key, cutoff))
+                await db.execute(
+                    "INSERT INTO events (id, app_name, user_id, session_id, invocation_id, timestamp, event_data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (snapshot.id, *key, snapshot.invocation_id, cutoff, snapshot.model_dump_json(exclude_none=True)),
+                )
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+
+        logger.info(f"Compacted session {session_id}: {len(rows)} events ({folded_bytes} bytes) into a snapshot")
+        return {"folded": len(rows), "bytes": folded_bytes}
+
+    async def compact_sessions(
+        self, policy: Optional[CompactionPolicy] = None, app_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Compaction job: compact every session over the `policy` thresholds.
+
+        Returns:
+            Dict with `sessions` compacted, and `folded` events and `bytes` removed
+        """
+        policy = policy or CompactionPolicy()
+        sql = (
+            "SELECT app_name, user_id, session_id FROM events "
+            + ("WHERE app_name=? " if app_name else "")
+            + "GROUP BY app_name, user_id, session_id "
+            "HAVING COUNT(*) > ? OR SUM(length(event_data)) > ?"
+        )
+        params = ([app_name] if app_name else []) + [max(policy.max_events, policy.keep_last), policy.max_bytes]
+        async with self._get_db_connection() as db:
+            candidates = [tuple(row) for row in await db.execute_fetchall(sql, params)]
+
+        totals = {"sessions": 0, "folded": 0, "bytes": 0}
+        for app, user, session in candidates:
+            result = await self.compact_session(app_name=app, user_id=user, session_id=session, policy=policy)
+            if result:
+                totals["sessions"] += 1
+                totals["folded"] += result["folded"]
+                totals["bytes"] += result["bytes"]
+        return totals
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await conn.close()
+        await super().close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m qa_orchestrator.session_store")
+    parser.add_argument("command", choices=["compact"])
+    parser.add_argument("--db", default=None, help="session database (default: data/.adk/session.db)")
+    parser.add_argument("--app", default=None, help="only sessions of this app")
+    parser.add_argument("--max-events", type=int, default=CompactionPolicy.max_events)
+    parser.add_argument("--max-bytes", type=int, default=CompactionPolicy.max_bytes)
+    parser.add_argument("--keep-last", type=int, default=CompactionPolicy.keep_last)
+    args = parser.parse_args(argv)
+
+    async def run() -> Dict[str, Any]:
+        service = TunedSqliteSessionService(args.db)
+        try:
+            policy = CompactionPolicy(args.max_events, args.max_bytes, args.keep_last)
+            return await service.compact_sessions(policy, app_name=args.app)
+        finally:
+            await service.close()
+
+    print(json.dumps(asyncio.run(run())))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
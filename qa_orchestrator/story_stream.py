@@ -0,0 +1,110 @@
+"""
+Incremental extraction of stories from streamed `Story_Architect` output.
+
+The parser is fed raw text chunks as they arrive and yields each object of
+the `"stories": [...]` array as soon as its closing brace is seen, so
+downstream agents can start on the first story while the rest are still
+being generated.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List
+import codecs
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StoryStreamParser:
+    """Push parser yielding complete story objects from a JSON text stream."""
+
+    def __init__(self, array_key: str = "stories"):
+        self._marker = f'"{array_key}"'
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        # Scanner state for the object currently being read
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Add a chunk of text and return the stories completed by it."""
+        if self._done:
+            return []
+        self._buffer += chunk
+        stories = []
+
+        if not self._in_array:
+            marker = self._buffer.find(self._marker)
+            if marker < 0:
+                return stories
+            bracket = self._buffer.find("[", marker + len(self._marker))
+            if bracket < 0:
+                return stories
+            self._in_array = True
+            self._pos = bracket + 1
+
+        buf = self._buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._start is None:
+                if ch == "{":
+                    self._start, self._depth = i, 1
+                elif ch == "]":
+                    self._done = True
+                    break
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    text = buf[self._start:i + 1]
+                    try:
+                        stories.append(json.loads(text))
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping malformed story in stream: {e}")
+                    self._start = None
+            i += 1
+
+        # Drop consumed text so the buffer only holds the current object.
+        keep_from = self._start if self._start is not None else i
+        self._buffer = buf[keep_from:]
+        if self._start is not None:
+            self._start = 0
+        self._pos = i - keep_from
+        return stories
+
+
+def iter_stories(chunks: Iterable[Any], array_key: str = "stories") -> Iterator[Dict[str, Any]]:
+    """
+    Yield stories from a stream of agent output.
+
+    Text chunks are parsed incrementally; a dict (a non-streaming agent's
+    whole result) contributes its `stories` list directly. Bytes chunks are
+    decoded as one UTF-8 stream, so characters split across chunks are fine.
+    """
+    parser = StoryStreamParser(array_key)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        if isinstance(chunk, dict):
+            stories = chunk.get(array_key)
+            if isinstance(stories, list):
+                yield from stories
+            continue
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        yield from parser.feed(str(chunk))
+    yield from parser.feed(decoder.decode(b"", final=True))
@@ -0,0 +1,178 @@
+"""
+Materialize a designed test plan (`phase3_data`) in Azure DevOps.
+
+`materialize_test_plan` turns the Test_Designer output
+
+    {"test_plan": {...}, "test_suites": {"suites": [...]}, "test_cases": {"test_cases": [...]}}
+
+into a Test Plan, its static suite hierarchy and suite membership:
+
+1. one call creates the plan (its root suite comes back with it);
+2. test cases are created through $batch, 100 per request, deduplicated by
+   the client's idempotency index;
+3. suites are created level by level, each level in parallel;
+4. each suite gets its cases in one comma-separated-ids call per 100 cases.
+
+Suites may nest through a `suites` (or `children`) list and name their cases
+with `test_case_ids` (TestCase_Author ids such as "TC-1") or `test_cases`
+(ids, titles or case dicts). A case can also name its suite with `suite`.
+Cases that no suite claims are added to the plan's root suite.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from qa_orchestrator.azure_devops import DEFAULT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def _unwrap(value: Any, key: str) -> List[Any]:
+    """Accept a bare list or an agent output dict carrying it under `key`."""
+    if isinstance(value, dict):
+        value = value.get(key)
+    return [v for v in value if v] if isinstance(value, list) else []
+
+
+def _case_key(case: Dict[str, Any], index: int) -> str:
+    return str(case.get("id") or case.get("title") or f"#{index}")
+
+
+def _flatten_suites(suites: List[Any], parent: Optional[int], out: List[Tuple[int, Optional[int], Dict[str, Any]]]) -> None:
+    """Append (suite index, parent index, suite) for `suites` and their children, in pre-order."""
+    for suite in suites:
+        if isinstance(suite, str):
+            suite = {"name": suite}
+        if not isinstance(suite, dict) or not suite.get("name"):
+            continue
+        index = len(out)
+        out.append((index, parent, suite))
+        _flatten_suites(suite.get("suites") or suite.get("children") or [], index, out)
+
+
+def _depth(entries, index: int) -> int:
+    depth = 0
+    parent = entries[index][1]
+    while parent is not None:
+        depth += 1
+        parent = entries[parent][1]
+    return depth
+
+
+def materialize_test_plan(
+    project: str,
+    phase3_data: Dict[str, Any],
+    client=None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Create the plan, suites, test cases and suite membership of `phase3_data`.
+
+    Args:
+        project: Azure DevOps project name
+        phase3_data: Test_Designer output (`test_plan`, `test_suites`, `test_cases`)
+        client: `AzureDevOpsClient` (defaults to the global client)
+        max_workers: Concurrent suite requests
+        batch_size: Test cases per $batch request
+
+    Returns:
+        Dict with `plan_id`, `root_suite_id`, `suites` (name to id),
+        `test_cases` (case id or title to work item id) and `errors`
+    """
+    if client is None:
+        from qa_orchestrator.azure_devops import get_ado_client
+        client = get_ado_client()
+
+    result: Dict[str, Any] = {"plan_id": None, "root_suite_id": None, "suites": {}, "test_cases": {}, "errors": []}
+    plan = phase3_data.get("test_plan") if isinstance(phase3_data.get("test_plan"), dict) else {}
+    if plan.get("error"):
+        result["errors"].append(f"test_plan: {plan['error']}")
+        return result
+
+    description = plan.get("description") or ", ".join(str(p) for p in plan.get("phases") or [])
+    created_plan = client.create_test_plan(project, plan.get("name") or "Test Plan", description)
+    if not created_plan:
+        result["errors"].append("failed to create Test Plan")
+        return result
+    plan_id = created_plan.get("id")
+    root_suite_id = (created_plan.get("rootSuite") or {}).get("id")
+    result["plan_id"], result["root_suite_id"] = plan_id, root_suite_id
+
+    # Test cases, in bulk
+    cases = [c for c in _unwrap(phase3_data.get("test_cases"), "test_cases") if isinstance(c, dict)]
+    created = client.create_test_cases(project, cases, batch_size=batch_size) if cases else []
+    work_item_ids: Dict[str, int] = {}
+    for index, (case, item) in enumerate(zip(cases, created)):
+        key = _case_key(case, index)
+        if "error" in item:
+            result["errors"].append(f"test case {key}: {item['error']}")
+            continue
+        work_item_ids[key] = item["id"]
+        if case.get("title"):
+            work_item_ids.setdefault(str(case["title"]), item["id"])
+    result["test_cases"] = {_case_key(c, i): work_item_ids.get(_case_key(c, i)) for i, c in enumerate(cases)}
+
+    # Suite hierarchy, one level at a time
+    entries: List[Tuple[int, Optional[int], Dict[str, Any]]] = []
+    _flatten_suites(_unwrap(phase3_data.get("test_suites"), "suites"), None, entries)
+    suite_ids: Dict[int, Optional[int]] = {}
+    levels: Dict[int, List[int]] = {}
+    for index, _, _ in entries:
+        levels.setdefault(_depth(entries, index), []).append(index)
+
+    def _create_suite(index: int):
+        _, parent, suite = entries[index]
+        parent_id = root_suite_id if parent is None else suite_ids.get(parent)
+        if parent_id is None:
+            return index, None
+        created_suite = client.create_test_suite(project, plan_id, suite["name"], parent_id)
+        return index, (created_suite or {}).get("id")
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="suites") as pool:
+        for depth in sorted(levels):
+            for index, suite_id in pool.map(_create_suite, levels[depth]):
+                suite_ids[index] = suite_id
+                if suite_id is None:
+                    result["errors"].append(f"suite {entries[index][2]['name']}: not created")
+                else:
+                    result["suites"][entries[index][2]["name"]] = suite_id
+
+        # Membership: cases named by suites, by the case itself, or the root suite
+        members: Dict[int, List[int]] = {}
+        assigned = set()
+        suite_by_name = {entries[i][2]["name"]: suite_ids.get(i) for i in suite_ids}
+        for index, _, suite in entries:
+            refs = list(suite.get("test_case_ids") or []) + list(suite.get("test_cases") or [])
+            for ref in refs:
+                ref = _case_key(ref, -1) if isinstance(ref, dict) else str(ref)
+                item_id = work_item_ids.get(ref)
+                if item_id is not None and suite_ids.get(index) is not None:
+                    members.setdefault(suite_ids[index], []).append(item_id)
+                    assigned.add(item_id)
+        for index, case in enumerate(cases):
+            item_id = work_item_ids.get(_case_key(case, index))
+            suite_id = suite_by_name.get(case.get("suite"))
+            if item_id is not None and suite_id is not None and item_id not in members.get(suite_id, []):
+                members.setdefault(suite_id, []).append(item_id)
+                assigned.add(item_id)
+        unassigned = [i for i in dict.fromkeys(work_item_ids.values()) if i not in assigned]
+        if unassigned and root_suite_id is not None:
+            members.setdefault(root_suite_id, []).extend(unassigned)
+
+        def _add(entry):
+            suite_id, ids = entry
+            return suite_id, client.add_test_cases_to_suite(project, plan_id, suite_id, list(dict.fromkeys(ids)))
+
+        for suite_id, ok in pool.map(_add, members.items()):
+            if not ok:
+                result["errors"].append(f"suite {suite_id}: failed to add test cases")
+
+    logger.info(
+        f"Materialized Test Plan {plan_id}: {len(result['suites'])} suites, "
+        f"{len(set(work_item_ids.values()))} test cases"
+    )
+    return result
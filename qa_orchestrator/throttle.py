@@ -0,0 +1,205 @@
+"""
+Client-side rate limiting and retry policy for Azure DevOps calls.
+
+`AdaptiveRateLimiter` is a token bucket whose refill rate follows the
+service's feedback (additive increase, multiplicative decrease):
+
+- `Retry-After` (on 429/503) pauses all callers until it elapses and halves
+  the rate;
+- `X-RateLimit-Remaining` / `X-RateLimit-Reset` cap the rate so the
+  remaining budget lasts until the reset time;
+- `X-RateLimit-Delay` (Azure DevOps' "you are being delayed" signal) lowers
+  the rate before hard throttling starts;
+- responses without throttling signals slowly raise the rate again.
+
+Throttle events are counted in `ThrottleMetrics`.
+"""
+
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+import asyncio
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: throttling and transient server errors.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+
+# Methods for which sending a request twice has the effect of sending it once.
+# Other requests (POST/PATCH creates) may have been applied by a failed
+# attempt, so they are only retried when the service did not process them.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+DEFAULT_RATE = 20.0        # requests per second
+DEFAULT_BURST = 20
+MIN_RATE = 0.5
+MAX_RATE = 100.0
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 0.5         # seconds
+BACKOFF_CAP = 60.0         # seconds
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def should_retry_status(status: int, retry_after: Optional[float], idempotent: bool) -> bool:
+    """
+    Whether a response is worth retrying. Non-idempotent requests are only
+    retried on 429 and on 503 with `Retry-After`, which mean the request was
+    not processed; a 500/502/504 may follow a write that was committed.
+    """
+    if idempotent:
+        return status in RETRY_STATUSES
+    return status == 429 or (status == 503 and retry_after is not None)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Parse a `Retry-After` header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (now if now is not None else time.time()))
+
+
+class ThrottleMetrics:
+    """Thread-safe counters for throttling and retries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {
+            "requests": 0,
+            "throttled": 0,
+            "retries": 0,
+            "give_ups": 0,
+            "waited_seconds": 0.0,
+            "retry_after_seconds": 0.0,
+        }
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counters)
+
+    def reset_after_fork(self) -> None:
+        """Replace the lock, which another parent thread may have held at fork."""
+        self._lock = threading.Lock()
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate adapts to Azure DevOps rate-limit headers."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.metrics = ThrottleMetrics()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds waited."""
+        wait = self._reserve()
+        self.metrics.incr("requests")
+        if wait > 0:
+            self.metrics.incr("waited_seconds", wait)
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Async variant of `acquire`."""
+        wait = self._reserve()
+        self.metrics.incr("requests")
+        if wait > 0:
+            self.metrics.incr("waited_seconds", wait)
+            await asyncio.sleep(wait)
+        return wait
+
+    def observe(self, status: int, headers: Mapping[str, Any]) -> Optional[float]:
+        """
+        Adapt the rate to a response.
+
+        Returns:
+            The `Retry-After` delay in seconds, if the response carried one
+        """
+        headers = {str(k).lower(): v for k, v in (headers or {}).items()}
+        now = self._clock()
+        retry_after = parse_retry_after(headers.get("retry-after"))
+
+        with self._lock:
+            if status in THROTTLE_STATUSES or retry_after is not None:
+                if status in THROTTLE_STATUSES:
+                    self.metrics.incr("throttled")
+                self.rate = max(self.min_rate, self.rate / 2)
+                if retry_after:
+                    self.metrics.incr("retry_after_seconds", retry_after)
+                    self._paused_until = max(self._paused_until, now + retry_after)
+                logger.warning(f"Azure DevOps throttling (HTTP {status}); rate now {self.rate:.2f}/s")
+            elif headers.get("x-ratelimit-delay"):
+                self.rate = max(self.min_rate, self.rate * 0.75)
+            else:
+                self.rate = min(self.max_rate, self.rate + 0.1)
+
+            remaining = _to_float(headers.get("x-ratelimit-remaining"))
+            reset = _to_float(headers.get("x-ratelimit-reset"))
+            if remaining is not None and reset is not None:
+                window = reset - time.time()
+                if window > 0:
+                    self.rate = max(self.min_rate, min(self.rate, remaining / window))
+        return retry_after
+
+    def reset_after_fork(self) -> None:
+        """Replace the locks, which another parent thread may have held at fork."""
+        self._lock = threading.Lock()
+        self.metrics.reset_after_fork()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Metrics plus the current rate."""
+        snapshot = self.metrics.snapshot()
+        snapshot["rate"] = self.rate
+        return snapshot
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,359 @@
+"""
+Local SQLite mirror of Azure DevOps work items.
+
+`WorkItemMirror.sync(project)` fills the mirror with WIQL id queries plus
+`workitemsbatch` fetches. The first sync pages through the whole project
+by id; later syncs only ask for items whose `System.ChangedDate` is at or
+after the stored watermark, and rows are only rewritten when the fetched
+revision is newer. The watermark is the time a sync started, less
+`WATERMARK_OVERLAP` for clock skew, never a `ChangedDate` seen in the
+results: items that change while a sync runs are fetched again next time. Agents can then answer "does this already exist?" with
+indexed local queries (`find`, `get`, `related`) instead of REST calls.
+
+A full sync records the last id it stored after every page and only moves
+the watermark forward once it completes, so an interrupted full sync is
+resumed by the next `sync()` instead of leaving unfetched items behind a
+newer watermark.
+
+Deleted work items are not detected by delta syncs; run a full sync
+(`sync(project, full=True)`) to rebuild the mirror from scratch.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from qa_orchestrator.azure_devops import MAX_WIQL_RESULTS
+
+logger = logging.getLogger(__name__)
+
+# Seconds the watermark is set back from the local sync start time.
+WATERMARK_OVERLAP = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    type TEXT,
+    title TEXT,
+    state TEXT,
+    tags TEXT,
+    rev INTEGER NOT NULL,
+    changed_date TEXT,
+    relations TEXT NOT NULL DEFAULT '[]',
+    fields TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_work_items_type_state ON work_items (project, type, state);
+CREATE INDEX IF NOT EXISTS idx_work_items_title ON work_items (project, title COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS work_item_tags (
+    id INTEGER NOT NULL,
+    tag TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (id, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_work_item_tags_tag ON work_item_tags (tag);
+CREATE TABLE IF NOT EXISTS work_item_links (
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    rel TEXT NOT NULL,
+    PRIMARY KEY (source, target, rel)
+);
+CREATE INDEX IF NOT EXISTS idx_work_item_links_target ON work_item_links (target);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL NOT NULL,
+    full_sync_after INTEGER,
+    full_sync_watermark TEXT
+);
+"""
+
+_FULL_QUERY = (
+    "SELECT [System.Id] FROM WorkItems "
+    "WHERE [System.TeamProject] = @project AND [System.Id] > {after} "
+    "ORDER BY [System.Id]"
+)
+_DELTA_QUERY = (
+    "SELECT [System.Id] FROM WorkItems "
+    "WHERE [System.TeamProject] = @project AND [System.ChangedDate] >= '{watermark}' "
+    "ORDER BY [System.ChangedDate]"
+)
+
+
+def _target_id(url: str) -> Optional[int]:
+    """Work item id at the end of a relation URL, if the target is a work item."""
+    if "/workItems/" not in url and "/workitems/" not in url:
+        return None
+    tail = url.rstrip("/").rsplit("/", 1)[-1]
+    return int(tail) if tail.isdigit() else None
+
+
+class WorkItemMirror:
+    """SQLite-backed mirror of work items, synced incrementally."""
+
+    def __init__(self, client=None, path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            client: `AzureDevOpsClient` used for syncing (defaults to the
+                global client)
+            path: SQLite file; None or ":memory:" keeps the mirror in memory
+            clock: Wall clock (UTC epoch seconds) watermarks are taken from
+        """
+        if client is None:
+            from qa_orchestrator.azure_devops import get_ado_client
+            client = get_ado_client()
+        self.client = client
+        self._clock = clock
+        if path and path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(sync_state)")}
+        for column, kind in (("full_sync_after", "INTEGER"), ("full_sync_watermark", "TEXT")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE sync_state ADD COLUMN {column} {kind}")
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def watermark(self, project: str) -> Optional[str]:
+        """Start time (less `WATERMARK_OVERLAP`) of the last completed sync of `project`."""
+        return self._sync_state(project)["watermark"]
+
+    def _sync_state(self, project: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT watermark, full_sync_after, full_sync_watermark FROM sync_state WHERE project = ?",
+                (project,),
+            ).fetchone()
+        return dict(row) if row else {"watermark": None, "full_sync_after": None, "full_sync_watermark": None}
+
+    def _save_sync_state(
+        self, project: str, watermark: Optional[str], full_sync_after: Optional[int] = None,
+        full_sync_watermark: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state "
+                "(project, watermark, synced_at, full_sync_after, full_sync_watermark) VALUES (?, ?, ?, ?, ?)",
+                (project, watermark, time.time(), full_sync_after, full_sync_watermark),
+            )
+            self._db.commit()
+
+    def sync(self, project: str, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the mirror of `project` up to date.
+
+        Args:
+            project: Azure DevOps project name
+            full: Discard the mirror and reload every work item
+
+        Returns:
+            Dict with `mode` ("full" or "delta"), `fetched`, `updated` and
+            `seconds`; `error` is set if a request failed
+        """
+        started = time.perf_counter()
+        state = self._sync_state(project)
+        watermark = None if full else state["watermark"]
+        resume_after = None if full else state["full_sync_after"]
+        mode = "delta" if watermark and resume_after is None else "full"
+        if mode == "full" and resume_after is None:
+            self._clear_project(project)
+
+        fetched = updated = 0
+        error = None
+        if mode == "full":
+            # Progress is saved per page; `watermark` only moves on completion.
+            after = resume_after or 0
+            pending = state["full_sync_watermark"] if resume_after is not None else None
+            pending = pending or self._query_time()
+            if resume_after is not None:
+                logger.info(f"Resuming full sync of {project} after work item {after}")
+            while True:
+                ids = self.client.query_work_item_ids(project, _FULL_QUERY.format(after=after))
+                if ids is None:
+                    error = "WIQL query failed"
+                    break
+                result = self._fetch_and_store(project, ids)
+                if result is None:
+                    error = "work item fetch failed"
+                    break
+                fetched += result[0]
+                updated += result[1]
+                if len(ids) < MAX_WIQL_RESULTS:
+                    self._save_sync_state(project, pending)
+                    break
+                after = max(ids)
+                self._save_sync_state(project, watermark, after, pending)
+        else:
+            started_at = self._query_time()
+            ids = self.client.query_work_item_ids(project, _DELTA_QUERY.format(watermark=watermark))
+            result = self._fetch_and_store(project, ids) if ids is not None else None
+            if result is None:
+                error = "delta sync failed"
+            else:
+                fetched, updated = result
+                self._save_sync_state(project, started_at)
+                if len(ids) >= MAX_WIQL_RESULTS:
+                    logger.warning(f"Delta sync of {project} hit the WIQL limit; run sync again to continue")
+
+        summary = {"mode": mode, "fetched": fetched, "updated": updated,
+                   "seconds": round(time.perf_counter() - started, 3)}
+        if error:
+            summary["error"] = error
+            logger.error(f"Work item sync of {project} incomplete: {error}")
+        else:
+            logger.info(f"Work item sync of {project} ({mode}): {updated}/{fetched} updated")
+        return summary
+
+    def _query_time(self) -> str:
+        """WIQL timestamp to use as the watermark of a sync starting now."""
+        started = datetime.fromtimestamp(self._clock() - WATERMARK_OVERLAP, timezone.utc)
+        return started.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _fetch_and_store(self, project: str, ids: List[int]) -> Optional[Tuple[int, int]]:
+        """Fetch and store `ids`; (fetched, updated), or None on failure."""
+        items = self.client.get_work_items(project, ids)
+        if items is None:
+            return None
+        return len(items), self._store(project, items)
+
+    def _store(self, project: str, items: List[Dict[str, Any]]) -> int:
+        """Upsert items whose revision is newer than the mirrored one; returns the number written."""
+        updated = 0
+        with self._lock:
+            for item in items:
+                fields = item.get("fields", {})
+                rev = item.get("rev", 0)
+                row = self._db.execute("SELECT rev FROM work_items WHERE id = ?", (item["id"],)).fetchone()
+                changed = fields.get("System.ChangedDate")
+                if row is not None and row["rev"] >= rev:
+                    continue
+                self._upsert(project, item, fields, rev, changed)
+                updated += 1
+            self._db.commit()
+        return updated
+
+    def _upsert(self, project: str, item: Dict[str, Any], fields: Dict[str, Any], rev: int, changed: Optional[str]) -> None:
+        item_id = item["id"]
+        tags = [t.strip() for t in (fields.get("System.Tags") or "").split(";") if t.strip()]
+        relations = item.get("relations") or []
+        self._db.execute(
+            "INSERT OR REPLACE INTO work_items "
+            "(id, project, type, title, state, tags, rev, changed_date, relations, fields) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                item_id, project, fields.get("System.WorkItemType"), fields.get("System.Title"),
+                fields.get("System.State"), "; ".join(tags), rev, changed,
+                json.dumps(relations), json.dumps(fields),
+            ),
+        )
+        self._db.execute("DELETE FROM work_item_tags WHERE id = ?", (item_id,))
+        self._db.executemany(
+            "INSERT OR IGNORE INTO work_item_tags (id, tag) VALUES (?, ?)",
+            [(item_id, tag) for tag in tags],
+        )
+        self._db.execute("DELETE FROM work_item_links WHERE source = ?", (item_id,))
+        links = [(item_id, _target_id(r.get("url", "")), r.get("rel", "")) for r in relations]
+        self._db.executemany(
+            "INSERT OR IGNORE INTO work_item_links (source, target, rel) VALUES (?, ?, ?)",
+            [link for link in links if link[1] is not None],
+        )
+
+    def _clear_project(self, project: str) -> None:
+        with self._lock:
+            ids = "(SELECT id FROM work_items WHERE project = ?)"
+            self._db.execute(f"DELETE FROM work_item_tags WHERE id IN {ids}", (project,))
+            self._db.execute(f"DELETE FROM work_item_links WHERE source IN {ids}", (project,))
+            self._db.execute("DELETE FROM work_items WHERE project = ?", (project,))
+            self._db.execute("DELETE FROM sync_state WHERE project = ?", (project,))
+            self._db.commit()
+
+    @staticmethod
+    def _row_to_item(row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        item["tags"] = [t for t in (item["tags"] or "").split("; ") if t]
+        item["relations"] = json.loads(item["relations"])
+        item["fields"] = json.loads(item["fields"])
+        return item
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Return a mirrored work item by id."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM work_items WHERE id = ?", (item_id,)).fetchone()
+        return self._row_to_item(row) if row else None
+
+    def find(
+        self,
+        project: str,
+        work_item_type: Optional[str] = None,
+        state: Optional[str] = None,
+        title: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query mirrored work items; all filters are optional and combined.
+
+        Args:
+            project: Azure DevOps project name
+            work_item_type: Exact type, e.g. "User Story"
+            state: Exact state, e.g. "Active"
+            title: Case-insensitive exact title
+            tag: Tag the item must carry
+            limit: Maximum rows returned
+        """
+        clauses, params = ["w.project = ?"], [project]
+        if work_item_type:
+            clauses.append("w.type = ?")
+            params.append(work_item_type)
+        if state:
+            clauses.append("w.state = ?")
+            params.append(state)
+        if title:
+            clauses.append("w.title = ? COLLATE NOCASE")
+            params.append(title)
+        if tag:
+            clauses.append("w.id IN (SELECT id FROM work_item_tags WHERE tag = ?)")
+            params.append(tag)
+        sql = f"SELECT w.* FROM work_items w WHERE {' AND '.join(clauses)} ORDER BY w.id LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(sql, (*params, limit)).fetchall()
+        return [self._row_to_item(row) for row in rows]
+
+    def related(self, item_id: int, rel: Optional[str] = None) -> List[int]:
+        """Ids of work items linked from `item_id`, optionally of one relation type."""
+        sql, params = "SELECT target FROM work_item_links WHERE source = ?", [item_id]
+        if rel:
+            sql += " AND rel = ?"
+            params.append(rel)
+        with self._lock:
+            return [row["target"] for row in self._db.execute(sql + " ORDER BY target", params)]
+
+    def relations(self, item_id: int) -> List[Tuple[str, int]]:
+        """(relation type, target id) pairs of work item links from `item_id`."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT rel, target FROM work_item_links WHERE source = ? ORDER BY target", (item_id,)
+            ).fetchall()
+        return [(row["rel"], row["target"]) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Mirrored item counts per project and the sync watermarks."""
+        with self._lock:
+            counts = dict(self._db.execute(
+                "SELECT project, COUNT(*) FROM work_items GROUP BY project"
+            ).fetchall())
+            watermarks = dict(self._db.execute("SELECT project, watermark FROM sync_state").fetchall())
+        return {"items": counts, "watermarks": watermarks}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,400 @@
+"""
+Durable write-behind queue for Azure DevOps mutations.
+
+Agents call `enqueue()` instead of the client's create methods: the write is
+persisted in SQLite and the call returns immediately with an operation id.
+A background worker drains the queue when `batch_size` operations are
+pending or every `flush_interval` seconds, grouping operations by kind and
+project so creates go out through the client's $batch methods. Failed
+operations are retried with jittered exponential backoff of up to
+`RETRY_CAP` seconds for as long as it takes, so an Azure DevOps outage only
+delays queued writes. Only writes rejected as invalid (a 4xx response other
+than 408 or 429) are marked failed.
+
+Several processes may share one queue file. A worker claims operations in a
+`BEGIN IMMEDIATE` transaction and holds them under a lease of
+`lease_seconds`; operations whose lease expires (their worker crashed) are
+claimed again by any worker. Replays must not duplicate artifacts, so a
+durable queue requires the client's dedup index to be persistent (work item
+creates), and test plans are looked up by name before being created.
+
+`metrics()` reports depth (pending operations) and lag (age of the oldest
+pending operation).
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from qa_orchestrator.throttle import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_QUEUE_PATH = os.path.join(_PROJECT_ROOT, "data", "ado_write_queue.db")
+DEFAULT_DEDUP_INDEX_PATH = os.path.join(_PROJECT_ROOT, "data", "ado_dedup_index.db")
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_LEASE_SECONDS = 1800.0
+RETRY_BASE = 5.0
+RETRY_CAP = 300.0
+# 4xx statuses that are worth retrying (timeout, rate limit).
+RETRYABLE_CLIENT_ERRORS = {408, 429}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    project TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    finished_at REAL,
+    last_error TEXT,
+    result TEXT,
+    owner TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS idx_operations_ready ON operations (status, next_attempt_at);
+"""
+
+
+def _apply_user_stories(client, project: str, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return client.create_user_stories(project, payloads)
+
+
+def _apply_test_cases(client, project: str, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return client.create_test_cases(project, payloads)
+
+
+def _apply_test_plans(client, project: str, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Plans have no dedup index; a replayed create finds the plan by name.
+    existing = {plan.get("name"): plan for plan in client.iter_test_plans(project)}
+    results = []
+    for p in payloads:
+        name = p.get("name", "")
+        plan = existing.get(name) or client.create_test_plan(project, name, p.get("description", ""))
+        if plan:
+            existing[name] = plan
+        results.append(plan or {"error": "failed to create Test Plan"})
+    return results
+
+
+def _apply_links(client, project: str, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    summary = client.link_work_items(project, payloads)
+    failed = {
+        (e.get("source_id"), e.get("target_id"), e.get("relation")): {"error": e["error"], "status": e.get("status")}
+        for e in summary["errors"]
+    }
+    return [
+        failed.get(key) or {"linked": True}
+        for key in ((p.get("source_id"), p.get("target_id"), p.get("relation")) for p in payloads)
+    ]
+
+
+def is_retryable(result: Dict[str, Any]) -> bool:
+    """Whether a failed write may succeed later (anything but an invalid request)."""
+    status = result.get("status") if isinstance(result, dict) else None
+    return not (isinstance(status, int) and 400 <= status < 500 and status not in RETRYABLE_CLIENT_ERRORS)
+
+
+# Operation kind -> handler(client, project, payloads) returning one result
+# per payload; results carrying "error" are retried unless `is_retryable`
+# says otherwise.
+HANDLERS: Dict[str, Callable[[Any, str, List[Dict[str, Any]]], List[Dict[str, Any]]]] = {
+    "user_story": _apply_user_stories,
+    "test_case": _apply_test_cases,
+    "test_plan": _apply_test_plans,
+    "link": _apply_links,
+}
+
+
+class WriteQueue:
+    """SQLite-backed queue of Azure DevOps writes drained by a background worker."""
+
+    def __init__(
+        self,
+        client=None,
+        path: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ):
+        """
+        Args:
+            client: `AzureDevOpsClient` that applies the writes (defaults to
+                the global client)
+            path: SQLite file; None or ":memory:" keeps the queue in memory
+                (not durable)
+            batch_size: Pending operations that trigger an early flush, and
+                the most operations sent per kind and project in one round
+            flush_interval: Seconds between flushes when the queue is not full
+            lease_seconds: How long a claimed operation stays with its
+                worker before another worker may retry it; longer than one
+                round of writes can take
+
+        Raises:
+            ValueError: If the queue is durable but the client's dedup index
+                is in memory, so replayed creates would not be deduplicated
+        """
+        if client is None:
+            from qa_orchestrator.azure_devops import get_ado_client
+            client = get_ado_client()
+        durable = bool(path) and path != ":memory:"
+        dedup_index = getattr(client, "dedup_index", None)
+        if durable and dedup_index is not None and not dedup_index.persistent:
+            raise ValueError(
+                "A durable write queue needs a persistent dedup index; "
+                "set AZURE_DEVOPS_DEDUP_INDEX_PATH or pass a client with one"
+            )
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lease_seconds = lease_seconds
+        if durable:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(operations)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE operations ADD COLUMN {column} {kind}")
+        self._db.commit()
+        self._owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {
+            "enqueued": 0, "applied": 0, "retried": 0, "failed": 0, "flushes": 0, "recovered": 0,
+        }
+
+    def enqueue(self, kind: str, project: str, payload: Dict[str, Any]) -> int:
+        """
+        Persist a write and return its operation id without waiting for it.
+
+        Args:
+            kind: One of `HANDLERS` ("user_story", "test_case", "test_plan", "link")
+            project: Azure DevOps project name
+            payload: Keyword data for the write, e.g. a story dict
+        """
+        if kind not in HANDLERS:
+            raise ValueError(f"Unknown write kind: {kind}")
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO operations (kind, project, payload, enqueued_at, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, project, json.dumps(payload), now, now),
+            )
+            self._db.commit()
+            self._counters["enqueued"] += 1
+            depth = self._db.execute(
+                "SELECT COUNT(*) FROM operations WHERE status = 'pending'"
+            ).fetchone()[0]
+        if depth >= self.batch_size:
+            self._wake.set()
+        return cursor.lastrowid
+
+    def _claim_ready(self) -> List[tuple]:
+        """
+        Lease up to `batch_size` ready operations of one kind/project to this
+        worker: pending ones that are due, and in-flight ones whose worker's
+        lease has expired.
+        """
+        ready = (
+            "((status = 'pending' AND next_attempt_at <= :now) "
+            "OR (status = 'inflight' AND (lease_until IS NULL OR lease_until < :now)))"
+        )
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                head = self._db.execute(
+                    f"SELECT kind, project FROM operations WHERE {ready} ORDER BY id LIMIT 1", {"now": now}
+                ).fetchone()
+                rows = []
+                if head is not None:
+                    rows = self._db.execute(
+                        f"SELECT id, kind, project, payload, attempts, status FROM operations "
+                        f"WHERE {ready} AND kind = :kind AND project = :project ORDER BY id LIMIT :limit",
+                        {"now": now, "kind": head[0], "project": head[1], "limit": self.batch_size},
+                    ).fetchall()
+                    self._db.executemany(
+                        "UPDATE operations SET status = 'inflight', owner = ?, lease_until = ? WHERE id = ?",
+                        [(self._owner, now + self.lease_seconds, row[0]) for row in rows],
+                    )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+            recovered = sum(1 for row in rows if row[5] == "inflight")
+            self._counters["recovered"] += recovered
+        if recovered:
+            logger.info(f"Recovered {recovered} Azure DevOps writes whose worker's lease expired")
+        return rows
+
+    def flush(self) -> int:
+        """
+        Apply every operation that is ready now.
+
+        Returns:
+            Number of operations attempted
+        """
+        attempted = 0
+        while True:
+            rows = self._claim_ready()
+            if not rows:
+                break
+            attempted += len(rows)
+            kind, project = rows[0][1], rows[0][2]
+            payloads = [json.loads(row[3]) for row in rows]
+            try:
+                results = HANDLERS[kind](self.client, project, payloads)
+            except Exception as e:
+                logger.error(f"Azure DevOps {kind} writes failed: {e}")
+                results = [{"error": str(e)}] * len(rows)
+            self._record(rows, results)
+        with self._lock:
+            self._counters["flushes"] += 1
+        return attempted
+
+    def _record(self, rows: List[tuple], results: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        with self._lock:
+            for row, result in zip(rows, results):
+                op_id, attempts = row[0], row[4] + 1
+                error = result.get("error") if isinstance(result, dict) else "no result"
+                if not error:
+                    self._db.execute(
+                        "UPDATE operations SET status = 'done', attempts = ?, finished_at = ?, "
+                        "result = ?, last_error = NULL, owner = NULL, lease_until = NULL "
+                        "WHERE id = ? AND owner = ?",
+                        (attempts, now, json.dumps(result), op_id, self._owner),
+                    )
+                    self._counters["applied"] += 1
+                elif not is_retryable(result):
+                    self._db.execute(
+                        "UPDATE operations SET status = 'failed', attempts = ?, finished_at = ?, "
+                        "last_error = ?, owner = NULL, lease_until = NULL WHERE id = ? AND owner = ?",
+                        (attempts, now, str(error), op_id, self._owner),
+                    )
+                    self._counters["failed"] += 1
+                    logger.error(f"Azure DevOps rejected write {op_id}: {error}")
+                else:
+                    self._db.execute(
+                        "UPDATE operations SET status = 'pending', attempts = ?, next_attempt_at = ?, "
+                        "last_error = ?, owner = NULL, lease_until = NULL WHERE id = ? AND owner = ?",
+                        (attempts, now + backoff_delay(attempts - 1, RETRY_BASE, RETRY_CAP), str(error),
+                         op_id, self._owner),
+                    )
+                    self._counters["retried"] += 1
+            self._db.commit()
+
+    def result(self, op_id: int) -> Optional[Dict[str, Any]]:
+        """Return the status, attempts, error and result of an operation."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, attempts, last_error, result FROM operations WHERE id = ?", (op_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "status": row[0],
+            "attempts": row[1],
+            "error": row[2],
+            "result": json.loads(row[3]) if row[3] else None,
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, lag (seconds since the oldest pending write) and counters."""
+        now = time.time()
+        with self._lock:
+            depth, oldest = self._db.execute(
+                "SELECT COUNT(*), MIN(enqueued_at) FROM operations WHERE status IN ('pending', 'inflight')"
+            ).fetchone()
+            failed = self._db.execute("SELECT COUNT(*) FROM operations WHERE status = 'failed'").fetchone()[0]
+            metrics = dict(self._counters)
+        metrics.update(depth=depth, lag_seconds=round(now - oldest, 3) if oldest else 0.0, failed_total=failed)
+        return metrics
+
+    def purge(self, older_than: float = 7 * 24 * 3600) -> int:
+        """Delete finished operations older than `older_than` seconds."""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM operations WHERE status = 'done' AND finished_at < ?",
+                (time.time() - older_than,),
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Azure DevOps write queue flush failed: {e}")
+
+    def start(self) -> "WriteQueue":
+        """Start the background worker (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="ado-write-queue", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, flush: bool = True, timeout: float = 30.0) -> None:
+        """Stop the worker; by default apply whatever is ready first."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def close(self) -> None:
+        self.stop(flush=False)
+        with self._lock:
+            self._db.close()
+
+
+_write_queue: Optional[WriteQueue] = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteQueue:
+    """
+    Get the global write queue, started on first use.
+
+    The queue file is `AZURE_DEVOPS_WRITE_QUEUE_PATH` (default
+    data/ado_write_queue.db in the project directory). If the global client's
+    dedup index is in memory, it is replaced by one in
+    data/ado_dedup_index.db, so replayed creates are deduplicated.
+    """
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            from qa_orchestrator.azure_devops import get_ado_client
+            from qa_orchestrator.dedup_index import DedupIndex
+
+            client = get_ado_client()
+            if not client.dedup_index.persistent:
+                client.dedup_index = DedupIndex(
+                    DEFAULT_DEDUP_INDEX_PATH, claim_timeout=client.dedup_index.claim_timeout
+                )
+            path = os.getenv("AZURE_DEVOPS_WRITE_QUEUE_PATH", DEFAULT_QUEUE_PATH)
+            _write_queue = WriteQueue(client, path=path).start()
+    return _write_queue
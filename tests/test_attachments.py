@@ -0,0 +1,65 @@
+import base64
+import json
+
+from qa_orchestrator.attachments import AttachmentUploader, base64_json_body
+
+
+class _FakeClient:
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.chunks = []
+        self.linked = None
+
+    def start_chunked_attachment(self, project, file_name):
+        return {"id": f"id-{file_name}", "url": f"https://x/attachments/{file_name}"}
+
+    def upload_attachment_chunk(self, url, data, start, total):
+        if start == self.fail_at:
+            self.fail_at = None
+            return False
+        self.chunks.append((url, start, len(data), total))
+        return True
+
+    def attach_files_to_work_item(self, project, work_item_id, urls, comment=""):
+        self.linked = (work_item_id, urls)
+        return {"id": work_item_id}
+
+
+def test_chunked_upload_resumes_after_failed_chunk(tmp_path):
+    path = tmp_path / "run.log"
+    path.write_bytes(b"x" * 25)
+    client = _FakeClient(fail_at=10)
+    uploader = AttachmentUploader(client, chunk_size=10)
+
+    failed = uploader.upload("Shop", str(path))
+    assert failed["resume"]["offset"] == 10
+    assert [c[1] for c in client.chunks] == [0]
+
+    done = uploader.upload("Shop", str(path), resume=failed["resume"])
+    assert done["url"] == "https://x/attachments/run.log"
+    assert [(c[1], c[2], c[3]) for c in client.chunks] == [(0, 10, 25), (10, 10, 25), (20, 5, 25)]
+
+
+def test_parallel_upload_links_to_work_item(tmp_path):
+    paths = []
+    for name in ("a.png", "b.log"):
+        (tmp_path / name).write_bytes(b"data")
+        paths.append(str(tmp_path / name))
+    client = _FakeClient()
+
+    result = AttachmentUploader(client).attach_to_work_item("Shop", 7, paths, "failure evidence")
+
+    assert result["linked"] is True
+    assert client.linked == (7, ["https://x/attachments/a.png", "https://x/attachments/b.log"])
+
+
+def test_base64_json_body_streams_valid_json(tmp_path):
+    path = tmp_path / "shot.png"
+    payload = bytes(range(256)) * 3
+    path.write_bytes(payload)
+
+    body = b"".join(base64_json_body(str(path), {"fileName": "shot.png"}, chunk_size=10))
+
+    decoded = json.loads(body)
+    assert decoded["fileName"] == "shot.png"
+    assert base64.b64decode(decoded["stream"]) == payload
@@ -1,4 +1,5 @@
 import importlib
+import requests
 
 from qa_orchestrator.azure_devops import get_ado_client
 from qa_orchestrator import secrets
@@ -32,3 +33,407 @@ def test_ado_client_setup_session(monkeypatch):
     assert session is not None
     assert "Authorization" in session.headers
     assert session.headers.get("Content-Type") == "application/json"
+
+
+class _FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class _FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+        self.headers = {}
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method.upper(), url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+def _configured_client(responses, validate_fields=False):
+    import qa_orchestrator.azure_devops as ado_mod
+
+    client = ado_mod.AzureDevOpsClient(validate_fields=validate_fields)
+    client.org_url = "https://dev.azure.com/fakeorg"
+    client.token = "pat"
+    client.session = _FakeSession(responses)
+    return client
+
+
+def test_create_test_cases_batches_and_reports_per_item():
+    import json
+
+    batch_1 = {"count": 2, "value": [
+        {"code": 200, "body": json.dumps({"id": 1})},
+        {"code": 400, "body": json.dumps({"message": "TF401320: bad field"})},
+    ]}
+    batch_2 = {"count": 1, "value": [{"code": 200, "body": json.dumps({"id": 3})}]}
+    client = _configured_client([_FakeResponse(batch_1), _FakeResponse(batch_2)])
+
+    cases = [{"title": f"Case {i}", "steps": ["open"], "expected_results": ["ok"]} for i in range(3)]
+    results = client.create_test_cases("Shop", cases, batch_size=2)
+
+    assert results[0] == {"id": 1}
+    assert results[1] == {"error": "TF401320: bad field", "status": 400}
+    assert results[2] == {"id": 3}
+    method, url, kwargs = client.session.calls[0]
+    assert url.endswith("/_apis/wit/$batch?api-version=7.1")
+    assert kwargs["json"][0]["uri"] == "/Shop/_apis/wit/workitems/$Test%20Case?api-version=7.1"
+    assert len(kwargs["json"]) == 2
+
+
+def test_client_retries_throttled_requests(monkeypatch):
+    import qa_orchestrator.azure_devops as ado_mod
+
+    monkeypatch.setattr(ado_mod.time, "sleep", lambda s: None)
+    client = _configured_client([
+        _FakeResponse({}, status_code=429, headers={"Retry-After": "0"}),
+        _FakeResponse({}, status_code=503),
+        _FakeResponse({"id": "proj"}),
+    ])
+    monkeypatch.setattr(client.rate_limiter, "_sleep", lambda s: None)
+    monkeypatch.setattr(ado_mod, "backoff_delay", lambda attempt: 0.0)
+
+    assert client.get_project_info("proj") == {"id": "proj"}
+    metrics = client.throttle_metrics()
+    assert metrics["retries"] == 2
+    assert metrics["throttled"] == 2
+
+
+def test_creates_are_retried_only_when_not_applied(monkeypatch):
+    import qa_orchestrator.azure_devops as ado_mod
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+    monkeypatch.setattr(ado_mod.time, "sleep", lambda s: None)
+    monkeypatch.setattr(ado_mod, "backoff_delay", lambda attempt: 0.0)
+    refused = requests.ConnectionError(MaxRetryError(None, "/", NewConnectionError(None, "refused")))
+    client = _configured_client([
+        refused,
+        _FakeResponse({}, status_code=503, headers={"Retry-After": "0"}),
+        _FakeResponse({"id": 9}),
+        _FakeResponse({}, status_code=500),
+        requests.ReadTimeout("read timed out"),
+    ])
+    monkeypatch.setattr(client.rate_limiter, "_sleep", lambda s: None)
+
+    assert client.create_user_story("Shop", "Login", "d", []) == {"id": 9}
+    assert len(client.session.calls) == 3
+    # The server may have applied these; neither is sent again.
+    assert client.create_user_story("Shop", "Logout", "d", []) is None
+    assert client.create_user_story("Shop", "Signup", "d", []) is None
+    assert len(client.session.calls) == 5
+    assert client.throttle_metrics()["retries"] == 2
+
+
+def test_requests_carry_timeouts_and_pool_is_sized(monkeypatch):
+    import qa_orchestrator.azure_devops as ado_mod
+
+    client = _configured_client([_FakeResponse({"id": "proj"})])
+    client.connect_timeout, client.read_timeout = 2.0, 15.0
+    client.get_project_info("proj")
+    assert client.session.calls[0][2]["timeout"] == (2.0, 15.0)
+
+    pooled = ado_mod.AzureDevOpsClient(pool_size=32)
+    pooled.org_url, pooled.token = "https://dev.azure.com/fakeorg", "pat"
+    adapter = pooled._setup_session().get_adapter("https://dev.azure.com")
+    assert adapter._pool_maxsize == 32
+
+
+def test_session_rebuilt_in_forked_child(monkeypatch):
+    import qa_orchestrator.azure_devops as ado_mod
+
+    client = ado_mod.AzureDevOpsClient()
+    client.org_url, client.token = "https://dev.azure.com/fakeorg", "pat"
+    parent_session = client._setup_session()
+    assert client._setup_session() is parent_session
+
+    monkeypatch.setattr(ado_mod.os, "getpid", lambda: -1)
+    assert client._setup_session() is not parent_session
+
+    client.rate_limiter._lock.acquire()
+    client.rate_limiter.metrics._lock.acquire()
+    ado_mod._reset_clients_after_fork()
+    assert client.session is None
+    assert not client.rate_limiter._lock.locked()
+    assert not client.rate_limiter.metrics._lock.locked()
+    assert client.rate_limiter.acquire() == 0
+
+
+def test_metadata_lookups_are_cached_and_revalidated(monkeypatch):
+    fields = {"value": [{"referenceName": "System.Title"}]}
+    client = _configured_client([
+        _FakeResponse({"id": "proj"}, headers={"ETag": '"v1"'}),
+        _FakeResponse(None, status_code=304),
+    ])
+
+    assert client.get_project_info("proj") == {"id": "proj"}
+    assert client.get_project_info("proj") == {"id": "proj"}
+    assert len(client.session.calls) == 1
+
+    client.metadata_cache.ttls["project"] = -1
+    assert client.get_project_info("proj") == {"id": "proj"}
+    assert client.session.calls[1][2]["headers"] == {"If-None-Match": '"v1"'}
+    assert client.metadata_cache.stats()["revalidated"] == 1
+
+    client.validate_fields = True
+    client.session.responses.append(_FakeResponse(fields))
+    patch = [{"op": "add", "path": "/fields/System.Title", "value": "t"},
+             {"op": "add", "path": "/fields/Custom.Missing", "value": "x"}]
+    assert client.unknown_fields("proj", "Test Case", patch) == ["/fields/Custom.Missing"]
+    results = client.create_test_cases("proj", [{"title": "t", "steps": ["a"], "expected_results": ["b"]}])
+    assert results == [{"error": "Unknown fields: /fields/Microsoft.VSTS.TCM.Steps", "status": 400}]
+    assert len(client.session.calls) == 3
+
+
+def test_metadata_cache_disk_tier_survives_restart(tmp_path):
+    from qa_orchestrator.metadata_cache import MetadataCache
+
+    path = str(tmp_path / "meta.db")
+    cache = MetadataCache(path)
+    cache.set("fields:p:Bug", "fields", {"value": [1]}, etag='"e"')
+    cache.close()
+
+    entry = MetadataCache(path).get("fields:p:Bug")
+    assert entry.value == {"value": [1]}
+    assert entry.etag == '"e"'
+
+
+def test_wiql_and_workitemsbatch_fetch():
+    client = _configured_client([
+        _FakeResponse({"workItems": [{"id": 5}, {"id": 7}]}),
+        _FakeResponse({"value": [{"id": 5, "rev": 1}, None]}),
+    ])
+
+    ids = client.query_work_item_ids("Shop", "SELECT [System.Id] FROM WorkItems")
+    assert ids == [5, 7]
+    assert "timePrecision=true" in client.session.calls[0][1]
+    assert client.get_work_items("Shop", ids) == [{"id": 5, "rev": 1}]
+    assert client.session.calls[1][2]["json"]["ids"] == [5, 7]
+
+
+def test_duplicate_creates_are_served_from_dedup_index():
+    client = _configured_client([
+        _FakeResponse({"id": 9}),
+        _FakeResponse({"count": 1, "value": [{"code": 200, "body": '{"id": 10}'}]}),
+    ])
+
+    assert client.create_user_story("Shop", "Login", "d", ["a"]) == {"id": 9}
+    assert client.create_user_story("Shop", " login ", "d", ["a"]) == {"id": 9}
+    results = client.create_user_stories("Shop", [
+        {"title": "Login", "description": "d", "acceptance_criteria": ["a"]},
+        {"title": "Logout"}, {"title": "LOGOUT"},
+    ])
+    assert results == [{"id": 9}, {"id": 10}, {"id": 10}]
+    assert len(client.session.calls) == 2
+    assert len(client.session.calls[1][2]["json"]) == 1
+
+
+def test_distinct_stories_with_the_same_title_are_both_created():
+    client = _configured_client([_FakeResponse({"id": 9}), _FakeResponse({"id": 10})])
+
+    assert client.create_user_story("Shop", "Login", "As a user I sign in", ["valid password"]) == {"id": 9}
+    assert client.create_user_story("Shop", "Login", "As an admin I sign in", ["valid password"]) == {"id": 10}
+    assert len(client.session.calls) == 2
+
+
+def test_forked_child_gets_its_own_dedup_index_connection_and_owner(tmp_path):
+    import os
+    import signal
+    from qa_orchestrator.azure_devops import AzureDevOpsClient
+    from qa_orchestrator.dedup_index import DedupIndex
+
+    client = AzureDevOpsClient(dedup_index=DedupIndex(str(tmp_path / "dedup.db")))
+    assert client.dedup_index.claim("k", "Shop", "Bug", "t") is None
+    read_fd, write_fd = os.pipe()
+    client.dedup_index._lock.acquire()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        signal.alarm(10)
+        index = client.dedup_index
+        outcome = (index.complete("k", {"id": 1}), index.try_claim("k", "Shop", "Bug", "t"))
+        os.write(write_fd, repr(outcome).encode())
+        os._exit(0)
+    client.dedup_index._lock.release()
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        outcome = pipe.read()
+    os.waitpid(pid, 0)
+
+    assert outcome == repr((False, (False, None)))
+    assert client.dedup_index.complete("k", {"id": 2}) is True
+
+
+def test_forked_child_reopens_the_metadata_cache(tmp_path):
+    import os
+    import signal
+    from qa_orchestrator.azure_devops import AzureDevOpsClient
+    from qa_orchestrator.metadata_cache import MetadataCache
+
+    cache = MetadataCache(str(tmp_path / "metadata.db"))
+    client = AzureDevOpsClient(metadata_cache=cache)
+    cache.set("fields:p:Bug", "fields", {"value": []}, etag='"v1"')
+    inherited = cache._db
+    read_fd, write_fd = os.pipe()
+    cache._lock.acquire()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        signal.alarm(10)
+        cache.set("project:p", "project", {"id": "p"})
+        os.write(write_fd, repr((cache._db is not inherited, cache.get("fields:p:Bug").etag)).encode())
+        os._exit(0)
+    cache._lock.release()
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        outcome = pipe.read()
+    os.waitpid(pid, 0)
+
+    assert outcome == repr((True, '"v1"'))
+    assert MetadataCache(str(tmp_path / "metadata.db")).get("project:p").value == {"id": "p"}
+    assert client.metadata_cache is cache
+
+
+def test_bulk_create_defers_keys_claimed_by_another_worker(tmp_path):
+    import threading
+    from qa_orchestrator.dedup_index import DedupIndex, dedup_key
+    from qa_orchestrator.azure_devops import _user_story_patch
+
+    path = str(tmp_path / "dedup.db")
+    other = DedupIndex(path)
+    key, _ = dedup_key("Shop", "User Story", _user_story_patch("Logout", "", []))
+    assert other.claim(key, "Shop", "User Story", "Logout") is None
+
+    client = _configured_client([
+        _FakeResponse({"count": 1, "value": [{"code": 200, "body": '{"id": 10}'}]}),
+    ])
+    client.dedup_index = DedupIndex(path)
+
+    def finish_other():
+        # The other worker completes only after this client created "Login".
+        while not client.session.calls:
+            threading.Event().wait(0.01)
+        other.complete(key, {"id": 77})
+
+    worker = threading.Thread(target=finish_other)
+    worker.start()
+    results = client.create_user_stories("Shop", [{"title": "Logout"}, {"title": "Login"}])
+    worker.join()
+
+    assert results == [{"id": 77}, {"id": 10}]
+    assert len(client.session.calls) == 1
+    assert len(client.session.calls[0][2]["json"]) == 1
+
+
+def test_link_work_items_groups_by_source_and_skips_existing():
+    from qa_orchestrator.azure_devops import relation_type
+
+    assert relation_type("Tested By") == "Microsoft.VSTS.Common.TestedBy-Forward"
+    assert relation_type("System.LinkTypes.Related") == "System.LinkTypes.Related"
+
+    existing = {"rel": "System.LinkTypes.Related", "url": "https://dev.azure.com/fakeorg/_apis/wit/workItems/3"}
+    client = _configured_client([
+        _FakeResponse({"value": [{"id": 1, "relations": [existing]}, {"id": 2, "relations": []}]}),
+        _FakeResponse({"count": 2, "value": [
+            {"code": 200, "body": '{"id": 1}'},
+            {"code": 400, "body": '{"message": "TF201035: bad link"}'},
+        ]}),
+    ])
+    links = [
+        {"source_id": 1, "target_id": 3, "relation": "Related"},
+        {"source_id": 1, "target_id": 4, "relation": "Related"},
+        {"source_id": 1, "target_id": 5, "relation": "Tested By"},
+        {"source_id": 1, "target_id": 5, "relation": "tested_by"},
+        {"source_id": 2, "target_id": 6, "relation": "Blocks"},
+        {"source_id": 2, "target_id": 7, "relation": "Frobnicates"},
+    ]
+
+    summary = client.link_work_items("Shop", links)
+
+    assert summary["linked"] == 2
+    assert summary["skipped"] == 2
+    assert [e["target_id"] for e in summary["errors"]] == [7, 6]
+    batch = client.session.calls[1][2]["json"]
+    assert batch[0]["uri"] == "/_apis/wit/workitems/1?api-version=7.1"
+    assert [op["value"]["rel"] for op in batch[0]["body"]] == [
+        "System.LinkTypes.Related", "Microsoft.VSTS.Common.TestedBy-Forward",
+    ]
+    assert len(client.session.calls) == 2
+
+
+def test_add_test_cases_to_suite_uses_comma_separated_ids(monkeypatch):
+    import qa_orchestrator.azure_devops as ado_mod
+
+    monkeypatch.setattr(ado_mod, "SUITE_ADD_CHUNK", 2)
+    client = _configured_client([_FakeResponse([]), _FakeResponse([])])
+
+    assert client.add_test_cases_to_suite("Shop", 1, 5, [7, 8, 9]) is True
+    urls = [call[1] for call in client.session.calls]
+    assert urls[0].endswith("/Shop/_apis/test/Plans/1/suites/5/testcases/7,8?api-version=5.0")
+    assert "/testcases/9?" in urls[1]
+
+
+def test_attachment_chunk_sends_content_range():
+    client = _configured_client([_FakeResponse({})])
+
+    assert client.upload_attachment_chunk("https://x/_apis/wit/attachments/abc", b"hello", 10, 100) is True
+    method, url, kwargs = client.session.calls[0]
+    assert method == "PUT"
+    assert kwargs["headers"]["Content-Range"] == "bytes 10-14/100"
+    assert kwargs["data"] == b"hello"
+
+
+def test_list_iterators_follow_continuation_tokens_and_skip():
+    client = _configured_client([
+        _FakeResponse({"value": [{"id": 1}, {"id": 2}]}, headers={"x-ms-continuationtoken": "abc"}),
+        _FakeResponse({"value": [{"id": 3}]}),
+    ])
+    assert [p["id"] for p in client.iter_test_plans("Shop")] == [1, 2, 3]
+    assert client.session.calls[1][2]["params"]["continuationToken"] == "abc"
+
+    client = _configured_client([
+        _FakeResponse({"value": [{"id": 1}, {"id": 2}]}),
+        _FakeResponse({"value": [{"id": 3}]}),
+    ])
+    assert [r["id"] for r in client.iter_test_runs("Shop", page_size=2)] == [1, 2, 3]
+    assert client.session.calls[1][2]["params"]["$skip"] == 2
+
+
+def test_list_iterators_raise_instead_of_truncating(monkeypatch):
+    import pytest
+
+    client = _configured_client([
+        _FakeResponse({"value": [{"id": 1}]}, headers={"x-ms-continuationtoken": "abc"}),
+        _FakeResponse({"message": "denied"}, status_code=403),
+    ])
+    plans = client.iter_test_plans("Shop")
+    assert next(plans)["id"] == 1
+    with pytest.raises(requests.HTTPError):
+        next(plans)
+
+    monkeypatch.setattr(client, "query_work_item_ids", lambda project, query, top: [1, 2])
+    monkeypatch.setattr(client, "get_work_items", lambda project, ids: None)
+    with pytest.raises(RuntimeError, match="1-2"):
+        list(client.iter_work_items("Shop", page_size=2))
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import httpx
+
+from qa_orchestrator.azure_devops_async import AsyncAzureDevOpsClient, BlockingAzureDevOpsClient
+
+
+def _client(handler, **kwargs):
+    client = AsyncAzureDevOpsClient(transport=httpx.MockTransport(handler), **kwargs)
+    client.org_url = "https://dev.azure.com/fakeorg"
+    client.token = "pat"
+    return client
+
+
+_FIELDS = {"value": [
+    {"referenceName": name}
+    for name in ("System.Title", "System.Description", "Microsoft.VSTS.TCM.Steps")
+]}
+
+
+def test_async_creates_respect_concurrency_cap():
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request):
+        if request.method == "GET":
+            return httpx.Response(200, json=_FIELDS)
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        title = json.loads(request.content)[0]["value"]
+        return httpx.Response(200, json={"id": int(title.split()[-1])})
+
+    async def run():
+        async with _client(handler, max_concurrency=3) as client:
+            cases = [{"title": f"Case {i}", "steps": ["s"], "expected_results": ["r"]} for i in range(10)]
+            return await client.create_test_cases("Shop", cases)
+
+    results = asyncio.run(run())
+
+    assert [r["id"] for r in results] == list(range(10))
+    assert in_flight["max"] <= 3
+
+
+def test_blocking_wrapper_returns_none_on_failure():
+    def handler(request):
+        return httpx.Response(503, json={"message": "unavailable"})
+
+    client = _client(handler)
+    client.max_retries = 0
+    blocking = BlockingAzureDevOpsClient(client)
+    try:
+        assert blocking.get_project_info("Shop") is None
+    finally:
+        blocking.close()
+
+
+def test_async_creates_are_validated_and_deduplicated():
+    patches = []
+
+    async def handler(request):
+        if request.method == "GET":
+            return httpx.Response(200, json={"value": _FIELDS["value"][:2]})
+        patches.append(json.loads(request.content))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": 7})
+
+    async def run():
+        async with _client(handler) as client:
+            stories = await client.create_user_stories("Shop", [{"title": "Login"}] * 3)
+            again = await client.create_user_story("Shop", " login ", "", [])
+            case = await client.create_test_case("Shop", "Case", ["s"], ["r"])
+            return stories, again, case
+
+    stories, again, case = asyncio.run(run())
+
+    assert stories == [{"id": 7}] * 3
+    assert again == {"id": 7}
+    # Test Case steps are not a field of the mocked type, so it is never sent.
+    assert case is None
+    assert len(patches) == 1
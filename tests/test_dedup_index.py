@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from qa_orchestrator.dedup_index import DedupIndex, dedup_key
+
+
+def test_key_ignores_case_and_whitespace():
+    a, _ = dedup_key("Shop", "User Story", [{"path": "/fields/System.Title", "value": "Login  page"}])
+    b, _ = dedup_key("shop", "User Story", [{"path": "/fields/System.Title", "value": " login page "}])
+    c, _ = dedup_key("Shop", "Test Case", [{"path": "/fields/System.Title", "value": "Login page"}])
+    assert a == b
+    assert a != c
+
+
+def test_concurrent_claims_create_once(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    created = []
+    lock = threading.Lock()
+
+    def worker(_):
+        index = DedupIndex(path)
+        existing = index.claim("k", "Shop", "User Story", "Login")
+        if existing is not None:
+            return existing
+        time.sleep(0.05)
+        with lock:
+            created.append(1)
+        result = {"id": 42}
+        index.complete("k", result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(worker, range(8)))
+
+    assert created == [1]
+    assert results == [{"id": 42}] * 8
+
+
+def test_released_and_abandoned_claims_can_be_retaken():
+    index = DedupIndex(claim_timeout=0.01)
+    assert index.claim("k", "Shop", "Bug", "t") is None
+    index.release("k")
+    assert index.claim("k", "Shop", "Bug", "t") is None
+    time.sleep(0.02)
+    assert index.claim("k", "Shop", "Bug", "t") is None
+    assert index.stats()["taken_over"] == 1
+
+
+def test_try_claim_does_not_wait_and_only_the_owner_completes(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    mine, theirs = DedupIndex(path), DedupIndex(path)
+    assert mine.try_claim("k", "Shop", "Bug", "t") == (True, None)
+    assert theirs.try_claim("k", "Shop", "Bug", "t") == (False, None)
+
+    assert theirs.complete("k", {"id": 1}) is False
+    theirs.release("k")
+    assert mine.complete("k", {"id": 2}) is True
+    assert theirs.try_claim("k", "Shop", "Bug", "t") == (False, {"id": 2})
+
+
+def test_renewed_claims_are_not_taken_over(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    mine, theirs = DedupIndex(path, claim_timeout=0.05), DedupIndex(path, claim_timeout=0.05)
+    assert mine.claim("k", "Shop", "Bug", "t") is None
+    for _ in range(3):
+        time.sleep(0.03)
+        mine.renew(["k"])
+        assert theirs.try_claim("k", "Shop", "Bug", "t") == (False, None)
@@ -0,0 +1,78 @@
+import threading
+
+from agents import designer
+
+
+class _FakeAgent:
+    def __init__(self, name, result, block=None):
+        self.name = name
+        self._result = result
+        self._block = block
+
+    def call(self, prompt, context):
+        if self._block is not None:
+            self._block.wait(5)
+        return self._result
+
+
+def _specialists(block=None):
+    return [
+        ("test_plan", _FakeAgent("plan", {"name": "Plan"})),
+        ("test_cases", _FakeAgent("cases", {"test_cases": []})),
+        ("coverage_analysis", _FakeAgent("coverage", {"coverage": 80})),
+        ("test_data", _FakeAgent("data", {"factories": []})),
+        ("suites", _FakeAgent("suites", {"suites": []}, block=block)),
+    ]
+
+
+def test_delegate_design_sequential(monkeypatch):
+    monkeypatch.setattr(designer, "_load_specialists", _specialists)
+
+    result = designer.delegate_design({"prompt": "design"}, concurrent=False)
+
+    assert result["test_plan"] == {"name": "Plan"}
+    assert result["test_suites"] == {"suites": []}
+    assert result["validation_errors"] == []
+
+
+def test_delegate_design_timeout_returns_partial_results(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(designer, "_load_specialists", lambda: _specialists(block=release))
+
+    try:
+        result = designer.delegate_design({"prompt": "design"}, timeout=0.2)
+    finally:
+        release.set()
+
+    assert result["test_plan"] == {"name": "Plan"}
+    assert result["coverage_analysis"] == {"coverage": 80}
+    assert result["validation_errors"] == ["suites: timed out after 0.2s"]
+
+
+def test_delegate_design_with_store_reauthors_only_changed_stories(monkeypatch):
+    from qa_orchestrator.phase_store import PhaseStore
+
+    authored = []
+
+    class _Author(_FakeAgent):
+        def call(self, prompt, context):
+            if "story" not in context:
+                raise AssertionError("expected a per-story call")
+            authored.append(context["story"]["title"])
+            return {"test_cases": [f"check {context['story']['title']}"]}
+
+    specialists = _specialists()
+    specialists[1] = ("test_cases", _Author("TestCase_Author", None))
+    monkeypatch.setattr(designer, "_load_specialists", lambda: specialists)
+    stories = [{"id": 1, "title": "login"}, {"id": 2, "title": "logout"}]
+    store = PhaseStore()
+
+    designer.delegate_design({"phase1_data": {"stories": {"stories": stories}}}, store=store, namespace="s1")
+    stories[1] = {"id": 2, "title": "log out"}
+    result = designer.delegate_design(
+        {"phase1_data": {"stories": {"stories": stories}}}, store=store, namespace="s1"
+    )
+
+    assert authored == ["login", "logout", "log out"]
+    assert result["test_cases"] == {"test_cases": ["check login", "check log out"]}
+    assert result["validation_errors"] == []
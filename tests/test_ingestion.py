@@ -0,0 +1,105 @@
+from qa_orchestrator import ingestion
+
+DOCUMENT = """# Overview
+The portal lets customers manage orders.
+
+## 1. Login
+Users log in with email and password.
+
+## 2. Checkout
+Users pay by card.
+
+3.1 Refunds
+Refunds are issued within 5 days.
+"""
+
+
+def test_split_sections_respects_boundaries_and_size():
+    chunks = ingestion.split_sections(DOCUMENT, max_chars=80)
+
+    assert all(len(c) <= 80 for c in chunks)
+    assert chunks[0].startswith("# Overview")
+    assert any(c.startswith("## 2. Checkout") for c in chunks)
+    assert "".join(chunks) == DOCUMENT
+
+
+def test_analyze_requirements_small_input_is_single_call():
+    class _Agent:
+        name = "Requirement_Analyst"
+
+        def run(self, payload):
+            return {"summary": "one call", "received": payload}
+
+    result = ingestion.analyze_requirements({"requirements": "short"}, _Agent())
+    assert result["received"] == {"requirements": "short"}
+
+
+def test_analyze_requirements_merges_and_dedupes_chunks():
+    class _Agent:
+        name = "Requirement_Analyst"
+
+        def run(self, payload):
+            section = payload["section_index"]
+            return {
+                "summary": f"section {section}",
+                "ambiguities": ["Which card types are accepted?", f"Question {section}"],
+                "assumptions": ["Users have an account."],
+                "dependencies": ["payment gateway"],
+            }
+
+    result = ingestion.analyze_requirements(
+        {"requirements": DOCUMENT, "project": "Shop"}, _Agent(), max_chars=80
+    )
+
+    assert result["chunks"] > 1
+    assert result["summary"].splitlines()[0] == "section 1"
+    assert result["ambiguities"][0] == "Which card types are accepted?"
+    assert result["ambiguities"].count("Which card types are accepted?") == 1
+    assert result["assumptions"] == ["Users have an account."]
+    assert result["dependencies"] == ["payment gateway"]
+
+
+def test_failed_chunks_surface_in_architecture_gaps(monkeypatch):
+    from agents import architect, registry
+
+    class _Analyst:
+        name = "Requirement_Analyst"
+        fail = {1, 2, 3}
+
+        def run(self, payload):
+            if payload["section_index"] in self.fail:
+                raise RuntimeError(f"section {payload['section_index']} failed")
+            return {"summary": f"section {payload['section_index']}"}
+
+    class _Echo:
+        def __init__(self, name):
+            self.name = name
+            self.payloads = []
+
+        def run(self, payload):
+            self.payloads.append(payload)
+            return {"agent": self.name}
+
+    analyst = _Analyst()
+    fakes = {
+        "requirement_analyst": analyst,
+        "story_architect": _Echo("Story_Architect"),
+        "acceptance_criteria_manager": _Echo("AcceptanceCriteria_Manager"),
+        "devops_linker": _Echo("DevOps_Linker"),
+    }
+    monkeypatch.setattr(registry, "get_agent", lambda name: fakes[name])
+    analyze = ingestion.analyze_requirements
+    monkeypatch.setattr(ingestion, "analyze_requirements", lambda data, agent: analyze(data, agent, max_chars=80))
+    payload = {"requirements": DOCUMENT}
+    chunks = len(ingestion.split_sections(DOCUMENT, 80))
+
+    analyst.fail = set(range(1, chunks + 1))
+    result = architect.delegate_architecture(payload)
+    assert result["requirements_summary"]["error"] == f"all {chunks} requirement chunks failed"
+    assert fakes["story_architect"].payloads == [payload]
+    assert len(result["gaps_identified"]) == chunks + 1
+
+    analyst.fail = {2}
+    result = architect.delegate_architecture(payload)
+    assert "requirements_summary: chunk 2: " in result["gaps_identified"][0]
+    assert fakes["story_architect"].payloads[-1]["chunk_errors"] == result["requirements_summary"]["chunk_errors"]
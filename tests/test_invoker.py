@@ -0,0 +1,91 @@
+import threading
+
+from qa_orchestrator import invoker
+
+
+class _CallAgent:
+    name = "CallAgent"
+
+    def call(self, prompt, context):
+        return {"prompt": prompt}
+
+
+class _RunAgent:
+    name = "RunAgent"
+
+    def run(self, payload):
+        raise ValueError("bad payload")
+
+
+class _SlowAgent:
+    name = "SlowAgent"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def invoke(self, payload):
+        self.release.wait(5)
+        return "late"
+
+
+def test_invoke_agent_resolves_and_caches_convention():
+    invoker.clear_convention_cache()
+    stats = invoker.get_invocation_stats()
+    stats.reset()
+
+    assert invoker.invoke_agent(_CallAgent(), {"prompt": "hi"}) == {"prompt": "hi"}
+    assert invoker._convention_cache[_CallAgent] == "call"
+
+    result = invoker.invoke_agent(_RunAgent(), {"x": 1})
+    assert result == {"error": "agent run failed: bad payload"}
+
+    summary = stats.summary()
+    assert summary["CallAgent"]["calls"] == 1
+    assert summary["RunAgent"]["error_classes"] == {"ValueError": 1}
+    assert stats.recent(1)[0]["payload_bytes"] == len('{"x": 1}')
+
+
+def test_invoke_agent_placeholder_when_no_method():
+    result = invoker.invoke_agent(object(), {"prompt": "hi"})
+    assert result["note"] == "no callable method available; returned placeholder"
+
+
+def test_invoke_agent_timeout_and_cancel():
+    agent = _SlowAgent()
+    try:
+        assert invoker.invoke_agent(agent, {}, timeout=0.1) == {"error": "timed out after 0.1s"}
+
+        cancel = threading.Event()
+        cancel.set()
+        assert invoker.invoke_agent(agent, {}, cancel_event=cancel) == {"error": "cancelled"}
+    finally:
+        agent.release.set()
+
+
+class _CountingAgent:
+    name = "Counting"
+    model = "gemini-3-flash"
+
+    def __init__(self, instruction="v1"):
+        self.instruction = instruction
+        self.calls = 0
+
+    def run(self, payload):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+def test_invoke_agent_uses_response_cache(tmp_path):
+    from qa_orchestrator.response_cache import ResponseCache
+
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    agent = _CountingAgent()
+
+    assert invoker.invoke_agent(agent, {"story": " a "}, cache=cache) == {"calls": 1}
+    assert invoker.invoke_agent(agent, {"story": "a"}, cache=cache) == {"calls": 1}
+
+    agent.instruction = "v2"
+    assert invoker.invoke_agent(agent, {"story": "a"}, cache=cache) == {"calls": 2}
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["invalidated"] == 1
+    cache.close()
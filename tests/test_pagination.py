@@ -0,0 +1,23 @@
+import threading
+
+from qa_orchestrator.pagination import iter_items
+
+
+def test_prefetches_next_page_and_stops_on_none():
+    fetched = []
+    second_requested = threading.Event()
+
+    def fetch(cursor):
+        fetched.append(cursor)
+        if cursor == 2:
+            second_requested.set()
+        return [f"{cursor or 0}-{i}" for i in range(2)], (cursor or 0) + 1 if (cursor or 0) < 2 else None
+
+    items = iter_items(fetch)
+    assert next(items) == "0-0"
+    assert next(items) == "0-1"
+    assert next(items) == "1-0"
+    # Page 2 is requested while page 1 is still being consumed
+    assert second_requested.wait(1)
+    assert list(items) == ["1-1", "2-0", "2-1"]
+    assert fetched == [None, 1, 2]
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from qa_orchestrator.phase_graph import PhaseGraph
+
+
+def test_independent_nodes_run_in_parallel():
+    barrier = threading.Barrier(2, timeout=2)
+    graph = PhaseGraph()
+    graph.add("stories", lambda s: ["story"], inputs=["requirements"])
+    graph.add("criteria", lambda s: barrier.wait() is not None, inputs=["stories"])
+    graph.add("links", lambda s: barrier.wait() is not None, inputs=["stories"])
+
+    run = graph.run({"requirements": "text"})
+
+    assert run["errors"] == {}
+    assert run["state"]["criteria"] is True
+    assert run["state"]["links"] is True
+
+
+def test_failed_node_skips_dependents():
+    def boom(state):
+        raise RuntimeError("llm down")
+
+    graph = PhaseGraph()
+    graph.add("analysis", boom, inputs=["requirements"], output_key="phase1_data")
+    graph.add("design", lambda s: "cases", inputs=["phase1_data"], output_key="phase3_data")
+    graph.add("other", lambda s: "ok", inputs=["requirements"])
+
+    run = graph.run({"requirements": "text"})
+
+    assert run["errors"] == {"analysis": "RuntimeError: llm down"}
+    assert run["skipped"] == ["design"]
+    assert run["state"]["other"] == "ok"
+
+
+def test_validate_rejects_cycles_and_unknown_inputs():
+    graph = PhaseGraph()
+    graph.add("a", lambda s: 1, inputs=["b"])
+    graph.add("b", lambda s: 2, inputs=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        graph.validate()
+
+    graph = PhaseGraph()
+    graph.add("a", lambda s: 1, inputs=["missing"])
+    with pytest.raises(ValueError, match="unknown inputs"):
+        graph.validate()
+
+
+def test_store_reuses_unchanged_nodes():
+    from qa_orchestrator.phase_store import PhaseStore
+
+    calls = []
+
+    def node(name, value):
+        def run(state):
+            calls.append(name)
+            return value(state)
+        return run
+
+    graph = PhaseGraph()
+    graph.add("stories", node("stories", lambda s: s["requirements"].upper()), inputs=["requirements"])
+    graph.add("plan", node("plan", lambda s: "plan"), inputs=["settings"])
+    graph.add("cases", node("cases", lambda s: s["stories"] + "!"), inputs=["stories", "plan"])
+
+    store = PhaseStore()
+    graph.run({"requirements": "a", "settings": 1}, store=store, namespace="s1")
+    assert sorted(calls) == ["cases", "plan", "stories"]
+
+    calls.clear()
+    run = graph.run({"requirements": "b", "settings": 1}, store=store, namespace="s1")
+    assert sorted(calls) == ["cases", "stories"]
+    assert run["reused"] == ["plan"]
+    assert run["state"]["cases"] == "B!"
+
+
+def test_map_items_recomputes_only_changed_items():
+    from qa_orchestrator.phase_store import PhaseStore
+
+    store = PhaseStore()
+    seen = []
+
+    def author(story):
+        seen.append(story["id"])
+        return {"cases": [story["title"]]}
+
+    stories = [{"id": 1, "title": "login"}, {"id": 2, "title": "logout"}]
+    store.map_items("s1", "test_cases", stories, author)
+    stories[1] = {"id": 2, "title": "log out"}
+    results = store.map_items("s1", "test_cases", stories, author)
+
+    assert seen == [1, 2, 2]
+    assert results == [{"cases": ["login"]}, {"cases": ["log out"]}]
+
+
+def test_store_skips_failed_outputs_and_tracks_agent_versions():
+    from types import SimpleNamespace
+
+    from qa_orchestrator.fingerprint import agent_fingerprint
+    from qa_orchestrator.phase_store import PhaseStore, is_reusable
+
+    assert not is_reusable({"test_plan": {"error": "timed out"}, "validation_errors": []})
+    assert not is_reusable({"stories": [], "gaps_identified": ["stories: boom"]})
+    assert not is_reusable({"summary": "", "chunk_errors": [{"chunk": 0, "error": "x"}]})
+    assert is_reusable({"test_plan": {"name": "P"}, "validation_errors": [], "gaps_identified": []})
+
+    agent = SimpleNamespace(name="Planner", model="m1", instruction="v1")
+    calls = []
+
+    def build():
+        graph = PhaseGraph()
+        graph.add("plan", lambda s: calls.append(1) or "plan", inputs=["x"], version=agent_fingerprint(agent))
+        return graph
+
+    store = PhaseStore()
+    build().run({"x": 1}, store=store)
+    assert build().run({"x": 1}, store=store)["reused"] == ["plan"]
+    agent.instruction = "v2"
+    assert build().run({"x": 1}, store=store)["reused"] == []
+    agent.model = "m2"
+    assert build().run({"x": 1}, store=store)["reused"] == []
+    assert len(calls) == 3
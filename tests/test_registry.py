@@ -0,0 +1,26 @@
+import pytest
+
+from agents.registry import SUB_AGENT_NAMES, AgentRegistry
+
+
+def test_registry_builds_agents_on_first_use():
+    registry = AgentRegistry()
+    assert registry.loaded() == []
+
+    agent = registry.get("planner")
+    assert agent.name == "Project_Planner"
+    assert registry.loaded() == ["planner"]
+    assert registry.get("planner") is agent
+
+
+def test_registry_all_preserves_order():
+    registry = AgentRegistry()
+    agents = registry.all()
+    assert len(agents) == len(SUB_AGENT_NAMES)
+    assert agents[0].name == "Requirement_Analyst"
+    assert registry.loaded() == list(SUB_AGENT_NAMES)
+
+
+def test_registry_rejects_unknown_agent():
+    with pytest.raises(KeyError):
+        AgentRegistry().get("nonexistent")
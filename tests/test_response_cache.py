@@ -0,0 +1,58 @@
+from qa_orchestrator.response_cache import ResponseCache
+
+
+class _Agent:
+    name = "Story_Architect"
+    model = "gemini-3-flash"
+    instruction = "Write stories"
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path)
+    key, name, instruction_hash = cache.key_for(_Agent(), {"b": 1, "a": [1, 2]})
+    cache.set(key, {"stories": []}, name, instruction_hash)
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.key_for(_Agent(), {"a": [1, 2], "b": 1})[0] == key
+    assert reopened.get(key) == (True, {"stories": []})
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+
+def test_ttl_and_lru_eviction(monkeypatch):
+    import qa_orchestrator.response_cache as rc
+
+    now = [1000.0]
+    monkeypatch.setattr(rc.time, "time", lambda: now[0])
+    cache = ResponseCache(ttl=60, max_memory_entries=2)
+
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") == (False, None)
+    assert cache.get("c") == (True, "c")
+
+    now[0] += 61
+    assert cache.get("c") == (False, None)
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expired"] == 1
+
+
+def test_hits_return_copies_callers_can_mutate(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    value = {"stories": [{"title": "Login"}]}
+    cache.set("k", value)
+    value["stories"].clear()
+
+    _, first = cache.get("k")
+    first["validation_errors"] = ["missing criteria"]
+    first["stories"].append({"title": "Logout"})
+    assert cache.get("k") == (True, {"stories": [{"title": "Login"}]})
+
+    cache._memory.clear()
+    _, from_disk = cache.get("k")
+    from_disk["stories"].clear()
+    assert cache.get("k") == (True, {"stories": [{"title": "Login"}]})
+    cache.close()
@@ -0,0 +1,125 @@
+import asyncio
+import gzip
+import json
+import sqlite3
+
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+
+from qa_orchestrator.blob_store import BlobStore
+from qa_orchestrator.session_retention import RetentionRule, apply_retention, collect_blobs, rule_for
+from qa_orchestrator.session_store import TunedSqliteSessionService
+
+
+def test_most_specific_rule_wins():
+    rules = [RetentionRule(max_age_days=30), RetentionRule(app_name="qa", max_sessions=2),
+             RetentionRule(app_name="qa", user_id="ci", max_sessions=1)]
+    assert rule_for(rules, "qa", "ci").max_sessions == 1
+    assert rule_for(rules, "qa", "dev").max_sessions == 2
+    assert rule_for(rules, "other", "dev").max_age_days == 30
+
+
+def test_retention_archives_deletes_cascades_and_vacuums(tmp_path):
+    path = str(tmp_path / "session.db")
+    store = BlobStore(str(tmp_path / "blobs"), threshold=256)
+    big = {"rows": ["x" * 40] * 20}
+
+    async def scenario():
+        service = TunedSqliteSessionService(path, blob_store=store)
+        for n in range(4):
+            session = await service.create_session(app_name="qa", user_id="u", session_id=f"s{n}")
+            await service.append_event(session, Event(
+                author="user", invocation_id="i", timestamp=1000.0 + n,
+                actions=EventActions(state_delta={"phase3_data": dict(big, n=n), "n": n}),
+            ))
+        report = await apply_retention(
+            service, [RetentionRule(max_sessions=1)], archive_dir=str(tmp_path / "archive"), batch_size=2,
+        )
+        removed = await collect_blobs(service, grace_seconds=-1)
+        await service.close()
+        return report, removed
+
+    report, removed = asyncio.run(scenario())
+
+    assert (report.expired, report.archived, report.deleted, report.batches) == (3, 3, 3, 2)
+    db = sqlite3.connect(path)
+    assert db.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert db.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert db.execute("SELECT id FROM sessions").fetchall() == [("s3",)]
+    assert db.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+    with gzip.open(report.archive_path, "rt") as f:
+        records = [json.loads(line) for line in f]
+    assert sorted(r["id"] for r in records) == ["s0", "s1", "s2"]
+    assert records[0]["state"]["phase3_data"]["rows"] == big["rows"]
+    assert len(records[0]["events"]) == 1
+    assert removed == 3
+    assert len(list(store.digests())) == 1
+
+
+def test_retention_reclaims_pages_beyond_one_per_batch(tmp_path):
+    path = str(tmp_path / "session.db")
+
+    async def scenario():
+        service = TunedSqliteSessionService(path, spill_large_values=False)
+        for n in range(20):
+            session = await service.create_session(app_name="qa", user_id="u", session_id=f"s{n}")
+            await service.append_event(session, Event(
+                author="user", invocation_id="i", timestamp=1000.0 + n,
+                actions=EventActions(state_delta={"notes": "x" * 20000}),
+            ))
+        report = await apply_retention(service, [RetentionRule(max_sessions=1, archive=False)], batch_size=10)
+        await service.close()
+        return report
+
+    report = asyncio.run(scenario())
+
+    assert report.deleted == 19
+    assert report.vacuumed_pages > 19 * 4
+    assert sqlite3.connect(path).execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+def test_retention_keeps_sessions_updated_after_selection(tmp_path, monkeypatch):
+    from qa_orchestrator import session_retention
+
+    path = str(tmp_path / "session.db")
+
+    async def scenario():
+        service = TunedSqliteSessionService(path)
+        for n in range(3):
+            await service.create_session(app_name="qa", user_id="u", session_id=f"s{n}")
+        select = session_retention._expired_sessions
+
+        def select_then_resume(rows, rules, now):
+            expired = select(rows, rules, now)
+            with sqlite3.connect(path) as db:
+                db.execute("UPDATE sessions SET update_time = update_time + 1 WHERE id = ?", (expired[0][2],))
+            return expired
+
+        monkeypatch.setattr(session_retention, "_expired_sessions", select_then_resume)
+        report = await apply_retention(service, [RetentionRule(max_age_days=0, archive=False)], now=1e12)
+        await service.close()
+        return report
+
+    report = asyncio.run(scenario())
+
+    assert (report.expired, report.deleted, report.skipped) == (3, 2, 1)
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 1
+
+
+def test_collect_blobs_keeps_blobs_stored_again_after_the_scan(tmp_path):
+    import os
+
+    store = BlobStore(str(tmp_path / "blobs"), threshold=1)
+    ref = store.put({"rows": [1, 2, 3]})
+    path = store.path_for(ref["$blob"])
+    os.utime(path, (1, 1))
+    assert store.put({"rows": [1, 2, 3]}) == ref
+
+    async def scenario():
+        service = TunedSqliteSessionService(str(tmp_path / "session.db"), blob_store=store)
+        removed = await collect_blobs(service, grace_seconds=60)
+        await service.close()
+        return removed
+
+    assert asyncio.run(scenario()) == 0
+    assert os.path.exists(path)
@@ -0,0 +1,162 @@
+import asyncio
+import sqlite3
+
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+
+from qa_orchestrator.session_store import TunedSqliteSessionService
+
+
+def _event(i, **kwargs):
+    return Event(author="user", invocation_id=f"inv-{i}", timestamp=1000.0 + i, **kwargs)
+
+
+def test_batched_appends_and_keyset_pagination(tmp_path):
+    path = str(tmp_path / "session.db")
+
+    async def scenario():
+        service = TunedSqliteSessionService(path)
+        session = await service.create_session(app_name="qa", user_id="u", session_id="s")
+        events = [_event(i) for i in range(4)]
+        events.append(_event(4, actions=EventActions(state_delta={"phase": "design"})))
+        await service.append_events(session, events)
+
+        loaded = await service.get_session(app_name="qa", user_id="u", session_id="s")
+        first, cursor = await service.list_events(app_name="qa", user_id="u", session_id="s", limit=2)
+        walked = [e async for e in service.iter_events(app_name="qa", user_id="u", session_id="s", page_size=2)]
+        await service.close()
+        return loaded, first, cursor, walked
+
+    loaded, first, cursor, walked = asyncio.run(scenario())
+
+    assert [e.invocation_id for e in loaded.events] == [f"inv-{i}" for i in range(5)]
+    assert loaded.state["phase"] == "design"
+    assert [e.invocation_id for e in first] == ["inv-0", "inv-1"]
+    assert cursor is not None
+    assert [e.invocation_id for e in walked] == [f"inv-{i}" for i in range(5)]
+
+    db = sqlite3.connect(path)
+    assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = " ".join(str(r) for r in db.execute(
+        "EXPLAIN QUERY PLAN SELECT event_data FROM events WHERE app_name='qa' AND user_id='u' "
+        "AND session_id='s' ORDER BY timestamp"
+    ))
+    assert "idx_events_session_time" in plan
+
+
+def test_concurrent_sessions_write_through_pool(tmp_path):
+    async def scenario():
+        service = TunedSqliteSessionService(str(tmp_path / "session.db"), pool_size=3)
+
+        async def write(n):
+            session = await service.create_session(app_name="qa", user_id="u", session_id=f"s{n}")
+            for i in range(5):
+                await service.append_event(session, _event(i))
+
+        await asyncio.gather(*(write(n) for n in range(6)))
+        counts = [
+            len((await service.get_session(app_name="qa", user_id="u", session_id=f"s{n}")).events)
+            for n in range(6)
+        ]
+        await service.close()
+        return counts
+
+    assert asyncio.run(scenario()) == [5] * 6
+
+
+def test_compaction_folds_old_events_into_snapshot(tmp_path):
+    from google.genai import types
+
+    from qa_orchestrator.session_store import CompactionPolicy
+
+    async def scenario():
+        service = TunedSqliteSessionService(str(tmp_path / "session.db"))
+        session = await service.create_session(app_name="qa", user_id="u", session_id="s")
+        events = [
+            _event(i, content=types.Content(role="model", parts=[types.Part(text=f"msg {i}")]))
+            for i in range(10)
+        ]
+        await service.append_events(session, events)
+
+        policy = CompactionPolicy(max_events=8, keep_last=3)
+        totals = await service.compact_sessions(policy)
+        again = await service.compact_session(app_name="qa", user_id="u", session_id="s", policy=policy)
+        loaded = await service.get_session(app_name="qa", user_id="u", session_id="s")
+        await service.close()
+        return totals, again, loaded
+
+    totals, again, loaded = asyncio.run(scenario())
+
+    assert totals["sessions"] == 1 and totals["folded"] == 7
+    assert again is None
+    snapshot, *tail = loaded.events
+    assert snapshot.actions.compaction.end_timestamp == 1006.0
+    assert "msg 6" in snapshot.actions.compaction.compacted_content.parts[0].text
+    assert [e.invocation_id for e in tail] == ["inv-7", "inv-8", "inv-9"]
+
+
+def test_large_state_values_spill_to_blob_store(tmp_path):
+    from qa_orchestrator.blob_store import BlobStore, is_blob_ref
+
+    path = str(tmp_path / "session.db")
+    big = {"test_cases": [{"id": f"TC-{i}", "title": "x" * 50} for i in range(50)]}
+    store = BlobStore(str(tmp_path / "blobs"), threshold=1024)
+
+    async def scenario():
+        service = TunedSqliteSessionService(path, blob_store=store)
+        live = []
+        for sid in ("a", "b"):
+            session = await service.create_session(app_name="qa", user_id="u", session_id=sid)
+            await service.append_event(
+                session, _event(0, actions=EventActions(state_delta={"phase3_data": big, "note": "small"}))
+            )
+            live.append(session.state["phase3_data"])
+        loaded = await service.get_session(app_name="qa", user_id="u", session_id="a")
+        await service.close()
+        return live, loaded
+
+    live, loaded = asyncio.run(scenario())
+
+    assert live == [big, big]
+    db = sqlite3.connect(path)
+    state_json = db.execute("SELECT state FROM sessions WHERE id = 'a'").fetchone()[0]
+    assert '"$blob"' in state_json and "TC-1" not in state_json
+    assert is_blob_ref(loaded.events[0].actions.state_delta["phase3_data"])
+    assert dict.__getitem__(loaded.state, "phase3_data")["$blob"]
+    assert loaded.state["phase3_data"] == big
+    assert loaded.state["note"] == "small"
+    assert len(list(store.digests())) == 1
+    assert store.stats()["deduplicated"] == 1
+
+
+def test_spill_handles_rich_values_and_state_views_resolve_blobs(tmp_path):
+    from datetime import datetime
+
+    from google.adk.sessions.state import State
+
+    from qa_orchestrator.blob_store import BlobStore
+
+    path = str(tmp_path / "session.db")
+    store = BlobStore(str(tmp_path / "blobs"), threshold=1024)
+    started = datetime(2026, 1, 2, 3, 4, 5)
+    # 400 characters but over 1 KiB once UTF-8 encoded.
+    notes = "éèê" * 200
+
+    async def scenario():
+        service = TunedSqliteSessionService(path, blob_store=store)
+        session = await service.create_session(app_name="qa", user_id="u", session_id="a")
+        await service.append_event(
+            session, _event(0, actions=EventActions(state_delta={"started": started, "notes": notes}))
+        )
+        loaded = await service.get_session(app_name="qa", user_id="u", session_id="a")
+        await service.close()
+        return loaded
+
+    loaded = asyncio.run(scenario())
+
+    assert len(list(store.digests())) == 1
+    assert dict.__getitem__(loaded.state, "notes")["$blob"]
+    assert dict(loaded.state)["notes"] == notes
+    assert {**loaded.state}["notes"] == notes
+    assert State(loaded.state, {}).to_dict()["notes"] == notes
+    assert loaded.state["started"] == started.isoformat()
@@ -0,0 +1,30 @@
+from benchmarks.startup import check_regressions, group_breakdown, parse_importtime
+
+IMPORTTIME_STDERR = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   requests.compat
+import time:      3000 |       3120 | requests
+import time:      5000 |       9000 |     google.adk.agents
+import time:       400 |        400 | agents.planner
+"""
+
+
+def test_parse_importtime_and_grouping():
+    rows = parse_importtime(IMPORTTIME_STDERR)
+    assert [r["module"] for r in rows] == ["requests.compat", "requests", "google.adk.agents", "agents.planner"]
+    assert rows[2]["depth"] == 2
+
+    groups = group_breakdown(rows)
+    assert groups["requests"] == 3.12
+    assert groups["google.adk"] == 5.0
+    assert groups["agents"] == 0.4
+
+
+def test_check_regressions_uses_tolerance():
+    baseline = {"tolerance": 0.5, "targets": {"agent": 100.0, "agents": 1.0}}
+    results = {"agent": {"warm_ms": 149.0}, "agents": {"warm_ms": 10.0}}
+
+    failures = check_regressions(results, baseline)
+
+    assert len(failures) == 1
+    assert failures[0].startswith("agents:")
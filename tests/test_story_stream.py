@@ -0,0 +1,68 @@
+import json
+
+from qa_orchestrator.story_stream import StoryStreamParser, iter_stories
+
+STORIES = {
+    "stories": [
+        {"title": "Login {with} braces", "acceptance_criteria": ['Given "quoted" \\ text']},
+        {"title": "Logout", "acceptance_criteria": [], "meta": {"complexity": 2}},
+    ]
+}
+
+
+def test_parser_yields_each_story_as_it_completes():
+    text = json.dumps(STORIES)
+    parser = StoryStreamParser()
+    first = json.dumps(STORIES["stories"][0])
+    first_story_end = text.index(first) + len(first)
+    assert parser.feed(text[:first_story_end - 1]) == []
+    assert parser.feed(text[first_story_end - 1:first_story_end]) == STORIES["stories"][:1]
+
+    seen = []
+    for i in range(first_story_end, len(text), 7):
+        seen.extend(parser.feed(text[i:i + 7]))
+    assert seen == STORIES["stories"][1:]
+
+
+def test_iter_stories_accepts_whole_results():
+    assert list(iter_stories([STORIES])) == STORIES["stories"]
+
+
+def test_iter_stories_decodes_characters_split_across_byte_chunks():
+    data = json.dumps({"stories": [{"title": "Café menu"}]}, ensure_ascii=False).encode("utf-8")
+    split = data.index("é".encode("utf-8")) + 1
+    assert list(iter_stories([data[:split], data[split:]])) == [{"title": "Café menu"}]
+
+
+def test_delegate_architecture_streams_stories(monkeypatch):
+    from agents import architect, registry
+
+    class _Streamer:
+        name = "Story_Architect"
+
+        def stream(self, payload):
+            text = json.dumps(STORIES)
+            for i in range(0, len(text), 11):
+                yield text[i:i + 11]
+
+    class _Echo:
+        def __init__(self, name):
+            self.name = name
+
+        def run(self, payload):
+            return {"agent": self.name, "title": payload.get("title")}
+
+    fakes = {
+        "requirement_analyst": _Echo("Requirement_Analyst"),
+        "story_architect": _Streamer(),
+        "acceptance_criteria_manager": _Echo("AcceptanceCriteria_Manager"),
+        "devops_linker": _Echo("DevOps_Linker"),
+    }
+    monkeypatch.setattr(registry, "get_agent", lambda name: fakes[name])
+
+    result = architect.delegate_architecture({"prompt": "reqs"}, stream=True, on_story=lambda s: s["title"])
+
+    assert [s["title"] for s in result["stories"]["stories"]] == ["Login {with} braces", "Logout"]
+    assert [c["title"] for c in result["criteria_validation"]] == ["Login {with} braces", "Logout"]
+    assert result["story_artifacts"] == ["Login {with} braces", "Logout"]
+    assert result["gaps_identified"] == []
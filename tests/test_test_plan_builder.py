@@ -0,0 +1,66 @@
+import threading
+
+from qa_orchestrator.azure_devops import steps_xml
+from qa_orchestrator.test_plan_builder import materialize_test_plan
+
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+        self._next_suite = 100
+
+    def create_test_plan(self, project, name, description):
+        self.calls.append(("plan", name))
+        return {"id": 1, "rootSuite": {"id": 2}}
+
+    def create_test_cases(self, project, cases, batch_size=100):
+        self.calls.append(("cases", len(cases)))
+        return [{"id": 10 + i} for i in range(len(cases))]
+
+    def create_test_suite(self, project, plan_id, name, parent_suite_id):
+        with self._lock:
+            self.calls.append(("suite", name, parent_suite_id))
+            self._next_suite += 1
+            return {"id": self._next_suite}
+
+    def add_test_cases_to_suite(self, project, plan_id, suite_id, ids):
+        with self._lock:
+            self.calls.append(("add", suite_id, tuple(ids)))
+        return True
+
+
+def test_materializes_hierarchy_and_membership():
+    phase3 = {
+        "test_plan": {"name": "Checkout plan", "phases": ["Functional"]},
+        "test_suites": {"suites": [
+            {"name": "Smoke", "test_case_ids": ["TC-1"], "suites": [{"name": "Login", "test_case_ids": ["TC-2"]}]},
+        ]},
+        "test_cases": {"test_cases": [
+            {"id": "TC-1", "title": "Pay", "steps": ["pay"], "expected_results": ["paid"]},
+            {"id": "TC-2", "title": "Log in", "steps": ["log in"], "expected_results": ["ok"]},
+            {"id": "TC-3", "title": "Refund", "steps": ["refund"], "expected_results": ["refunded"]},
+        ]},
+    }
+    client = _FakeClient()
+
+    result = materialize_test_plan("Shop", phase3, client=client)
+
+    assert result["errors"] == []
+    assert result["plan_id"] == 1
+    assert result["test_cases"] == {"TC-1": 10, "TC-2": 11, "TC-3": 12}
+    smoke, login = result["suites"]["Smoke"], result["suites"]["Login"]
+    assert ("suite", "Smoke", 2) in client.calls
+    assert ("suite", "Login", smoke) in client.calls
+    adds = {c[1]: c[2] for c in client.calls if c[0] == "add"}
+    assert adds == {smoke: (10,), login: (11,), 2: (12,)}
+    assert sum(1 for c in client.calls if c[0] == "cases") == 1
+
+
+def test_steps_xml_encodes_actions_and_expectations():
+    xml = steps_xml(["Open <cart>", "Click pay"], ["Cart & total shown"])
+    assert xml.startswith('<steps id="0" last="3">')
+    assert '<step id="2" type="ValidateStep">' in xml
+    assert '<step id="3" type="ActionStep">' in xml
+    assert "Open &lt;cart&gt;" in xml
+    assert "Cart &amp; total shown" in xml
@@ -0,0 +1,52 @@
+from qa_orchestrator.throttle import AdaptiveRateLimiter, backoff_delay, parse_retry_after, should_retry_status
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_paces_requests_after_burst():
+    clock = _Clock()
+    limiter = AdaptiveRateLimiter(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.slept == [0.5, 0.5]
+
+
+def test_retry_after_pauses_and_halves_rate():
+    clock = _Clock()
+    limiter = AdaptiveRateLimiter(rate=10, burst=10, clock=clock, sleep=clock.sleep)
+
+    assert limiter.observe(429, {"Retry-After": "3"}) == 3.0
+    assert limiter.rate == 5
+    limiter.acquire()
+
+    assert clock.slept == [3.0]
+    snapshot = limiter.snapshot()
+    assert snapshot["throttled"] == 1
+    assert snapshot["retry_after_seconds"] == 3.0
+
+
+def test_backoff_and_retry_after_parsing():
+    assert 0 <= backoff_delay(3, base=1, cap=5) <= 5
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412470) == 10
+    assert parse_retry_after("garbage") is None
+
+
+def test_non_idempotent_requests_retry_only_unprocessed_responses():
+    assert should_retry_status(500, None, idempotent=True)
+    assert not should_retry_status(500, None, idempotent=False)
+    assert not should_retry_status(503, None, idempotent=False)
+    assert should_retry_status(503, 2.0, idempotent=False)
+    assert should_retry_status(429, None, idempotent=False)
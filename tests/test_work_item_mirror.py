@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+
+from qa_orchestrator.work_item_mirror import WorkItemMirror
+
+
+def _clock(timestamp):
+    return lambda: datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _item(item_id, rev, changed, title="Story", state="New", tags="", relations=None):
+    return {
+        "id": item_id,
+        "rev": rev,
+        "fields": {
+            "System.WorkItemType": "User Story",
+            "System.Title": title,
+            "System.State": state,
+            "System.Tags": tags,
+            "System.ChangedDate": changed,
+        },
+        "relations": relations or [],
+    }
+
+
+class _FakeClient:
+    def __init__(self, items):
+        self.items = {i["id"]: i for i in items}
+        self.queries = []
+        self.fetched = []
+
+    def query_work_item_ids(self, project, query, top=20000):
+        self.queries.append(query)
+        if "ChangedDate" in query:
+            watermark = query.split("'")[1]
+            return [i for i, item in self.items.items() if item["fields"]["System.ChangedDate"] >= watermark]
+        return sorted(self.items)
+
+    def get_work_items(self, project, ids, expand="Relations"):
+        self.fetched.append(list(ids))
+        return [self.items[i] for i in ids]
+
+
+def test_full_then_delta_sync():
+    link = {"rel": "System.LinkTypes.Related", "url": "https://dev.azure.com/o/_apis/wit/workItems/2"}
+    client = _FakeClient([
+        _item(1, 3, "2026-01-01T10:00:00.00Z", title="Login", tags="auth; ui", relations=[link]),
+        _item(2, 1, "2026-01-02T09:00:00.5Z", title="Logout"),
+    ])
+    mirror = WorkItemMirror(client, clock=_clock("2026-01-02T09:03:00"))
+
+    first = mirror.sync("Shop")
+    assert (first["mode"], first["fetched"], first["updated"]) == ("full", 2, 2)
+    assert mirror.watermark("Shop") == "2026-01-02T08:58:00Z"
+
+    client.items[3] = _item(3, 1, "2026-01-03T00:00:00Z", title="Checkout", state="Active")
+    second = mirror.sync("Shop")
+    assert second["mode"] == "delta"
+    assert client.fetched[-1] == [2, 3]
+    assert second["updated"] == 1
+
+    assert [i["id"] for i in mirror.find("Shop", tag="AUTH")] == [1]
+    assert [i["id"] for i in mirror.find("Shop", state="Active")] == [3]
+    assert mirror.find("Shop", title="login")[0]["tags"] == ["auth", "ui"]
+    assert mirror.related(1) == [2]
+    assert mirror.stats()["items"] == {"Shop": 3}
+
+
+def test_interrupted_full_sync_resumes_before_moving_the_watermark(monkeypatch):
+    import qa_orchestrator.work_item_mirror as wim
+
+    monkeypatch.setattr(wim, "MAX_WIQL_RESULTS", 2)
+
+    class _PagedClient(_FakeClient):
+        fail_fetch = 2
+
+        def query_work_item_ids(self, project, query, top=20000):
+            self.queries.append(query)
+            after = int(query.split("[System.Id] > ")[1].split()[0])
+            return [i for i in sorted(self.items) if i > after][:2]
+
+        def get_work_items(self, project, ids, expand="Relations"):
+            self.fail_fetch -= 1
+            if self.fail_fetch == 0:
+                return None
+            return super().get_work_items(project, ids, expand)
+
+    # Older items have higher ids, so the first page holds the newest change.
+    client = _PagedClient([_item(i, 1, f"2026-01-0{6 - i}T00:00:00.1234567Z") for i in range(1, 6)])
+    mirror = WorkItemMirror(client, clock=_clock("2026-01-06T00:00:00"))
+
+    assert mirror.sync("Shop")["error"] == "work item fetch failed"
+    assert mirror.watermark("Shop") is None
+
+    resumed = mirror.sync("Shop")
+    assert (resumed["mode"], resumed["fetched"]) == ("full", 3)
+    assert "error" not in resumed
+    assert client.fetched[-2:] == [[3, 4], [5]]
+    assert mirror.watermark("Shop") == "2026-01-05T23:55:00Z"
+    assert mirror.stats()["items"] == {"Shop": 5}
+
+
+def test_items_changed_during_a_delta_sync_are_fetched_next_time():
+    class _RacingClient(_FakeClient):
+        def get_work_items(self, project, ids, expand="Relations"):
+            if 3 in ids and 2 not in ids:
+                # After the WIQL query: item 2 changes, then item 3 again.
+                self.items[2] = _item(2, 2, "2026-01-10T00:00:01Z", title="Logout v2")
+                self.items[3] = _item(3, 2, "2026-01-10T00:00:02Z")
+            return super().get_work_items(project, ids, expand)
+
+    now = ["2026-01-09T00:00:00"]
+    client = _RacingClient([_item(1, 1, "2026-01-01T00:00:00Z"), _item(2, 1, "2026-01-01T00:00:00Z")])
+    mirror = WorkItemMirror(client, clock=lambda: _clock(now[0])())
+    mirror.sync("Shop")
+
+    client.items[3] = _item(3, 1, "2026-01-09T23:59:59Z")
+    now[0] = "2026-01-10T00:00:00"
+    mirror.sync("Shop")
+    assert client.fetched[-1] == [3]
+    assert mirror.get(3)["rev"] == 2
+
+    now[0] = "2026-01-10T00:10:00"
+    mirror.sync("Shop")
+    assert 2 in client.fetched[-1]
+    assert mirror.get(2)["title"] == "Logout v2"
@@ -0,0 +1,120 @@
+import time
+
+from qa_orchestrator.write_queue import WriteQueue
+
+
+class _FlakyClient:
+    def __init__(self, failures=1, status=503):
+        self.failures = failures
+        self.status = status
+        self.batches = []
+
+    def create_user_stories(self, project, stories):
+        self.batches.append([s["title"] for s in stories])
+        if self.failures:
+            self.failures -= 1
+            return [{"error": f"HTTP {self.status}", "status": self.status} for _ in stories]
+        return [{"id": i + 1} for i, _ in enumerate(stories)]
+
+
+def test_batches_retries_and_survives_restart(tmp_path, monkeypatch):
+    import qa_orchestrator.write_queue as wq
+
+    monkeypatch.setattr(wq, "backoff_delay", lambda attempt, base, cap: 0.0)
+    path = str(tmp_path / "queue.db")
+    client = _FlakyClient()
+
+    queue = WriteQueue(client, path=path)
+    ids = [queue.enqueue("user_story", "Shop", {"title": f"S{i}"}) for i in range(3)]
+    assert queue.metrics()["depth"] == 3
+    queue.close()
+
+    # Reopen: pending writes are still there
+    queue = WriteQueue(client, path=path)
+    assert queue.flush() == 6
+    assert client.batches == [["S0", "S1", "S2"], ["S0", "S1", "S2"]]
+    assert queue.result(ids[0]) == {"status": "done", "attempts": 2, "error": None, "result": {"id": 1}}
+    metrics = queue.metrics()
+    assert metrics["depth"] == 0
+    assert metrics["retried"] == 3
+
+
+def test_worker_flushes_on_size_and_fails_only_rejected_writes():
+    client = _FlakyClient(failures=100, status=400)
+    queue = WriteQueue(client, batch_size=2, flush_interval=60).start()
+    first = queue.enqueue("user_story", "Shop", {"title": "A"})
+    queue.enqueue("user_story", "Shop", {"title": "B"})
+
+    deadline = time.time() + 5
+    while queue.result(first)["status"] != "failed" and time.time() < deadline:
+        time.sleep(0.01)
+    queue.stop(flush=False)
+
+    assert queue.result(first)["status"] == "failed"
+    assert queue.result(first)["attempts"] == 1
+    assert queue.metrics()["failed"] == 2
+
+
+def test_transient_failures_are_retried_without_an_attempt_cap(monkeypatch):
+    import qa_orchestrator.write_queue as wq
+
+    delays = []
+    monkeypatch.setattr(wq, "backoff_delay", lambda attempt, base, cap: delays.append((attempt, base, cap)) or 0.0)
+    queue = WriteQueue(_FlakyClient(failures=30, status=503))
+    op = queue.enqueue("user_story", "Shop", {"title": "A"})
+    assert queue.flush() == 31
+
+    assert queue.result(op)["status"] == "done"
+    assert queue.result(op)["attempts"] == 31
+    assert delays[-1] == (29, wq.RETRY_BASE, wq.RETRY_CAP)
+    assert queue.metrics()["failed"] == 0
+
+
+class _PlanClient:
+    def __init__(self, plans):
+        self.plans = list(plans)
+        self.created = []
+
+    def iter_test_plans(self, project):
+        return iter(list(self.plans))
+
+    def create_test_plan(self, project, name, description):
+        plan = {"id": 100 + len(self.created), "name": name}
+        self.created.append(name)
+        self.plans.append(plan)
+        return plan
+
+
+def test_inflight_writes_are_leased_to_their_worker(tmp_path):
+    path = str(tmp_path / "queue.db")
+    client = _PlanClient([{"id": 1, "name": "Existing"}])
+    first = WriteQueue(client, path=path, lease_seconds=0.2)
+    second = WriteQueue(client, path=path, lease_seconds=0.2)
+    ops = [first.enqueue("test_plan", "Shop", {"name": name}) for name in ("Existing", "New", "New")]
+
+    # The first worker claims the writes, then dies before recording them.
+    assert len(first._claim_ready()) == 3
+    assert second.flush() == 0
+    time.sleep(0.25)
+    assert second.flush() == 3
+
+    assert client.created == ["New"]
+    assert [second.result(op)["result"]["id"] for op in ops] == [1, 100, 100]
+    assert second.metrics()["recovered"] == 3
+    # A late result from the first worker no longer counts.
+    first._record([(ops[0], "test_plan", "Shop", "{}", 0)], [{"id": 9}])
+    assert second.result(ops[0])["result"]["id"] == 1
+
+
+def test_durable_queue_requires_persistent_dedup_index(tmp_path):
+    import pytest
+
+    from qa_orchestrator.dedup_index import DedupIndex
+
+    class _Client:
+        dedup_index = DedupIndex()
+
+    with pytest.raises(ValueError):
+        WriteQueue(_Client(), path=str(tmp_path / "queue.db"))
+    _Client.dedup_index = DedupIndex(str(tmp_path / "dedup.db"))
+    WriteQueue(_Client(), path=str(tmp_path / "queue.db")).close()